@@ -0,0 +1,144 @@
+"""Reading and writing SunVox files over asyncio streams.
+
+Chunks are read and written one at a time, awaiting I/O in between,
+so a single event loop can serve many transfers at once.
+"""
+
+import asyncio
+from collections import deque
+
+from rv.lib.iff import HEADER, ChunkStream, LazyPayload, chunk_tree
+from rv.readers.reader import ReaderFinished, read_options
+from rv.readers.sunsynth import SunSynthReader
+from rv.readers.sunvox import SunVoxReader
+
+#: Chunks that start a block, mapped to the chunk that ends it.
+BLOCK_ENDS = {b"PDTA": b"PEND", b"PPAR": b"PEND", b"SFFF": b"SEND"}
+
+#: Number of bytes written before waiting for the writer to drain.
+DRAIN_SIZE = 1 << 16
+
+
+async def read_chunks(stream):
+    """Yield (name, data) chunks read from an `asyncio.StreamReader`."""
+    unpack_header = HEADER.unpack
+    while True:
+        try:
+            header = await stream.readexactly(8)
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                raise
+            return
+        name, size = unpack_header(header)
+        data = await stream.readexactly(size) if size else b""
+        yield name, memoryview(data)
+
+
+class _Pending:
+    """Iterator over chunks queued so far, which can be refilled when empty."""
+
+    def __init__(self):
+        self.chunks = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.chunks:
+            raise StopIteration
+        return self.chunks.popleft()
+
+
+async def read_sunvox_file(stream, lazy=False, include=None, exclude=None):
+    """Read a SunVox project or synth from an `asyncio.StreamReader`.
+
+    Chunks are parsed as they arrive: header chunks immediately,
+    and each pattern or module once all of its chunks have been received.
+    Options are as for :py:func:`rv.api.read_sunvox_file`.
+    """
+    options = read_options(lazy=lazy, include=include, exclude=exclude)
+    chunks = read_chunks(stream)
+    pending = _Pending()
+    reader = None
+    block = None
+    async for name, data in chunks:
+        if reader is None:
+            if name == b"SVOX":
+                reader = SunVoxReader(ChunkStream.from_chunks(pending), options)
+            elif name == b"SSYN":
+                reader = SunSynthReader(ChunkStream.from_chunks(pending), options)
+            else:
+                raise ValueError("Not a SunVox file: starts with {!r}".format(name))
+            reader.start()
+            continue
+        pending.chunks.append((name, data))
+        if block is None:
+            block = BLOCK_ENDS.get(name)
+            if block is not None:
+                continue
+        elif name != block:
+            continue
+        block = None
+        name, data = next(reader.stream)
+        reader.process_chunk(name, data)
+    if reader is None:
+        raise ValueError("Empty SunVox file")
+    try:
+        while pending.chunks:
+            # A block left unterminated at the end of the stream.
+            reader.process_chunk(*next(reader.stream))
+        reader.process_end_of_file()
+    except ReaderFinished:
+        pass
+    return reader.object
+
+
+async def write_chunks(writer, chunks, drain_size=DRAIN_SIZE):
+    """Write (name, data) chunks to an `asyncio.StreamWriter`.
+
+    Chunks are encoded as they are written; nested containers are
+    encoded whole, since their size must be known before they are written.
+    """
+    pending = 0
+    for name, data in chunks:
+        if name is None:
+            continue
+        name = name[:4]
+        name = name + b" " * (4 - len(name))
+        if hasattr(data, "chunks"):
+            entries, size = chunk_tree(data.chunks())
+            writer.write(HEADER.pack(name, size))
+            pending += 8 + await _write_entries(writer, entries, drain_size)
+        elif isinstance(data, LazyPayload):
+            writer.write(HEADER.pack(name, len(data)))
+            for block in data.blocks():
+                writer.write(block)
+                await writer.drain()
+        else:
+            writer.write(HEADER.pack(name, len(data)))
+            if len(data):
+                writer.write(data)
+            pending += 8 + len(data)
+        if pending >= drain_size:
+            await writer.drain()
+            pending = 0
+    await writer.drain()
+
+
+async def _write_entries(writer, entries, drain_size):
+    written = 0
+    for name, data, size in entries:
+        writer.write(HEADER.pack(name, size))
+        if isinstance(data, list):
+            await _write_entries(writer, data, drain_size)
+        elif isinstance(data, LazyPayload):
+            for block in data.blocks():
+                writer.write(block)
+                await writer.drain()
+        elif size:
+            writer.write(data)
+        written += 8 + size
+        if written >= drain_size:
+            await writer.drain()
+            written = 0
+    return written
@@ -3,6 +3,9 @@ from rv import ENCODING
 from rv.note import ALL_NOTES, NOTE, NOTECMD, Note
 from rv.pattern import Pattern, PatternAppearanceFlags, PatternClone, PatternFlags
 from rv.project import Project
+from rv.readers.archive import iter_sunvox_archive
+from rv.readers.batch import ReadResult, read_sunvox_files
+from rv.readers.probe import probe_sunvox_file
 from rv.readers.reader import read_sunvox_file
 from rv.synth import Synth
 
@@ -11,6 +14,7 @@ m = rv.modules
 __all__ = [
     "ALL_NOTES",
     "ENCODING",
+    "iter_sunvox_archive",
     "m",
     "Note",
     "NOTE",
@@ -19,7 +23,10 @@ __all__ = [
     "PatternAppearanceFlags",
     "PatternClone",
     "PatternFlags",
+    "probe_sunvox_file",
     "Project",
     "read_sunvox_file",
+    "read_sunvox_files",
+    "ReadResult",
     "Synth",
 ]
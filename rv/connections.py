@@ -0,0 +1,107 @@
+"""Index of the connections between the modules of a project."""
+
+
+class ConnectionGraph:
+    """Incoming and outgoing connections between the modules of a project.
+
+    incoming is the project's ``module_connections`` mapping. Its lists hold
+    the indexes of the modules connected to each module, in SLNK order, and
+    are shared with each module's ``incoming_links``. The graph edits those
+    lists in place, and keeps alongside them the set of incoming indexes and
+    the ordered set of outgoing indexes of each module, so connections are
+    tested and followed in either direction without scanning.
+
+    Negative indexes in incoming lists (empty SLNK entries) are kept in the
+    lists, but are not connections.
+    """
+
+    def __init__(self, incoming):
+        self.incoming = incoming
+        self.sources = {}
+        self.targets = {}
+        self._downstream = {}
+        for to_index, links in incoming.items():
+            self._add_links(to_index, links)
+
+    def _add_links(self, to_index, links):
+        sources = self.sources[to_index] = set()
+        for from_index in links:
+            if from_index >= 0:
+                sources.add(from_index)
+                self._add_target(from_index, to_index)
+
+    def _add_target(self, from_index, to_index):
+        self.targets.setdefault(from_index, {})[to_index] = None
+        self._downstream.pop(from_index, None)
+
+    def _remove_target(self, from_index, to_index):
+        self.targets[from_index].pop(to_index, None)
+        self._downstream.pop(from_index, None)
+
+    def set_incoming(self, to_index, links):
+        """Replace the incoming list of to_index, as when a module is attached."""
+        for from_index in self.sources.pop(to_index, ()):
+            self._remove_target(from_index, to_index)
+        self.incoming[to_index] = links
+        self._add_links(to_index, links)
+
+    def has_connection(self, from_index, to_index):
+        """Return True if from_index is connected to to_index."""
+        sources = self.sources.get(to_index)
+        return sources is not None and from_index in sources
+
+    def connected(self, a, b):
+        """Return True if a is connected to b, or b to a."""
+        return self.has_connection(a, b) or self.has_connection(b, a)
+
+    def connect(self, from_index, to_index):
+        """Connect from_index to to_index.
+
+        Returns False, changing nothing, if the modules are already
+        connected in either direction.
+        """
+        if self.connected(from_index, to_index):
+            return False
+        self.incoming[to_index].append(from_index)
+        self.sources.setdefault(to_index, set()).add(from_index)
+        self._add_target(from_index, to_index)
+        return True
+
+    def disconnect(self, from_index, to_index):
+        """Remove the connection between two modules, in either direction.
+
+        Returns True if a connection was removed.
+        """
+        removed = self._remove(from_index, to_index)
+        return self._remove(to_index, from_index) or removed
+
+    def _remove(self, from_index, to_index):
+        if not self.has_connection(from_index, to_index):
+            return False
+        links = self.incoming[to_index]
+        links.remove(from_index)
+        if from_index not in links:
+            self.sources[to_index].discard(from_index)
+            self._remove_target(from_index, to_index)
+        return True
+
+    def isolate(self, index):
+        """Remove all connections to and from index."""
+        for to_index in self.targets.pop(index, {}):
+            links = self.incoming[to_index]
+            links[:] = [x for x in links if x != index]
+            self.sources[to_index].discard(index)
+        self._downstream.pop(index, None)
+        for from_index in self.sources.pop(index, ()):
+            self._remove_target(from_index, index)
+        links = self.incoming.get(index)
+        if links:
+            del links[:]
+
+    def outgoing(self, from_index):
+        """Return the indexes from_index is connected to, in index order."""
+        downstream = self._downstream.get(from_index)
+        if downstream is None:
+            downstream = tuple(sorted(self.targets.get(from_index, ())))
+            self._downstream[from_index] = downstream
+        return downstream
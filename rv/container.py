@@ -1,6 +1,13 @@
+import os
 from io import BytesIO
 
-from rv.lib.iff import write_chunk
+from rv.lib.iff import (
+    ChunkWriter,
+    chunk_tree,
+    chunks_size,
+    lazy_payloads,
+    write_chunk_tree,
+)
 from rv.readers.reader import read_sunvox_file
 
 
@@ -8,17 +15,62 @@ class Container:
     def chunks(self):
         raise NotImplementedError()
 
+    def serialized_size(self):
+        """Return the exact number of bytes this container serializes to.
+
+        Sizes are added up from the fixed chunk headers and the lengths of
+        the payloads, which are not copied or written anywhere. Nested
+        containers such as the project embedded in a MetaModule are
+        measured recursively.
+        """
+        return chunks_size(self.chunks())
+
     def read(self):
+        """Return this container serialized as bytes.
+
+        Chunks are written into one buffer allocated at its exact final
+        size, and nested containers are written directly into it.
+        """
+        entries, size = chunk_tree(self.chunks())
         with BytesIO() as f:
-            self.write_to(f)
+            if size:
+                # Grow the buffer once and fill it in place, so getvalue
+                # can return it as bytes without copying it again.
+                f.seek(size - 1)
+                f.write(b"\0")
+                with f.getbuffer() as view:
+                    write_chunk_tree(view, 0, entries)
             return f.getvalue()
 
     def write_to(self, file):
-        for chunk in self.chunks():
-            write_chunk(file, *chunk)
+        """Write this container to file, a filename or an open binary file.
+
+        Payloads not read yet from the file being replaced are read first
+        when file is given by name, so a project read with lazy payloads
+        can be saved over its own file. Opening that file for writing
+        yourself truncates them, and raises ValueError.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            if os.path.exists(file):
+                for payload in lazy_payloads(self.chunks()):
+                    if payload.is_in(file):
+                        payload.preload()
+            with open(file, "wb") as f:
+                self.write_to(f)
+            return
+        with ChunkWriter(file) as writer:
+            for chunk in self.chunks():
+                writer.write_chunk(*chunk)
+
+    async def write_to_async(self, writer):
+        """Write this container to an `asyncio.StreamWriter`.
+
+        Chunks are encoded one at a time, and the writer is drained
+        between them, so other tasks run while data is sent.
+        """
+        from rv.aio import write_chunks
+
+        await write_chunks(writer, self.chunks())
 
     def clone(self):
-        with BytesIO() as f:
-            self.write_to(f)
-            f.seek(0)
-            return read_sunvox_file(f)
+        return read_sunvox_file(self.read())
@@ -0,0 +1,77 @@
+"""Placeholders for project elements that have not been decoded yet."""
+
+from struct import unpack
+
+
+class LazyBlock:
+    """Chunks of one pattern or module, kept as read until first accessed.
+
+    chunks excludes the closing ``PEND`` or ``SEND`` chunk.
+    Writing a block back yields these chunks unchanged.
+    """
+
+    __slots__ = ["chunks"]
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __repr__(self):
+        name = self.chunks[0][0].decode("ascii", "replace") if self.chunks else ""
+        return "<LazyBlock {} ({} chunks)>".format(name, len(self.chunks))
+
+    def first(self, name):
+        """Return the data of the first chunk with the given name, or None."""
+        for chunk_name, data in self.chunks:
+            if chunk_name == name:
+                return data
+        return None
+
+
+class LazySequence(list):
+    """List whose `LazyBlock` items are decoded on first access.
+
+    load is called as ``load(index, block)`` and returns the decoded item,
+    which then replaces the block in the list.
+    Indexing and iteration decode items as they are reached;
+    ``len()``, ``in``, ``index()``, and `raw_items` never decode anything.
+    """
+
+    def __init__(self, load, items=()):
+        super().__init__(items)
+        self.load = load
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = super().__getitem__(index)
+        if isinstance(item, LazyBlock):
+            if index < 0:
+                index += len(self)
+            item = self.load(index, item)
+            super().__setitem__(index, item)
+        return item
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reversed__(self):
+        for index in reversed(range(len(self))):
+            yield self[index]
+
+    def is_loaded(self, index):
+        """Return True if the item at index has been decoded."""
+        return not isinstance(super().__getitem__(index), LazyBlock)
+
+
+def raw_items(sequence):
+    """Iterate over sequence without decoding `LazyBlock` items."""
+    return list.__iter__(sequence)
+
+
+def slnk_links(data):
+    """Decode SLNK chunk data into a list of incoming module indexes."""
+    links = list(unpack("<" + "i" * (len(data) // 4), data))
+    while links[-1:] == [-1]:
+        links.pop()
+    return links
@@ -0,0 +1,98 @@
+"""Transparent decompression of gzip, xz, and bzip2 sources."""
+
+import bz2
+import gzip
+import io
+import lzma
+
+from rv.lib.iff import _exact_reader, _seekable
+
+
+def _gzip_file(f):
+    return gzip.GzipFile(fileobj=f)
+
+
+#: Magic numbers of supported compression formats,
+#: and functions opening a file object for reading with each.
+COMPRESSED_FORMATS = [
+    (b"\x1f\x8b", _gzip_file),
+    (b"\xfd7zXZ\x00", lzma.LZMAFile),
+    (b"BZh", bz2.BZ2File),
+]
+
+#: Filename suffixes of compressed files.
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".bz2")
+
+MAGIC_SIZE = max(len(magic) for magic, _ in COMPRESSED_FORMATS)
+
+
+class StreamReader:
+    """Forward-only reader over a file, with an optional prefix already read.
+
+    Reads only return fewer bytes than requested at the end of the stream.
+    It reports itself as not seekable, so that readers never try to seek
+    in (or reopen by name) a decompressed or archived stream.
+    """
+
+    def __init__(self, f, prefix=b""):
+        self.f = f
+        self.prefix = prefix
+        self._read = _exact_reader(f.read)
+
+    def read(self, size=-1):
+        prefix = self.prefix
+        if size is None or size < 0:
+            self.prefix = b""
+            return prefix + self.f.read()
+        if not prefix:
+            return self._read(size)
+        if size <= len(prefix):
+            self.prefix = prefix[size:]
+            return prefix[:size]
+        self.prefix = b""
+        return prefix + self._read(size - len(prefix))
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        self.f.close()
+
+
+def compression_opener(head):
+    """Return the function opening data starting with head, or None."""
+    for magic, opener in COMPRESSED_FORMATS:
+        if bytes(head[: len(magic)]) == magic:
+            return opener
+    return None
+
+
+def decompressed(source):
+    """Return source, or a stream of its decompressed data if it is compressed.
+
+    source may be an open binary file or a buffer.
+    Files need not be seekable, so pipes and sockets are supported.
+    Decompressed data is returned as a non-seekable `StreamReader`.
+    """
+    try:
+        head = memoryview(source)[:MAGIC_SIZE]
+    except TypeError:
+        head = None
+    if head is not None:
+        opener = compression_opener(head)
+        if opener is None:
+            return source
+        return StreamReader(opener(io.BytesIO(source)))
+    prefix = b""
+    if hasattr(source, "peek"):
+        head = source.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    elif _seekable(source):
+        position = source.tell()
+        head = source.read(MAGIC_SIZE)
+        source.seek(position)
+    else:
+        head = prefix = _exact_reader(source.read)(MAGIC_SIZE)
+    opener = compression_opener(head)
+    if opener is None:
+        return StreamReader(source, prefix) if prefix else source
+    return StreamReader(opener(StreamReader(source, prefix)))
@@ -1,45 +1,654 @@
-import struct
-from chunk import Chunk
+import io
+import os
+from struct import Struct, pack, unpack
+
+HEADER = Struct("<4sI")
+
+
+class BufferReader:
+    """Read-only file-like cursor over a buffer.
+
+    Unlike `io.BytesIO`, `read` returns memoryview slices of the
+    underlying buffer, so chunk payloads are never copied.
+    Any object supporting the buffer protocol may be used
+    (bytes, bytearray, memoryview, mmap).
+    """
+
+    def __init__(self, buffer, offset=0):
+        self.buffer = memoryview(buffer).cast("B")
+        self.pos = offset
+
+    def read(self, size=-1):
+        start = self.pos
+        end = len(self.buffer) if size is None or size < 0 else start + size
+        data = self.buffer[start:end]
+        self.pos = start + len(data)
+        return data
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.pos
+        elif whence == 2:
+            offset += len(self.buffer)
+        self.pos = max(0, offset)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def close(self):
+        self.buffer.release()
+
+
+class LazyPayload:
+    """Handle to a chunk payload that has not been read yet.
+
+    The payload is identified by its source, offset, and size.
+    source is a filename (reopened on each read) or an open file.
+    """
+
+    block_size = 1 << 20
+
+    def __init__(self, source, offset, size):
+        self.source = source
+        self.offset = offset
+        self.size = size
+        self._data = None
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return "<LazyPayload {!r} offset={} size={}>".format(
+            self.source, self.offset, self.size
+        )
+
+    def load(self):
+        """Read and return the payload as bytes."""
+        return b"".join(self.blocks())
+
+    def readinto(self, buffer):
+        """Read the payload into a writable buffer of at least `size` bytes."""
+        view = memoryview(buffer).cast("B")
+        position = 0
+        for block in self.blocks():
+            view[position : position + len(block)] = block
+            position += len(block)
+
+    def preload(self):
+        """Read the payload now, so it no longer depends on its source."""
+        if self._data is None:
+            self._data = b"".join(self.blocks())
+
+    def is_in(self, file):
+        """Return True if the payload is read from file, a filename or file."""
+        if self._data is not None:
+            return False
+        try:
+            return os.path.samestat(_stat(self.source), _stat(file))
+        except (AttributeError, OSError, ValueError):
+            return False
+
+    def blocks(self):
+        """Yield the payload in blocks of at most `block_size` bytes."""
+        if self._data is not None:
+            for offset in range(0, self.size, self.block_size):
+                yield self._data[offset : offset + self.block_size]
+        elif isinstance(self.source, str):
+            with open(self.source, "rb") as f:
+                yield from self._blocks(f)
+        else:
+            f = self.source
+            position = f.tell()
+            try:
+                yield from self._blocks(f)
+            finally:
+                f.seek(position)
+
+    def _blocks(self, f):
+        f.seek(self.offset)
+        remaining = self.size
+        while remaining > 0:
+            block = f.read(min(remaining, self.block_size))
+            if not block:
+                raise EOFError("Payload truncated at offset {}".format(f.tell()))
+            remaining -= len(block)
+            yield block
+
+
+def copy_payload(data):
+    """Return chunk data as bytes, leaving `LazyPayload` handles as they are.
+
+    Chunk payloads are memoryviews; objects keep bytes instead, so they
+    can be pickled and do not depend on the source afterwards. A view
+    spanning a whole bytes object, as read from a file, returns that
+    object without copying it; views into a larger, mutable, or mapped
+    buffer are copied.
+    """
+    if isinstance(data, LazyPayload):
+        return data
+    if isinstance(data, memoryview):
+        source = data.obj
+        if type(source) is bytes and data.nbytes == len(source):
+            return source
+    return bytes(data)
+
+
+def _stat(file):
+    if isinstance(file, (str, bytes, os.PathLike)):
+        return os.stat(file)
+    return os.fstat(file.fileno())
+
+
+def lazy_payloads(chunks):
+    """Yield the `LazyPayload` handles among chunks, and in nested containers."""
+    for _, data in chunks:
+        if isinstance(data, LazyPayload):
+            yield data
+        elif hasattr(data, "chunks"):
+            yield from lazy_payloads(data.chunks())
+
+
+def as_file(source):
+    """Return a file-like object for source.
+
+    Buffers are wrapped in a `BufferReader`;
+    anything else is assumed to already be a readable file.
+    """
+    if isinstance(source, BufferReader):
+        return source
+    try:
+        return BufferReader(source)
+    except TypeError:
+        return source
+
+
+def chunk_tree(chunks):
+    """Return (entries, size) for the given (name, data) chunks.
+
+    Each entry is a (name, data, size) tuple with name padded to four bytes.
+    data may be a nested container (any object with a ``chunks`` method),
+    in which case it is measured recursively and its entry holds a list
+    of nested entries instead of bytes.
+    size is the exact number of bytes needed to write all chunks;
+    no payload is copied to compute it.
+    """
+    entries = []
+    total = 0
+    for name, data in chunks:
+        if name is None:
+            continue
+        name = name[:4]
+        name = name + b" " * (4 - len(name))
+        if hasattr(data, "chunks"):
+            data, size = chunk_tree(data.chunks())
+        else:
+            size = len(data)
+        entries.append((name, data, size))
+        total += 8 + size
+    return entries, total
+
+
+def chunks_size(chunks):
+    """Return the number of bytes needed to write the given (name, data) chunks.
+
+    Each chunk takes an 8-byte header plus the length of its payload;
+    nested containers are measured the same way. Payloads are only
+    measured, and no entries are kept, so the cost depends on the number
+    of chunks and not on the size of their payloads.
+    """
+    total = 0
+    for name, data in chunks:
+        if name is None:
+            continue
+        if hasattr(data, "chunks"):
+            total += 8 + chunks_size(data.chunks())
+        else:
+            total += 8 + len(data)
+    return total
+
+
+def write_chunk_tree(buffer, offset, entries):
+    """Write entries from `chunk_tree` into buffer at offset.
+
+    Returns the offset just past the last chunk written.
+    """
+    pack_header = HEADER.pack_into
+    for name, data, size in entries:
+        pack_header(buffer, offset, name, size)
+        offset += 8
+        if isinstance(data, list):
+            offset = write_chunk_tree(buffer, offset, data)
+        elif isinstance(data, LazyPayload):
+            data.readinto(memoryview(buffer)[offset : offset + size])
+            offset += size
+        else:
+            buffer[offset : offset + size] = data
+            offset += size
+    return offset
 
 
 def write_chunk(f, name, data):
     """Write the given name and data to file f (no-op if name is None)"""
     if name is None:
         return
+    if hasattr(data, "chunks"):
+        data = data.read()
+    elif isinstance(data, LazyPayload):
+        data = data.load()
     name = name[:4]
     name = name + b" " * (4 - len(name))
     size = len(data)
     f.write(name)
-    f.write(struct.pack("<I", size))
+    f.write(pack("<I", size))
     f.write(data)
 
 
-def chunks(f):
-    """Yield (name, data) chunks read from file f."""
+#: File types whose descriptor receives exactly the bytes written to them.
+OS_FILE_TYPES = (io.FileIO, io.BufferedWriter, io.BufferedRandom)
+
+
+class ChunkWriter:
+    """Batch chunk writes to a file.
+
+    Chunk headers and small payloads are gathered into a list of buffers,
+    which is flushed with a single `os.writev` call when the file is an
+    OS file, or a single joined write otherwise. Wrappers that expose the
+    descriptor of another file, such as `gzip.GzipFile`, are written through.
+    Payloads are held by reference until flushed; payloads of at least
+    ``passthrough_size`` bytes, such as sample data, are never concatenated.
+
+    Use as a context manager, or call `flush` when done.
+    """
+
+    buffer_size = 1 << 16
+    passthrough_size = 1 << 16
+
+    def __init__(self, f):
+        self.f = f
+        self._buffers = []
+        self._pending = 0
+        self._fd = None
+        if hasattr(os, "writev") and isinstance(f, OS_FILE_TYPES):
+            try:
+                self._fd = f.fileno()
+            except (OSError, ValueError):
+                pass
+        if self._fd is not None:
+            try:
+                self._iov_max = os.sysconf("SC_IOV_MAX")
+            except (AttributeError, OSError, ValueError):
+                self._iov_max = 1024
+            if self._iov_max <= 0:
+                self._iov_max = 1024
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write_chunk(self, name, data):
+        """Queue the given name and data (no-op if name is None)
+
+        data may be a nested container, whose chunks are written in place.
+        """
+        if name is None:
+            return
+        if hasattr(data, "chunks"):
+            self.write_chunk_tree(chunk_tree([(name, data)])[0])
+            return
+        name = name[:4]
+        name = name + b" " * (4 - len(name))
+        size = len(data)
+        buffers = self._buffers
+        buffers.append(HEADER.pack(name, size))
+        if isinstance(data, LazyPayload):
+            if data.is_in(self.f):
+                raise ValueError(
+                    "Cannot copy a payload from the file being written; "
+                    "pass the filename to write_to to save in place"
+                )
+            # Copy through block by block, without holding the whole payload.
+            self.flush()
+            for block in data.blocks():
+                self._buffers.append(block)
+                self.flush()
+            return
+        if size:
+            buffers.append(data)
+        self._pending += 8 + size
+        if self._pending >= self.buffer_size:
+            self.flush()
+        elif self._fd is not None and len(buffers) >= self._iov_max:
+            self.flush()
+
+    def write_chunk_tree(self, entries):
+        """Queue entries produced by `chunk_tree`."""
+        for name, data, size in entries:
+            if isinstance(data, list):
+                self._buffers.append(HEADER.pack(name, size))
+                self._pending += 8
+                self.write_chunk_tree(data)
+            else:
+                self.write_chunk(name, data)
+
+    def flush(self):
+        """Write all queued chunks to the file."""
+        buffers, self._buffers, self._pending = self._buffers, [], 0
+        if not buffers:
+            return
+        if self._fd is None:
+            self._write_joined(buffers)
+        else:
+            self._writev(buffers)
+
+    def _write_joined(self, buffers):
+        write = self.f.write
+        small = []
+        for buffer in buffers:
+            if len(buffer) >= self.passthrough_size:
+                if small:
+                    write(b"".join(small))
+                    small = []
+                write(buffer)
+            else:
+                small.append(buffer)
+        if small:
+            write(b"".join(small))
+
+    def _writev(self, buffers):
+        f, fd = self.f, self._fd
+        f.flush()
+        iov_max = self._iov_max
+        while buffers:
+            batch = buffers[:iov_max]
+            written = os.writev(fd, batch)
+            expected = sum(len(b) for b in batch)
+            if written < expected:
+                # Partial write: resume from the first unwritten byte.
+                for i, buffer in enumerate(batch):
+                    if written < len(buffer):
+                        remainder = memoryview(buffer)[written:]
+                        buffers = [remainder] + batch[i + 1 :] + buffers[iov_max:]
+                        break
+                    written -= len(buffer)
+            else:
+                buffers = buffers[iov_max:]
+        # Resynchronize any position cached by a buffered file object.
+        if _seekable(f):
+            f.seek(os.lseek(fd, 0, os.SEEK_CUR))
+
+
+def chunks(source, lazy=None):
+    """Yield (name, data) chunks read from source.
+
+    source may be a file, or a buffer such as bytes or an mmap.
+    data is a memoryview; for buffer sources it points directly
+    into the source instead of holding a copy.
+
+    lazy is an optional callable taking (name, size).
+    For seekable file sources, payloads it returns true for are skipped,
+    and data is a `LazyPayload` handle instead.
+    """
+    f = as_file(source)
+    read = f.read
+    unpack_header = HEADER.unpack
+    if isinstance(f, BufferReader) or not _seekable(f):
+        lazy = None
+    if lazy is not None:
+        filename = getattr(f, "name", None)
+        if isinstance(filename, str) and os.path.isfile(filename):
+            lazy_source = filename
+        else:
+            lazy_source = f
+    if not isinstance(f, BufferReader):
+        read = _exact_reader(read)
     while True:
-        try:
-            c = Chunk(f, align=False, bigendian=False)
-            yield (c.getname(), c.read())
-            c.skip()
-        except EOFError:
+        header = read(8)
+        if len(header) < 8:
+            break
+        name, size = unpack_header(header)
+        if lazy is not None and lazy(name, size):
+            offset = f.tell()
+            f.seek(size, 1)
+            yield (name, LazyPayload(lazy_source, offset, size))
+        else:
+            yield (name, memoryview(read(size)))
+
+
+def _exact_reader(read):
+    """Wrap a read function so it only returns short reads at end of stream.
+
+    Pipes, sockets, and HTTP responses may return fewer bytes than requested.
+    """
+
+    def read_exactly(size):
+        data = read(size)
+        if data is None:
+            data = b""
+        if len(data) >= size:
+            return data
+        parts = [data]
+        remaining = size - len(data)
+        while remaining > 0:
+            part = read(remaining)
+            if not part:
+                break
+            parts.append(part)
+            remaining -= len(part)
+        return b"".join(parts)
+
+    return read_exactly
+
+
+class ChunkStream:
+    """Iterator over (name, data) chunks, shared by nested readers.
+
+    Chunks can be pushed back, so that a nested reader can consume
+    a chunk its parent has already read.
+    This lets a whole file be parsed in one forward pass,
+    from sources that cannot seek, such as pipes or sockets.
+    """
+
+    def __init__(self, source, lazy=None):
+        self._chunks = chunks(source, lazy)
+        self._pushed = []
+        self.last = None
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Create a stream over an iterable of (name, data) chunks."""
+        stream = cls.__new__(cls)
+        stream._chunks = iter(chunks)
+        stream._pushed = []
+        stream.last = None
+        return stream
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._pushed:
+            chunk = self._pushed.pop()
+        else:
+            chunk = next(self._chunks)
+        self.last = chunk
+        return chunk
+
+    def push_back(self, name, data):
+        """Return a chunk to the stream, to be yielded next."""
+        self._pushed.append((name, data))
+
+
+def _seekable(f):
+    seekable = getattr(f, "seekable", None)
+    return seekable is not None and seekable()
+
+
+def chunk_headers(source, end=None):
+    """Yield (name, offset, size) for each chunk in source.
+
+    Only chunk headers are read; payloads are skipped by seeking past them,
+    so source must be seekable.
+    offset is the absolute position of the chunk header within source.
+    Scanning stops at end, if given.
+    The position of source may be changed between iterations.
+    """
+    f = as_file(source)
+    read, seek = f.read, f.seek
+    unpack_header = HEADER.unpack
+    offset = f.tell()
+    while end is None or offset + 8 <= end:
+        header = read(8)
+        if len(header) < 8:
             break
+        name, size = unpack_header(header)
+        yield (name, offset, size)
+        offset = seek(offset + 8 + size)
+
 
+def dump_file(f, tags=None, max_bytes=None):
+    """Print a hex dump of each chunk in f.
 
-def dump_file(f):
+    If tags is given, only chunks with those names are dumped.
+    If max_bytes is given, at most that many bytes of each payload are dumped.
+    Payloads are read in blocks, so memory use does not depend on chunk size.
+    """
     from hexdump import hexdump
     from rv import ENCODING
 
-    for name, data in chunks(f):
+    f = as_file(f)
+    block_size = 1 << 16
+    for name, offset, size in chunk_headers(f):
+        if tags is not None and name not in tags:
+            continue
         print(name.decode(ENCODING), end="  ")
+        f.seek(offset + 8)
+        remaining = size if max_bytes is None else min(size, max_bytes)
+        position = 0
         i = None
-        for i, line in enumerate(hexdump(data, "generator")):
-            if i > 0:
-                print("      " + line)
-            else:
-                print(line)
+        while remaining > 0:
+            block = f.read(min(remaining, block_size))
+            if not block:
+                break
+            for line in hexdump(bytes(block), "generator"):
+                line = "{:08X}{}".format(int(line[:8], 16) + position, line[8:])
+                i = 0 if i is None else i + 1
+                if i > 0:
+                    print("      " + line)
+                else:
+                    print(line)
+            position += len(block)
+            remaining -= len(block)
         if i is None:
             print()
+        if position < size:
+            print("      ... {} more bytes".format(size - position))
+        print()
+
+
+# (module type, CHNM) pairs whose CHDT payload is an embedded project or synth.
+EMBEDDED_CHUNKS = {("MetaModule", 0), ("Sampler", 0x10A)}
+
+
+def summarize_file(f, largest=10):
+    """Print a summary of the chunks in f, without decoding payloads.
+
+    The summary includes per-name chunk counts and total sizes,
+    the largest chunks, and the module and pattern structure of the
+    file and of each embedded MetaModule or Sampler effect project.
+    Only chunk headers and a few small payloads are read,
+    so memory use is constant regardless of file size.
+    """
+    from heapq import heappush, heappushpop
+    from rv import ENCODING
+
+    f = as_file(f)
+    counts = {}
+    totals = {}
+    biggest = []
+
+    def read_string(offset, size):
+        f.seek(offset + 8)
+        data = bytes(f.read(min(size, 256)))
+        data = data[: data.find(0)] if 0 in data else data
+        return data.decode(ENCODING, "replace")
+
+    def walk(start, end, depth, label):
+        indent = "  " * depth
+        modules = empty_modules = patterns = clones = empty_patterns = 0
+        in_module = in_pattern = False
+        mtype = mname = chnm = None
+        container = None
+        f.seek(start)
+        for name, offset, size in chunk_headers(f, end):
+            counts[name] = counts.get(name, 0) + 1
+            totals[name] = totals.get(name, 0) + size
+            entry = (size, offset, name)
+            if len(biggest) < largest:
+                heappush(biggest, entry)
+            elif largest:
+                heappushpop(biggest, entry)
+            if container is None:
+                container = name.decode(ENCODING, "replace")
+                print("{}{} {} at {:#x}".format(indent, label, container, offset))
+            if name == b"SFFF":
+                in_module = True
+                mtype, mname, chnm = "Output", None, None
+            elif name == b"SNAM" and in_module:
+                mname = read_string(offset, size)
+            elif name == b"STYP" and in_module:
+                mtype = read_string(offset, size)
+            elif name == b"CHNM" and in_module and size == 4:
+                f.seek(offset + 8)
+                chnm, = unpack("<I", f.read(4))
+            elif name == b"CHDT" and (mtype, chnm) in EMBEDDED_CHUNKS:
+                index = modules + empty_modules
+                nested_label = "{}[{}] {!r}:".format(mtype, index, mname)
+                walk(offset + 8, offset + 8 + size, depth + 1, nested_label)
+            elif name == b"SEND":
+                if in_module:
+                    modules += 1
+                else:
+                    empty_modules += 1
+                in_module = False
+                mtype = None
+            elif name == b"PDTA":
+                in_pattern = True
+            elif name == b"PPAR":
+                in_pattern = True
+                clones += 1
+            elif name == b"PEND":
+                if in_pattern:
+                    patterns += 1
+                else:
+                    empty_patterns += 1
+                in_pattern = False
+        print(
+            "{}  {} modules ({} empty slots), "
+            "{} patterns ({} clones, {} empty slots)".format(
+                indent,
+                modules,
+                empty_modules,
+                patterns,
+                clones,
+                empty_patterns,
+            )
+        )
+
+    walk(f.tell(), None, 0, "File:")
+    print()
+    print("{:6s} {:>10s} {:>14s}".format("Chunk", "Count", "Bytes"))
+    for name in sorted(counts, key=lambda n: totals[n], reverse=True):
+        label = name.decode(ENCODING, "replace")
+        print("{:6s} {:10d} {:14d}".format(label, counts[name], totals[name]))
+    if biggest:
         print()
+        print("Largest chunks:")
+        for size, offset, name in sorted(biggest, reverse=True):
+            label = name.decode(ENCODING, "replace")
+            print("{:6s} {:14d} bytes at {:#x}".format(label, size, offset))
 
 
 def dump_tool():
@@ -49,10 +658,42 @@ def dump_tool():
     parser.add_argument(
         "filename", metavar="FILE", type=str, nargs=1, help="File to load and dump"
     )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Summarize chunks and structure instead of dumping payloads",
+    )
+    parser.add_argument(
+        "--largest",
+        metavar="N",
+        type=int,
+        default=10,
+        help="Number of largest chunks to list in the summary",
+    )
+    parser.add_argument(
+        "--tag",
+        metavar="TAG",
+        action="append",
+        dest="tags",
+        help="Only dump chunks with this name (may be repeated)",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        metavar="N",
+        type=int,
+        default=None,
+        help="Dump at most N bytes of each chunk",
+    )
     args = parser.parse_args()
     filename = args.filename[0]
+    tags = None
+    if args.tags:
+        tags = {tag.encode("ascii")[:4].ljust(4) for tag in args.tags}
     with open(filename, "rb") as f:
-        dump_file(f)
+        if args.summary:
+            summarize_file(f, largest=args.largest)
+        else:
+            dump_file(f, tags=tags, max_bytes=args.max_bytes)
 
 
 if __name__ == "__main__":
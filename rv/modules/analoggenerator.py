@@ -2,6 +2,7 @@ from enum import Enum
 
 from rv.chunks import DirtyWaveformChunk
 from rv.controller import Controller
+from rv.lib.iff import copy_payload
 from rv.modules import Behavior as B, Module
 from rv.option import Option
 
@@ -113,6 +114,6 @@ class AnalogGenerator(Module):
             self.load_dirty_waveform(chunk)
 
     def load_dirty_waveform(self, chunk):
-        self.dirty_waveform.samples = chunk.chdt
+        self.dirty_waveform.samples = copy_payload(chunk.chdt)
         self.dirty_waveform.format = self.dirty_waveform.Format(chunk.chff or 1)
         self.dirty_waveform.freq = chunk.chfr
@@ -7,12 +7,36 @@ from rv.modules import MODULE_CLASSES
 from rv.option import Option
 
 
+class ModuleName:
+    """Name of a module instance, defaulting to the name set on its class.
+
+    Renaming a module attached to a project updates the project's index
+    of modules by name.
+    """
+
+    def __init__(self, default):
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+        return instance.__dict__.get("name", self.default)
+
+    def __set__(self, instance, value):
+        old_name = self.__get__(instance, None)
+        instance.__dict__["name"] = value
+        parent = instance.__dict__.get("parent")
+        if parent is not None and value != old_name:
+            parent._module_renamed(instance)
+
+
 class ModuleMeta(type):
     """Ensures controllers are set up in the order they are defined."""
 
     def __init__(cls, class_name, bases, class_dict):
         type.__init__(cls, class_name, bases, class_dict)
         cls.__init_registry(class_dict)
+        cls.__init_name(class_dict)
         cls.__init_controllers(class_dict)
         cls.__init_options(class_dict)
         cls.__init_docstring(class_dict)
@@ -22,6 +46,10 @@ class ModuleMeta(type):
         if class_dict.get("mtype") is not None:
             MODULE_CLASSES[class_dict["mtype"]] = cls
 
+    def __init_name(cls, class_dict):
+        if "name" in class_dict:
+            cls.name = ModuleName(class_dict["name"])
+
     def __init_controllers(cls, class_dict):
         ordered_controllers = [
             (k, v) for k, v in class_dict.items() if isinstance(v, Controller)
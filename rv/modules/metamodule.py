@@ -1,5 +1,4 @@
 from enum import Enum
-from io import BytesIO
 from itertools import chain
 import re
 from string import digits
@@ -10,6 +9,7 @@ from slugify import slugify_unicode
 import rv
 from rv.chunks import ArrayChunk
 from rv.controller import Controller, Range
+from rv.lib.iff import LazyPayload
 from rv.modules import Behavior as B, Module
 from rv.option import Option
 from rv.project import Project
@@ -121,6 +121,8 @@ class MetaModule(Module):
 
         @staticmethod
         def update_user_defined_controllers(metamodule):
+            if not any(mapping.module for mapping in metamodule.mappings.values):
+                return
             project = metamodule.project
             items = zip(metamodule.mappings.values, metamodule.user_defined)
             for mapping, user_defined_controller in items:
@@ -186,7 +188,6 @@ class MetaModule(Module):
         super(MetaModule, self).__init__(**kwargs)
         self.mappings = self.MappingArray()
         self.project = project if project else Project()
-        self.project.metamodule = self
 
     def __getattr__(self, key):
         if USER_DEFINED_RE.match(key):
@@ -222,6 +223,20 @@ class MetaModule(Module):
     def __dir__(self):
         return super().__dir__() + [name for name in self.user_defined_aliases if name]
 
+    @property
+    def project(self):
+        """The embedded project, read on first access if it was loaded lazily."""
+        project = self._project
+        if isinstance(project, LazyPayload):
+            project = self.project = read_sunvox_file(project.load())
+        return project
+
+    @project.setter
+    def project(self, project):
+        self._project = project
+        if not isinstance(project, LazyPayload):
+            project.metamodule = self
+
     @property
     def chnk(self):
         return 8 + self.user_defined_controllers
@@ -279,7 +294,7 @@ class MetaModule(Module):
 
     def specialized_iff_chunks(self):
         yield (b"CHNM", pack("<I", 0))
-        yield (b"CHDT", self.project.read())
+        yield (b"CHDT", self._project)
         for chunk in self.mappings.chunks():
             yield chunk
         for chunk in super(MetaModule, self).specialized_iff_chunks():
@@ -289,6 +304,12 @@ class MetaModule(Module):
                 yield (b"CHNM", pack("<I", i))
                 yield (b"CHDT", controller.label.encode(rv.ENCODING) + b"\0")
 
+    def accepts_lazy_chunk(self, chunk):
+        return chunk.chnm == 0
+
+    def chunk_part(self, chunk):
+        return "projects" if chunk.chnm == 0 else None
+
     def load_chunk(self, chunk):
         if chunk.chnm == self.options_chnm:
             self.load_options(chunk)
@@ -302,10 +323,13 @@ class MetaModule(Module):
             self.load_label(chunk)
 
     def load_project(self, chunk):
-        self.project = read_sunvox_file(BytesIO(chunk.chdt))
+        if isinstance(chunk.chdt, LazyPayload):
+            self.project = chunk.chdt
+        else:
+            self.project = read_sunvox_file(chunk.chdt)
 
     def load_label(self, chunk):
         controller = self.user_defined[chunk.chnm - 8]
-        data = chunk.chdt
+        data = bytes(chunk.chdt)
         data = data[: data.find(0)] if 0 in data else data
         controller.label = data.decode(rv.ENCODING)
@@ -1,4 +1,3 @@
-import io
 import logging
 from collections import OrderedDict
 from collections import defaultdict
@@ -264,12 +263,7 @@ class Module(metaclass=ModuleMeta):
         self._visualization = v
 
     def clone(self):
-        synth = Synth(self)
-        f = io.BytesIO()
-        synth.write_to(f)
-        f.seek(0)
-        synth2 = read_sunvox_file(f)
-        f.close()
+        synth2 = read_sunvox_file(Synth(self).read())
         return synth2.module
 
     def get_raw(self, name):
@@ -355,6 +349,21 @@ class Module(metaclass=ModuleMeta):
         values += [False] * (64 - len(values))
         yield (b"CHDT", pack("B" * 64, *values))
 
+    def accepts_lazy_chunk(self, chunk):
+        """Return True if load_chunk accepts a chunk with an unread CHDT payload.
+
+        Override this in module subclasses that can defer reading large payloads.
+        """
+        return False
+
+    def chunk_part(self, chunk):
+        """Return the part of the file that chunk belongs to, or None.
+
+        Chunks of a part excluded from :py:func:`rv.api.read_sunvox_file`
+        are not passed to load_chunk.
+        """
+        return None
+
     def load_chunk(self, chunk):
         """Load a CHNK/CHNM/CHDT/CHFF/CHFR block into this module."""
         log.warning(_F("load_chunk not implemented for {}", self.__class__.__name__))
@@ -129,11 +129,7 @@ class MultiCtl(Module):
 
     def on_value_changed(self, value, down, up):
         if self.parent is not None and down:
-            downstream_mods = []
-            for to_mod in range(256):
-                from_mods = self.parent.module_connections[to_mod]
-                if self.index in from_mods:
-                    downstream_mods.append(to_mod)
+            downstream_mods = self.parent.connection_graph.outgoing(self.index)
             for i, to_mod in enumerate(downstream_mods):
                 mapping = self.mappings.values[i]
                 mod = self.parent.modules[to_mod]
@@ -167,21 +163,15 @@ class MultiCtl(Module):
 
     def reflect(self, index=0, propagate=True):
         """Reflect the value of the controller mapped at the given index; inverse of setting value"""
-        downstream_mods = []
-        for to_mod in range(256):
-            from_mods = self.parent.module_connections[to_mod]
-            if self.index in from_mods:
-                downstream_mods.append(to_mod)
-                if len(downstream_mods) == index + 1:
-                    break
-        else:
+        downstream_mods = self.parent.connection_graph.outgoing(self.index)
+        if not 0 <= index < len(downstream_mods):
             raise IndexError("No destination module mapped at index {}".format(index))
         mapping = self.mappings.values[index]
         if mapping.controller == 0:
             raise IndexError(
                 "No destination controller mapped at index {}".format(index)
             )
-        reflect_mod = self.parent.modules[downstream_mods[-1]]
+        reflect_mod = self.parent.modules[downstream_mods[index]]
         reflect_ctl_name = list(reflect_mod.controllers)[mapping.controller - 1]
         reflect_ctl = reflect_mod.controllers[reflect_ctl_name]
         reflect_value = getattr(reflect_mod, reflect_ctl_name)
@@ -10,6 +10,7 @@ from itertools import chain
 from struct import pack, unpack
 
 from rv.controller import Controller
+from rv.lib.iff import LazyPayload, copy_payload
 from rv.modules import Behavior as B, Module
 from rv.note import NOTE
 from rv.option import Option
@@ -261,9 +262,19 @@ class Sampler(Module):
             multiplier = {Sampler.Channels.mono: 1, Sampler.Channels.stereo: 2}
             return size[self.format] * multiplier[self.channels]
 
+        @property
+        def data(self):
+            if isinstance(self._data, LazyPayload):
+                self._data = self._data.load()
+            return self._data
+
+        @data.setter
+        def data(self, value):
+            self._data = value
+
         @property
         def frames(self):
-            return len(self.data) // self.frame_size
+            return len(self._data) // self.frame_size
 
     volume = Controller((0, 512), 256)
     panning = Controller((-128, 128), 0)
@@ -319,11 +330,12 @@ class Sampler(Module):
             self.effect_control_envelopes[2].chunks(),
             self.effect_control_envelopes[3].chunks(),
         ]
-        if self.effect:
-            iters += self.effect.chunks()
         for iter in iters:
             for chunk in iter:
                 yield chunk
+        if self.effect:
+            yield (b"CHNM", pack("<I", 0x10A))
+            yield (b"CHDT", self.effect)
         for chunk in super(Sampler, self).specialized_iff_chunks():
             yield chunk
         for i, sample in enumerate(self.samples):
@@ -404,11 +416,17 @@ class Sampler(Module):
         yield (b"CHDT", f.getvalue())
         f.close()
         yield (b"CHNM", pack("<I", i * 2 + 2))
-        yield (b"CHDT", sample.data)
+        yield (b"CHDT", sample._data)
         yield (b"CHFF", pack("<I", sample.format.value | sample.channels.value))
         if sample.rate != 44100:
             yield (b"CHFR", pack("<I", sample.rate))
 
+    def accepts_lazy_chunk(self, chunk):
+        return 0 < chunk.chnm < 0x101 and chunk.chnm % 2 == 0
+
+    def chunk_part(self, chunk):
+        return "samples" if self.accepts_lazy_chunk(chunk) else None
+
     def load_chunk(self, chunk):
         chnm = chunk.chnm
         chdt = chunk.chdt
@@ -421,7 +439,7 @@ class Sampler(Module):
         elif chnm < 0x101 and chnm % 2 == 0:
             self.load_sample_data(chunk)
         elif chnm == 0x101:
-            self._unknown_0x101 = chdt
+            self._unknown_0x101 = copy_payload(chdt)
         elif chnm == 0x102:
             self.volume_envelope.load_chdt(chdt)
         elif chnm == 0x103:
@@ -431,10 +449,10 @@ class Sampler(Module):
         elif 0x105 <= chnm <= 0x108:
             self.effect_control_envelopes[chnm - 0x105].load_chdt(chdt)
         elif chnm == 0x10A:
-            self.effect = read_sunvox_file(BytesIO(chdt))
+            self.effect = read_sunvox_file(chdt)
 
     def load_envelopes(self, chunk):
-        data = chunk.chdt
+        data = copy_payload(chunk.chdt)
         vol = self.volume_envelope
         pan = self.panning_envelope
         vol._legacy_point_bytes = data[0x84:0xB4]
@@ -464,7 +482,7 @@ class Sampler(Module):
     def load_sample_meta(self, chunk):
         index = (chunk.chnm - 1) // 2
         sample = self.samples[index] = self.Sample()
-        data = chunk.chdt
+        data = copy_payload(chunk.chdt)
         sample.loop_start, = unpack("<I", data[0x04:0x08])
         sample.loop_end, = unpack("<I", data[0x08:0x0C])
         sample.volume = data[0x0C]
@@ -490,7 +508,7 @@ class Sampler(Module):
     def load_sample_data(self, chunk):
         index = (chunk.chnm - 2) // 2
         sample = self.samples[index]
-        sample.data = chunk.chdt
+        sample.data = copy_payload(chunk.chdt)
         format = chunk.chff & 0x07 or 1
         sample.format = self.Format(format)
         if sample.format is None:
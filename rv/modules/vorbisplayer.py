@@ -1,6 +1,7 @@
 from struct import pack
 
 from rv.controller import Controller
+from rv.lib.iff import LazyPayload, copy_payload
 from rv.modules import Behavior as B, Module
 
 
@@ -13,7 +14,7 @@ class VorbisPlayer(Module):
 
     behaviors = {B.sends_audio}
 
-    data = None
+    _data = None
 
     volume = Controller((0, 512), 256)
     original_speed = Controller(bool, True)
@@ -28,12 +29,28 @@ class VorbisPlayer(Module):
         super(VorbisPlayer, self).__init__(**kwargs)
         self.data = data
 
+    @property
+    def data(self):
+        if isinstance(self._data, LazyPayload):
+            self._data = self._data.load()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
     def specialized_iff_chunks(self):
         yield (b"CHNM", pack("<I", 0))
-        yield (b"CHDT", self.data or b"")
+        yield (b"CHDT", self._data or b"")
         for chunk in super(VorbisPlayer, self).specialized_iff_chunks():
             yield chunk
 
+    def accepts_lazy_chunk(self, chunk):
+        return chunk.chnm == 0
+
+    def chunk_part(self, chunk):
+        return "vorbis" if chunk.chnm == 0 else None
+
     def load_chunk(self, chunk):
         if chunk.chnm == 0:
-            self.data = chunk.chdt
+            self.data = copy_payload(chunk.chdt)
@@ -1,7 +1,7 @@
 from enum import IntEnum
-from struct import pack, unpack
+from struct import Struct
 
-from attr import attr, attributes
+from attr import attr, attributes, fields
 
 from rv.errors import ModuleOwnershipError, PatternOwnershipError
 from rv.lib.validators import in_range
@@ -274,6 +274,11 @@ class NOTECMD(IntEnum):
     PREV_TRACK = 134
 
 
+#: Layout of a note in PDTA chunks: note, vel, module, pad, ctl, val.
+NOTE_STRUCT = Struct("<BBBBHH")
+NOTE_SIZE = NOTE_STRUCT.size
+
+
 @attributes(slots=True)
 class Note:
     """A single note, for use within a :py:class:`Pattern`."""
@@ -349,12 +354,12 @@ class Note:
 
     @property
     def raw_data(self):
-        return pack("<BBBBHH", self.note, self.vel, self.module, 0, self.ctl, self.val)
+        return NOTE_STRUCT.pack(self.note, self.vel, self.module, 0, self.ctl, self.val)
 
     @raw_data.setter
     def raw_data(self, raw_data):
-        self.note, self.vel, self.module, _, self.ctl, self.val = unpack(
-            "<BBBBHH", raw_data
+        self.note, self.vel, self.module, _, self.ctl, self.val = NOTE_STRUCT.unpack(
+            raw_data
         )
 
     def clone(self):
@@ -366,6 +371,12 @@ class Note:
     def is_empty(self):
         return not (self.note or self.vel or self.ctl or self.val)
 
+    def pack_into(self, buffer, offset):
+        """Write this note to buffer at offset, in PDTA layout."""
+        NOTE_STRUCT.pack_into(
+            buffer, offset, self.note, self.vel, self.module, 0, self.ctl, self.val
+        )
+
     def tabular_repr(self, is_on=False, note_fmt="NN VV MM CC EE XXYY"):
         if self.note == NOTECMD.NOTE_OFF:
             nn = "=="
@@ -406,3 +417,124 @@ class Note:
             .replace("XX", xx)
             .replace("YY", yy)
         )
+
+
+def _view_field(name, fmt, offset):
+    field = getattr(fields(Note), name)
+    struct = Struct(fmt)
+
+    def get(self):
+        notes, start = self._cell()
+        (value,) = struct.unpack_from(notes, start + offset)
+        return field.converter(value)
+
+    def set(self, value):
+        value = field.converter(value)
+        if field.validator is not None:
+            field.validator(self, field, value)
+        notes, start = self._writable_cell()
+        struct.pack_into(notes, start + offset, value)
+
+    return property(get, set)
+
+
+class NoteView(Note):
+    """A :py:class:`Note` stored in the note buffer of a :py:class:`Pattern`.
+
+    Reading and setting attributes reads and writes the buffer directly.
+    Use :py:meth:`clone` to get a standalone note.
+    """
+
+    __slots__ = ("_pattern", "_notes", "_offset")
+
+    def __init__(self, pattern, notes, offset):
+        self._pattern = pattern
+        self._notes = notes
+        self._offset = offset
+
+    note = _view_field("note", "<B", 0)
+    vel = _view_field("vel", "<B", 1)
+    module = _view_field("module", "<B", 2)
+    ctl = _view_field("ctl", "<H", 4)
+    val = _view_field("val", "<H", 6)
+
+    def _cell(self):
+        """Return the buffer holding this note, and its offset in it."""
+        return self._notes, self._offset
+
+    _writable_cell = _cell
+
+    @property
+    def pattern(self):
+        return self._pattern
+
+    @property
+    def raw_data(self):
+        notes, start = self._cell()
+        return bytes(notes[start : start + NOTE_SIZE])
+
+    @raw_data.setter
+    def raw_data(self, raw_data):
+        if len(raw_data) != NOTE_SIZE:
+            raise ValueError("Note data must be {} bytes".format(NOTE_SIZE))
+        notes, start = self._writable_cell()
+        notes[start : start + NOTE_SIZE] = raw_data
+
+    def pack_into(self, buffer, offset):
+        notes, start = self._cell()
+        buffer[offset : offset + NOTE_SIZE] = notes[start : start + NOTE_SIZE]
+
+    def _fields(self):
+        return self.note, self.vel, self.module, self.ctl, self.val, self.pattern
+
+    def __eq__(self, other):
+        if not isinstance(other, Note):
+            return NotImplemented
+        return self._fields() == (
+            other.note,
+            other.vel,
+            other.module,
+            other.ctl,
+            other.val,
+            other.pattern,
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Copies and pickles are standalone notes.
+        return Note, self._fields()
+
+    def clone(self):
+        return Note(self.note, self.vel, self.module, self.ctl, self.val)
+
+
+EMPTY_NOTE = bytes(NOTE_SIZE)
+
+
+class SparseNoteView(NoteView):
+    """A :py:class:`Note` of a sparse :py:class:`Pattern`.
+
+    The note is looked up by its cell index (``line * tracks + track``)
+    each time it is read, and only stored once it is set.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, pattern, store, index):
+        self._pattern = pattern
+        self._store = store
+        self._index = index
+
+    def _cell(self):
+        offset = self._store.find(self._index)
+        if offset is None:
+            return EMPTY_NOTE, 0
+        return self._store.cells, offset
+
+    def _writable_cell(self):
+        return self._store.cells, self._store.insert(self._index)
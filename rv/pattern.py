@@ -1,12 +1,13 @@
+import re
+from bisect import bisect_left
 from enum import IntEnum
 from struct import pack
 
 from attr import attr, attributes
-from copy import deepcopy
 
 from rv import ENCODING
 from rv.lib.validators import in_range, is_length
-from rv.note import ALL_NOTES, Note, NOTECMD
+from rv.note import ALL_NOTES, EMPTY_NOTE, NOTE_SIZE, NOTECMD, NoteView, SparseNoteView
 
 
 class PatternAppearanceFlags(IntEnum):
@@ -22,12 +23,325 @@ class PatternFlags(IntEnum):
     solo = 0x10
 
 
+#: Pattern attributes that change where a pattern plays on the timeline.
+PLACEMENT_FIELDS = {"x", "y", "lines", "source"}
+
+#: Offsets of the note, vel, module, effect, and controller bytes of a note.
+NOTE_COLUMN, VEL_COLUMN, MODULE_COLUMN, EFFECT_COLUMN, CONTROLLER_COLUMN = 0, 1, 2, 4, 5
+
+
+def _byte_table(mapping):
+    table = bytearray(range(256))
+    for old, new in mapping.items():
+        table[old] = new
+    return bytes(table)
+
+
+def _translate_column(notes, column, table):
+    """Translate one byte of every note in notes through table."""
+    notes[column::NOTE_SIZE] = notes[column::NOTE_SIZE].translate(table)
+
+
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+class SparseNotes:
+    """The notes of a sparse pattern, holding only notes that are set.
+
+    indexes is the ascending list of cell indexes (``line * tracks + track``)
+    of the notes held, and cells their data in PDTA layout, in the same order.
+    """
+
+    __slots__ = ("indexes", "cells")
+
+    def __init__(self, indexes=(), cells=b""):
+        self.indexes = list(indexes)
+        self.cells = bytearray(cells)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def cell(self, position):
+        """Return the data of the note at position in indexes."""
+        start = position * NOTE_SIZE
+        return self.cells[start : start + NOTE_SIZE]
+
+    def find(self, index):
+        """Return the offset in cells of the note at index, or None."""
+        position = bisect_left(self.indexes, index)
+        if position < len(self.indexes) and self.indexes[position] == index:
+            return position * NOTE_SIZE
+        return None
+
+    def insert(self, index):
+        """Return the offset in cells of the note at index, adding it if needed."""
+        position = bisect_left(self.indexes, index)
+        offset = position * NOTE_SIZE
+        if position == len(self.indexes) or self.indexes[position] != index:
+            self.indexes.insert(position, index)
+            self.cells[offset:offset] = EMPTY_NOTE
+        return offset
+
+    def set(self, index, data):
+        """Set the note at index to data, removing it if data is empty."""
+        if data == EMPTY_NOTE:
+            offset = self.find(index)
+            if offset is not None:
+                del self.indexes[offset // NOTE_SIZE]
+                del self.cells[offset : offset + NOTE_SIZE]
+        else:
+            offset = self.insert(index)
+            self.cells[offset : offset + NOTE_SIZE] = data
+
+    def span(self, start, stop):
+        """Return the positions in indexes of notes from index start to stop."""
+        return bisect_left(self.indexes, start), bisect_left(self.indexes, stop)
+
+    def replace(self, indexes, cells):
+        self.indexes[:] = indexes
+        self.cells[:] = cells
+
+    def select(self, positions):
+        """Keep only the notes at the given ascending positions in indexes."""
+        self.replace(
+            [self.indexes[n] for n in positions],
+            b"".join(self.cell(n) for n in positions),
+        )
+
+    def discard_empty(self):
+        """Remove notes that were cleared by setting all of their fields to 0."""
+        positions = [n for n in range(len(self)) if self.cell(n) != EMPTY_NOTE]
+        if len(positions) != len(self):
+            self.select(positions)
+
+    def load(self, notes):
+        """Replace the notes with the non-empty notes of a PDTA buffer."""
+        indexes = []
+        for match in _NONZERO.finditer(notes):
+            index = match.start() // NOTE_SIZE
+            if not indexes or indexes[-1] != index:
+                indexes.append(index)
+        self.replace(
+            indexes,
+            b"".join(
+                notes[index * NOTE_SIZE : (index + 1) * NOTE_SIZE] for index in indexes
+            ),
+        )
+
+    def to_buffer(self, size):
+        """Return the notes expanded into a PDTA buffer of size bytes."""
+        notes = bytearray(size)
+        for position, index in enumerate(self.indexes):
+            offset = index * NOTE_SIZE
+            if offset >= size:
+                break
+            notes[offset : offset + NOTE_SIZE] = self.cell(position)
+        return notes
+
+    def shift(self, delta, total, rotate=False):
+        """Add delta to all indexes, dropping or wrapping those outside total."""
+        indexes, cells = self.indexes, self.cells
+        if rotate:
+            delta %= total
+            split = bisect_left(indexes, total - delta)
+            shifted = [i + delta - total for i in indexes[split:]]
+            shifted += [i + delta for i in indexes[:split]]
+            cells = cells[split * NOTE_SIZE :] + cells[: split * NOTE_SIZE]
+        elif delta >= 0:
+            split = bisect_left(indexes, total - delta)
+            shifted = [i + delta for i in indexes[:split]]
+            cells = cells[: split * NOTE_SIZE]
+        else:
+            split = bisect_left(indexes, -delta)
+            shifted = [i + delta for i in indexes[split:]]
+            cells = cells[split * NOTE_SIZE :]
+        self.replace(shifted, cells)
+
+    def quantize(self, step, tracks, lines):
+        """Move notes to the nearest line that is a multiple of step."""
+        last = (lines - 1) // step * step
+        moved = []
+        for position, index in enumerate(self.indexes):
+            cell = self.cell(position)
+            if cell == EMPTY_NOTE:
+                continue
+            line, track = divmod(index, tracks)
+            target = min((line + step // 2) // step * step, last)
+            moved.append((abs(target - line), line, target * tracks + track, cell))
+        quantized = {}
+        for _, _, index, cell in sorted(moved, key=lambda m: m[:2]):
+            quantized.setdefault(index, cell)
+        indexes = sorted(quantized)
+        self.replace(indexes, b"".join(quantized[i] for i in indexes))
+
+
+def _note_view(pattern, notes, index):
+    if isinstance(notes, SparseNotes):
+        return SparseNoteView(pattern, notes, index)
+    return NoteView(pattern, notes, index * NOTE_SIZE)
+
+
+class PatternLine:
+    """The notes of one line of a pattern, indexed by track."""
+
+    __slots__ = ("pattern", "notes", "index", "tracks")
+
+    def __init__(self, pattern, notes, index, tracks):
+        self.pattern = pattern
+        self.notes = notes
+        self.index = index
+        self.tracks = tracks
+
+    def __len__(self):
+        return self.tracks
+
+    def _index(self, track):
+        if track < 0:
+            track += self.tracks
+        if not 0 <= track < self.tracks:
+            raise IndexError("track index out of range")
+        return self.index + track
+
+    def __getitem__(self, track):
+        if isinstance(track, slice):
+            return [self[i] for i in range(*track.indices(self.tracks))]
+        return _note_view(self.pattern, self.notes, self._index(track))
+
+    def __setitem__(self, track, note):
+        index = self._index(track)
+        if isinstance(self.notes, SparseNotes):
+            cell = bytearray(NOTE_SIZE)
+            note.pack_into(cell, 0)
+            self.notes.set(index, cell)
+        else:
+            note.pack_into(self.notes, index * NOTE_SIZE)
+
+    def __iter__(self):
+        pattern, notes = self.pattern, self.notes
+        for index in range(self.index, self.index + self.tracks):
+            yield _note_view(pattern, notes, index)
+
+
+class PatternData:
+    """The lines of a pattern's notes, each a :py:class:`PatternLine`."""
+
+    __slots__ = ("pattern", "notes", "tracks", "lines")
+
+    def __init__(self, pattern, notes):
+        self.pattern = pattern
+        self.notes = notes
+        self.tracks = pattern.tracks
+        if isinstance(notes, SparseNotes):
+            self.lines = pattern.lines
+        else:
+            self.lines = len(notes) // (self.tracks * NOTE_SIZE)
+
+    def __len__(self):
+        return self.lines
+
+    def __getitem__(self, line):
+        if isinstance(line, slice):
+            return [self[i] for i in range(*line.indices(self.lines))]
+        if line < 0:
+            line += self.lines
+        if not 0 <= line < self.lines:
+            raise IndexError("line index out of range")
+        return PatternLine(self.pattern, self.notes, line * self.tracks, self.tracks)
+
+    def __iter__(self):
+        for line in range(self.lines):
+            yield self[line]
+
+
+class PatternEditLine:
+    """One line of a :py:class:`PatternEdit`, indexed by track."""
+
+    __slots__ = ("edit", "line")
+
+    def __init__(self, edit, line):
+        self.edit = edit
+        self.line = line
+
+    def __len__(self):
+        return self.edit.pattern.tracks
+
+    def __getitem__(self, track):
+        if isinstance(track, slice):
+            return [self[i] for i in range(*track.indices(len(self)))]
+        return NoteView(self.edit.pattern, self.edit.cell(self.line, track), 0)
+
+    def __setitem__(self, track, note):
+        note.pack_into(self.edit.cell(self.line, track, copy=False), 0)
+
+    def __iter__(self):
+        for track in range(len(self)):
+            yield self[track]
+
+
+class PatternEdit:
+    """Pending changes to the notes of a pattern, indexed like ``Pattern.data``.
+
+    A note is copied out of the pattern the first time it is read or set
+    here, and only notes copied are written back by :py:meth:`commit`;
+    the pattern itself is unchanged until then.
+    """
+
+    __slots__ = ("pattern", "cells")
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.cells = {}
+
+    def __len__(self):
+        return self.pattern.lines
+
+    def __getitem__(self, line):
+        if isinstance(line, slice):
+            return [self[i] for i in range(*line.indices(len(self)))]
+        if line < 0:
+            line += len(self)
+        if not 0 <= line < len(self):
+            raise IndexError("line index out of range")
+        return PatternEditLine(self, line)
+
+    def __iter__(self):
+        for line in range(len(self)):
+            yield self[line]
+
+    def cell(self, line, track, copy=True):
+        """Return the buffer holding the note at line and track.
+
+        It starts as a copy of the pattern's note if copy is true,
+        or empty otherwise.
+        """
+        tracks = self.pattern.tracks
+        if track < 0:
+            track += tracks
+        if not 0 <= track < tracks:
+            raise IndexError("track index out of range")
+        index = line * tracks + track
+        cell = self.cells.get(index)
+        if cell is None:
+            if copy:
+                cell = self.pattern._read_cell(index)
+            else:
+                cell = bytearray(NOTE_SIZE)
+            self.cells[index] = cell
+        return cell
+
+    def commit(self):
+        """Write the changed notes into the pattern."""
+        for index, cell in self.cells.items():
+            self.pattern._write_cell(index, cell)
+        self.cells.clear()
+
+
 @attributes
 class Pattern:
 
     name = attr(None)
     tracks = attr(validator=in_range(1, 16), default=4)
-    lines = attr(validator=in_range(1, 2 ** 19), default=32)
+    lines = attr(validator=in_range(1, 2**19), default=32)
     y_size = attr(default=32)
     appearance_flags = attr(default=0)
     icon = attr(default=b"\0" * 32, validator=is_length(32))
@@ -39,24 +353,157 @@ class Pattern:
     project = attr(default=None)
     source = None
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in PLACEMENT_FIELDS:
+            project = self.__dict__.get("project")
+            if project is not None:
+                project.invalidate_timeline()
+
+    def _note_buffer(self):
+        notes = self.__dict__.get("_notes")
+        if notes is None:
+            notes = self._notes = bytearray(self.lines * self.tracks * NOTE_SIZE)
+        return notes
+
+    def _note_store(self):
+        """Return the `SparseNotes` of a sparse pattern, else the note buffer."""
+        sparse = self.__dict__.get("_sparse")
+        return self._note_buffer() if sparse is None else sparse
+
+    def _note_cells(self):
+        """Return the buffer holding the pattern's notes, in PDTA layout."""
+        sparse = self.__dict__.get("_sparse")
+        return self._note_buffer() if sparse is None else sparse.cells
+
+    def _read_cell(self, index):
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            offset = notes.find(index)
+            if offset is None:
+                return bytearray(NOTE_SIZE)
+            return notes.cells[offset : offset + NOTE_SIZE]
+        return notes[index * NOTE_SIZE : (index + 1) * NOTE_SIZE]
+
+    def _write_cell(self, index, cell):
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            notes.set(index, cell)
+        else:
+            notes[index * NOTE_SIZE : (index + 1) * NOTE_SIZE] = cell
+
+    @property
+    def sparse(self):
+        """True if only the notes that are set are stored; see `to_sparse`."""
+        return self.__dict__.get("_sparse") is not None
+
+    def to_sparse(self):
+        """Store only the notes that are set, instead of every line and track.
+
+        Memory use then grows with the number of notes, not with the size
+        of the pattern; notes are expanded to PDTA layout only when
+        ``raw_data`` is read, such as when the pattern is saved.
+        Returns the pattern.
+        """
+        if not self.sparse:
+            sparse = SparseNotes()
+            notes = self.__dict__.pop("_notes", None)
+            if notes is not None:
+                sparse.load(notes)
+            self._sparse = sparse
+        return self
+
+    def to_dense(self):
+        """Store every line and track in one buffer again. Returns the pattern."""
+        sparse = self.__dict__.pop("_sparse", None)
+        if sparse is not None:
+            self._notes = sparse.to_buffer(self.lines * self.tracks * NOTE_SIZE)
+        return self
+
     @property
     def data(self):
-        if not hasattr(self, "_data"):
-            self.clear()
-        return self._data
+        """Notes of the pattern, indexed by line and then by track.
+
+        Notes are :py:class:`rv.note.NoteView` objects reading and writing
+        the pattern's note buffer; assigning a :py:class:`rv.note.Note`
+        to a track copies it into the buffer.
+        """
+        return PatternData(self, self._note_store())
 
     @property
     def raw_data(self):
-        return b"".join(b"".join(note.raw_data for note in line) for line in self.data)
+        """Note data in PDTA layout, as bytes copied from the note buffer."""
+        return bytes(self._raw_view())
 
     @raw_data.setter
     def raw_data(self, raw_data):
-        data = self.data
-        for line_no in range(self.lines):
-            for track_no in range(self.tracks):
-                offset = (line_no * self.tracks * 8) + (track_no * 8)
-                note_raw_data = raw_data[offset : offset + 8]
-                data[line_no][track_no].raw_data = note_raw_data
+        size = self.lines * self.tracks * NOTE_SIZE
+        notes = bytearray(raw_data[:size])
+        if len(notes) < size:
+            notes.extend(bytes(size - len(notes)))
+        if self.sparse:
+            self._sparse.load(notes)
+        else:
+            self._notes = notes
+
+    def _raw_view(self):
+        """Return a read-only view of the note data in PDTA layout.
+
+        The view follows later edits to the pattern. Sparse patterns
+        return a view of a new buffer.
+        """
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            notes = notes.to_buffer(self.lines * self.tracks * NOTE_SIZE)
+        return memoryview(notes).toreadonly()
+
+    def note_cells(self, start=0, stop=None):
+        """Return (indexes, cells) for the notes stored in lines start to stop.
+
+        cells holds the notes in PDTA layout, and indexes the cell index
+        (``line * tracks + track``) of each note: a range of every cell
+        in the lines for dense patterns, or a list of the notes stored
+        for sparse patterns. Empty notes may be included.
+        """
+        start = max(start, 0)
+        stop = self.lines if stop is None else min(stop, self.lines)
+        stop = max(start, stop)
+        tracks = self.tracks
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            first, last = notes.span(start * tracks, stop * tracks)
+            cells = bytes(notes.cells[first * NOTE_SIZE : last * NOTE_SIZE])
+            return notes.indexes[first:last], cells
+        stride = tracks * NOTE_SIZE
+        cells = memoryview(notes)[start * stride : stop * stride].toreadonly()
+        return range(start * tracks, stop * tracks), cells
+
+    def _iter_cells(self, start=0, stop=None):
+        """Yield (index, cells, offset) for each note set in lines start to stop."""
+        indexes, cells = self.note_cells(start, stop)
+        if isinstance(indexes, range):
+            last = -1
+            for match in _NONZERO.finditer(cells):
+                position = match.start() // NOTE_SIZE
+                if position != last:
+                    last = position
+                    yield indexes.start + position, cells, position * NOTE_SIZE
+            return
+        for position, index in enumerate(indexes):
+            offset = position * NOTE_SIZE
+            if cells[offset : offset + NOTE_SIZE] != EMPTY_NOTE:
+                yield index, cells, offset
+
+    def iter_notes(self, start=0, stop=None):
+        """Yield (line, track, note) for each note set in lines start to stop.
+
+        Notes are yielded in line and track order, skipping notes
+        with all fields 0. Sparse patterns only visit the notes stored.
+        """
+        notes = self._note_store()
+        for index, _, _ in self._iter_cells(start, stop):
+            line, track = divmod(index, self.tracks)
+            yield line, track, _note_view(self, notes, index)
 
     def set_via_fn(self, fn):
         """Set pattern contents by calling fn for each note.
@@ -68,17 +515,33 @@ class Pattern:
         have been processed successfully; only then do the new notes become
         part of the pattern.
         """
-        new = deepcopy(self.data)
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            indexes, cells = [], bytearray()
+            cell = bytearray(NOTE_SIZE)
+            for index in range(self.lines * self.tracks):
+                line, track = divmod(index, self.tracks)
+                fn(self, line, track).pack_into(cell, 0)
+                if cell != EMPTY_NOTE:
+                    indexes.append(index)
+                    cells += cell
+            notes.replace(indexes, cells)
+            return self
+        # Every note is replaced, so the new notes start from an empty buffer.
+        new = bytearray(len(notes))
+        offset = 0
         for line in range(self.lines):
             for track in range(self.tracks):
-                new[line][track] = fn(self, line, track)
-        self._data = new
+                fn(self, line, track).pack_into(new, offset)
+                offset += NOTE_SIZE
+        notes[:] = new
         return self
 
     def set_via_gen(self, gen):
         """Set pattern contents by receiving notes from a generator.
 
-        gen is called with this pattern, and the new note data array.
+        gen is called with this pattern, and the new note data array,
+        a :py:class:`PatternEdit` which only records the notes changed.
         The generator then yields (line, track, Note-instance) tuples.
 
         It is possible, but *discouraged*, to directly change the new note array.
@@ -88,14 +551,142 @@ class Pattern:
         The generator must stop iteration at some point, or this method will
         never return.
         """
-        new = deepcopy(self.data)
+        new = PatternEdit(self)
         for line, track, note in gen(self, new):
             new[line][track] = note
-        self._data = new
+        new.commit()
+        return self
+
+    def transpose(self, semitones):
+        """Transpose all notes by semitones, clamped to the range C0-B9.
+
+        Empty notes and note commands are unchanged.
+        """
+        first, last = min(ALL_NOTES), max(ALL_NOTES)
+        table = _byte_table(
+            {n: min(max(n + semitones, first), last) for n in range(first, last + 1)}
+        )
+        _translate_column(self._note_cells(), NOTE_COLUMN, table)
+        return self
+
+    def scale_velocity(self, factor=1.0, minimum=1, maximum=129):
+        """Scale the velocity of notes that set one, and clamp the result.
+
+        Velocities are scaled as played (``Note.vel - 1``), rounded,
+        and clamped to minimum..maximum in ``Note.vel`` units.
+        Notes without a velocity (``vel == 0``) are unchanged.
+        """
+        table = _byte_table(
+            {
+                vel: min(max(round((vel - 1) * factor) + 1, minimum), maximum)
+                for vel in range(1, 130)
+            }
+        )
+        _translate_column(self._note_cells(), VEL_COLUMN, table)
+        return self
+
+    def remap_modules(self, mapping):
+        """Replace module numbers of notes, as stored in ``Note.module``.
+
+        mapping maps old to new module numbers (module index + 1);
+        numbers not in mapping are unchanged.
+        """
+        _translate_column(self._note_cells(), MODULE_COLUMN, _byte_table(mapping))
+        return self
+
+    def remap_effects(self, mapping):
+        """Replace effect codes (the low byte of ``Note.ctl``) given in mapping."""
+        _translate_column(self._note_cells(), EFFECT_COLUMN, _byte_table(mapping))
+        return self
+
+    def remap_controllers(self, mapping):
+        """Replace controller numbers given in mapping.
+
+        Controller numbers are the high byte of ``Note.ctl``.
+        """
+        _translate_column(self._note_cells(), CONTROLLER_COLUMN, _byte_table(mapping))
+        return self
+
+    def shift_lines(self, count, rotate=False):
+        """Move all lines down by count lines, or up if count is negative.
+
+        Lines moved past either end are lost and replaced by empty lines,
+        unless rotate is true, in which case they wrap around.
+        """
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            notes.shift(count * self.tracks, self.lines * self.tracks, rotate)
+            return self
+        size = len(notes)
+        shift = count * self.tracks * NOTE_SIZE
+        if rotate:
+            shift %= size
+            notes[:] = notes[size - shift :] + notes[: size - shift]
+        elif abs(shift) >= size:
+            notes[:] = bytes(size)
+        elif shift > 0:
+            notes[shift:] = notes[: size - shift]
+            notes[:shift] = bytes(shift)
+        elif shift < 0:
+            notes[:shift] = notes[-shift:]
+            notes[shift:] = bytes(-shift)
+        return self
+
+    def mask_tracks(self, tracks):
+        """Clear all notes outside of the given track numbers."""
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            keep = set(tracks)
+            notes.select(
+                [n for n, i in enumerate(notes.indexes) if i % self.tracks in keep]
+            )
+            return self
+        stride = self.tracks * NOTE_SIZE
+        empty = bytes(len(notes) // stride)
+        for track in set(range(self.tracks)).difference(tracks):
+            for offset in range(track * NOTE_SIZE, (track + 1) * NOTE_SIZE):
+                notes[offset::stride] = empty
+        return self
+
+    def quantize(self, step):
+        """Move notes to the nearest line that is a multiple of step.
+
+        Notes already on such a line stay; otherwise the note nearest
+        to the line wins (the earlier one on a tie), and others are dropped.
+        """
+        if step < 1:
+            raise ValueError("step must be at least 1")
+        notes = self._note_store()
+        if isinstance(notes, SparseNotes):
+            notes.quantize(step, self.tracks, self.lines)
+            return self
+        stride = self.tracks * NOTE_SIZE
+        empty_line = bytes(stride)
+        last = (self.lines - 1) // step * step
+        quantized = bytearray(len(notes))
+        moved = []
+        for line in range(self.lines):
+            start = line * stride
+            source = notes[start : start + stride]
+            if source == empty_line:
+                continue
+            target = min((line + step // 2) // step * step, last)
+            if target == line:
+                quantized[start : start + stride] = source
+            else:
+                moved.append((abs(target - line), line, target, source))
+        for _, line, target, source in sorted(moved):
+            start = target * stride
+            for offset in range(0, stride, NOTE_SIZE):
+                cell = source[offset : offset + NOTE_SIZE]
+                at = start + offset
+                if cell != EMPTY_NOTE and quantized[at : at + NOTE_SIZE] == EMPTY_NOTE:
+                    quantized[at : at + NOTE_SIZE] = cell
+        notes[:] = quantized
         return self
 
     def iff_chunks(self):
-        yield (b"PDTA", self.raw_data)
+        yield (b"PDTA", self._raw_view())
         if self.name is not None:
             yield (b"PNME", self.name.encode(ENCODING) + b"\0")
         yield (b"PCHN", pack("<I", self.tracks))
@@ -110,12 +701,10 @@ class Pattern:
         yield (b"PYYY", pack("<i", self.y))
 
     def clear(self):
-        self._data = []
-        for line_no in range(self.lines):
-            line = []
-            self._data.append(line)
-            for track_no in range(self.tracks):
-                line.append(Note(pattern=self))
+        if self.sparse:
+            self._sparse.replace([], b"")
+        else:
+            self._notes = bytearray(self.lines * self.tracks * NOTE_SIZE)
 
     def tabular_repr(self, note_format="NN VV MM CC EE XXYY"):
         lines = []
@@ -147,6 +736,14 @@ class PatternClone:
     flags = attr(default=PatternFlags.clone)
     x = attr(default=0)
     y = attr(default=0)
+    project = attr(default=None)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in PLACEMENT_FIELDS:
+            project = self.__dict__.get("project")
+            if project is not None:
+                project.invalidate_timeline()
 
     def iff_chunks(self):
         yield (b"PPAR", pack("<I", self.source))
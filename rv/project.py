@@ -1,19 +1,170 @@
+import heapq
+from bisect import bisect_left, insort
 from collections import defaultdict, namedtuple
+from functools import wraps
+from hashlib import blake2b
 from struct import pack
 
 from rv import ENCODING
+from rv.connections import ConnectionGraph
 from rv.container import Container
 from rv.errors import ModuleOwnershipError, PatternOwnershipError
+from rv.lazy import LazyBlock, LazySequence, raw_items, slnk_links
 from rv.modules.module import Module
 from rv.modules.output import Output
-from rv.pattern import Pattern, PatternClone
+from rv.pattern import Pattern, PatternClone, PatternFlags
+from rv.tempo import TempoMap
+from rv.timeline import Timeline
 
 import networkx as nx
 
-
 PatternLine = namedtuple("PatternLine", ["index", "source", "line"])
 
 
+def _pattern_key(pattern):
+    return (
+        pattern.tracks,
+        pattern.lines,
+        pattern.name,
+        pattern.y_size,
+        pattern.appearance_flags,
+        bytes(pattern.icon),
+        tuple(pattern.fg_color),
+        tuple(pattern.bg_color),
+        blake2b(pattern._raw_view(), digest_size=16).digest(),
+    )
+
+
+def _block_string(block, name):
+    data = block.first(name)
+    if data is None:
+        return None
+    data = bytes(data)
+    data = data[: data.find(0)] if 0 in data else data
+    return data.decode(ENCODING)
+
+
+def _module_keys(item):
+    """Return the (name, mtype) of a module, or of a lazy module block."""
+    if isinstance(item, LazyBlock):
+        return _block_string(item, b"SNAM"), _block_string(item, b"STYP")
+    return item.name, item.mtype
+
+
+def _remove_sorted(items, value):
+    position = bisect_left(items, value)
+    if position < len(items) and items[position] == value:
+        del items[position]
+
+
+class _ModuleRegistry:
+    """Indexes of the module slots of a project, by name and by type.
+
+    slots holds the item registered in each slot, and keys its
+    (name, mtype). free is a heap of empty slot indexes, whose entries
+    may be stale and are checked when used.
+    """
+
+    def __init__(self, modules):
+        self.slots = []
+        self.keys = []
+        self.free = []
+        self.names = {}
+        self.types = {}
+        for index, item in enumerate(raw_items(modules)):
+            self.set(index, item)
+
+    def set(self, index, item):
+        """Register item, a module, a lazy module block, or None, in slot index.
+
+        index may be the number of slots, to register a new last slot.
+        """
+        if index == len(self.slots):
+            self.slots.append(None)
+            self.keys.append(None)
+        keys = self.keys[index]
+        if keys is not None:
+            name, mtype = keys
+            _remove_sorted(self.names.get(name, []), index)
+            _remove_sorted(self.types.get(mtype, []), index)
+        self.slots[index] = item
+        if item is None:
+            self.keys[index] = None
+            heapq.heappush(self.free, index)
+        else:
+            name, mtype = self.keys[index] = _module_keys(item)
+            insort(self.names.setdefault(name, []), index)
+            insort(self.types.setdefault(mtype, []), index)
+
+    def rename(self, index, new_name):
+        old_name, mtype = self.keys[index]
+        _remove_sorted(self.names.get(old_name, []), index)
+        insort(self.names.setdefault(new_name, []), index)
+        self.keys[index] = (new_name, mtype)
+
+    def first_free(self, pop=False):
+        """Return the lowest empty slot index, or None if there is none."""
+        free = self.free
+        while free:
+            index = free[0]
+            if self.slots[index] is None:
+                return heapq.heappop(free) if pop else index
+            heapq.heappop(free)
+        return None
+
+
+class _ModuleSlots(list):
+    """Module slots of a project, keeping its module registry up to date.
+
+    Items set by index are registered as they are set; any other change
+    drops the registry, which is rebuilt when next used. The project
+    changes slots with the plain list methods, and registers them itself.
+    """
+
+    registry = None
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+        registry = self.registry
+        if registry is None:
+            return
+        if isinstance(index, int):
+            registry.set(index if index >= 0 else index + len(self), item)
+        else:
+            self.registry = None
+
+
+def _drops_registry(name):
+    method = getattr(list, name)
+
+    @wraps(method)
+    def wrapper(self, *args, **kw):
+        self.registry = None
+        return method(self, *args, **kw)
+
+    return wrapper
+
+
+for _name in [
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+]:
+    setattr(_ModuleSlots, _name, _drops_registry(_name))
+
+
+class _LazyModuleSlots(_ModuleSlots, LazySequence):
+    """Module slots of a project read lazily; see `LazySequence`."""
+
+
 class Project(Container):
     """SunVox project comprised of metadata, modules, and patterns
 
@@ -26,6 +177,7 @@ class Project(Container):
     def __init__(self):
         self.modules = []
         self.module_connections = defaultdict(list)
+        self._connections = None
         self.output = Output()
         self.attach_module(self.output)
         self.sunvox_version = (1, 9, 4, 0)
@@ -51,6 +203,7 @@ class Project(Container):
         self.current_track = 0
         self.current_line = 1
         self.patterns = []
+        self._timeline = None
 
     def __iadd__(self, other):
         if isinstance(other, list):
@@ -62,39 +215,194 @@ class Project(Container):
             self.attach_pattern(other)
         return self
 
+    @property
+    def modules(self):
+        """Module slots of the project, with None in empty slots.
+
+        Lists assigned are copied into a list subclass that keeps the
+        project's index of modules up to date when it is changed.
+        """
+        return self.__dict__["_modules"]
+
+    @modules.setter
+    def modules(self, modules):
+        if isinstance(modules, _ModuleSlots):
+            pass
+        elif isinstance(modules, LazySequence):
+            modules = _LazyModuleSlots(modules.load, raw_items(modules))
+        else:
+            modules = _ModuleSlots(modules)
+        self._modules = modules
+
     def attach_module(self, module):
-        """Attach the module to the project."""
+        """Attach the module to the project.
+
+        The module fills the first empty module slot, or is appended.
+        None may be attached to add an empty module slot.
+        """
+        registry = self._module_registry()
         if module is None:
-            self.modules.append(module)
+            registry.set(len(self.modules), None)
+            list.append(self.modules, module)
         elif module.parent is not None:
             raise ModuleOwnershipError("Module is already attached.")
-        elif module not in self.modules:
-            if None in self.modules:
-                module.index = self.module_index(None)
-                self.modules[module.index] = module
+        elif not self._has_module(module):
+            index = registry.first_free(pop=True)
+            if index is None:
+                index = len(self.modules)
+                list.append(self.modules, module)
             else:
-                self.modules.append(module)
-                module.index = self.module_index(module)
-            if isinstance(module, Output) and module.index == 0:
-                self.output = module
-            self.module_connections[module.index] = module.incoming_links
-            module.parent = self
+                list.__setitem__(self.modules, index, module)
+            self._register_module(registry, index, module)
         return module
 
+    def attach_modules(self, modules):
+        """Attach many modules to the project, returning them as a list.
+
+        Indexes are assigned in one pass, to the same slots as attaching
+        each module in turn with `attach_module`. No module is attached
+        if any of them is already attached.
+        """
+        modules = list(modules)
+        seen = set()
+        for module in modules:
+            if module is None:
+                continue
+            if module.parent is not None or id(module) in seen:
+                raise ModuleOwnershipError("Module is already attached.")
+            seen.add(id(module))
+        registry = self._module_registry()
+        size = len(self.modules)
+        tail = []
+        for module in modules:
+            if module is None:
+                registry.set(size + len(tail), None)
+                tail.append(None)
+                continue
+            if self._has_module(module):
+                continue
+            index = registry.first_free(pop=True)
+            if index is None:
+                index = size + len(tail)
+                tail.append(module)
+            elif index < size:
+                list.__setitem__(self.modules, index, module)
+            else:
+                tail[index - size] = module
+            self._register_module(registry, index, module)
+        list.extend(self.modules, tail)
+        return modules
+
+    def _register_module(self, registry, index, module):
+        module.index = index
+        registry.set(index, module)
+        if isinstance(module, Output) and index == 0:
+            self.output = module
+        graph = self.__dict__.get("_connections")
+        if graph is not None and graph.incoming is self.module_connections:
+            graph.set_incoming(index, module.incoming_links)
+        else:
+            self.module_connections[index] = module.incoming_links
+        module.parent = self
+
+    def _module_registry(self):
+        modules = self.modules
+        registry = modules.registry
+        if registry is None:
+            registry = modules.registry = _ModuleRegistry(modules)
+        return registry
+
+    def _module_renamed(self, module):
+        registry = self.modules.registry
+        index = module.index
+        if (
+            registry is not None
+            and index is not None
+            and 0 <= index < len(registry.slots)
+            and registry.slots[index] is module
+        ):
+            registry.rename(index, module.name)
+
+    def _module_loaded(self, index, block, module):
+        """Register module, decoded from the lazy block in slot index."""
+        registry = self.modules.registry
+        if (
+            registry is not None
+            and index < len(registry.slots)
+            and registry.slots[index] is block
+        ):
+            registry.set(index, module)
+
+    def _has_module(self, module):
+        index = module.index
+        modules = self.modules
+        return (
+            index is not None
+            and 0 <= index < len(modules)
+            and list.__getitem__(modules, index) is module
+        )
+
     def attach_pattern(self, pattern):
-        """Attach the pattern to the project."""
-        if pattern.project is not None:
-            raise PatternOwnershipError("Pattern already attached to a project")
+        """Attach the pattern to the project.
+
+        None may be attached to represent an empty pattern slot.
+        """
+        if pattern is not None:
+            if pattern.project is not None:
+                raise PatternOwnershipError("Pattern already attached to a project")
+            pattern.project = self
         self.patterns.append(pattern)
-        pattern.project = self
+        self.invalidate_timeline()
         return len(self.patterns) - 1
 
+    def dedupe_patterns(self):
+        """Replace patterns identical to an earlier pattern with clones of it.
+
+        Patterns are identical if they have the same notes, dimensions,
+        and appearance (name, icon, and colors), so the project
+        looks and plays the same afterwards. Duplicates are replaced in
+        place by a `PatternClone` keeping their x, y, and flags, and clones
+        of a replaced pattern are pointed at its source.
+
+        Returns the number of patterns replaced.
+        """
+        sources = {}
+        replaced = 0
+        for index, pattern in enumerate(self.patterns):
+            if not isinstance(pattern, Pattern):
+                continue
+            key = _pattern_key(pattern)
+            source = sources.setdefault(key, index)
+            if source == index:
+                continue
+            if self.patterns[source]._raw_view() != pattern._raw_view():
+                continue  # Hash collision.
+            pattern.project = None
+            clone = PatternClone(
+                source=source,
+                flags=pattern.flags | PatternFlags.clone,
+                x=pattern.x,
+                y=pattern.y,
+                project=self,
+            )
+            self.patterns[index] = clone
+            replaced += 1
+        if replaced:
+            for pattern in self.patterns:
+                if isinstance(pattern, PatternClone):
+                    source = self.patterns[pattern.source]
+                    if isinstance(source, PatternClone):
+                        pattern.source = source.source
+            self.invalidate_timeline()
+        return replaced
+
     def connect(self, from_modules, to_modules):
         """Establish a connection from module(s) to another module(s)."""
         if isinstance(from_modules, Module):
             from_modules = [from_modules]
         if isinstance(to_modules, Module):
             to_modules = [to_modules]
+        graph = self.connection_graph
         for from_module in from_modules:
             for to_module in to_modules:
                 try:
@@ -104,12 +412,8 @@ class Project(Container):
                     raise ModuleOwnershipError(
                         "Modules must have same parent to be connected"
                     )
-                connections_to = self.module_connections[to_idx]
-                connections_from = self.module_connections[from_idx]
-                connected = from_idx in connections_to or to_idx in connections_from
-                if not connected:
-                    connections_to.append(from_idx)
-                    to_module.incoming_links = connections_to
+                if graph.connect(from_idx, to_idx):
+                    to_module.incoming_links = self.module_connections[to_idx]
 
     def chunks(self):
         """Generate chunks necessary to encode project as a .sunvox file"""
@@ -136,22 +440,22 @@ class Project(Container):
         yield (b"PATN", pack("<I", self.current_pattern))
         yield (b"PATT", pack("<I", self.current_track))
         yield (b"PATL", pack("<I", self.current_line))
-        for pattern in self.patterns:
-            if pattern is not None:
+        for pattern in raw_items(self.patterns):
+            if isinstance(pattern, LazyBlock):
+                for chunk in pattern.chunks:
+                    yield chunk
+            elif pattern is not None:
                 for chunk in pattern.iff_chunks():
                     yield chunk
             yield (b"PEND", b"")
-        for i, module in enumerate(self.modules):
-            if module is not None:
+        for i, module in enumerate(raw_items(self.modules)):
+            if isinstance(module, LazyBlock):
+                for chunk in self._lazy_module_chunks(i, module):
+                    yield chunk
+            elif module is not None:
                 for chunk in module.iff_chunks():
                     yield chunk
-                connections = self.module_connections[i]
-                if len(connections) > 0:
-                    structure = "<" + "i" * len(connections)
-                    links = pack(structure, *connections)
-                else:
-                    links = b""
-                yield (b"SLNK", links)
+                yield (b"SLNK", self._slnk_data(i))
                 controllers = [
                     n for n, c in module.controllers.items() if c.attached(module)
                 ]
@@ -172,24 +476,27 @@ class Project(Container):
                         yield chunk
             yield (b"SEND", b"")
 
+    def _slnk_data(self, index):
+        connections = self.module_connections[index]
+        return pack("<" + "i" * len(connections), *connections)
+
+    def _lazy_module_chunks(self, index, block):
+        # Keep the original SLNK bytes unless connections have changed since.
+        for name, data in block.chunks:
+            if name == b"SLNK" and slnk_links(data) != self.module_connections[index]:
+                data = self._slnk_data(index)
+            yield (name, data)
+
     def detach_module(self, module):
         """Detach a module from this project, disconnecting it from other modules."""
-        if module.parent is not self or module not in self.modules:
+        if module.parent is not self or not self._has_module(module):
             raise ModuleOwnershipError(
                 "Cannot detach module not attached to this project"
             )
-        disconnections = []
-        for to_idx, from_idx_list in self.module_connections.items():
-            if module.index == to_idx:
-                for from_idx in from_idx_list:
-                    disconnections.append(
-                        (self.modules[from_idx], self.modules[to_idx])
-                    )
-            if module.index in from_idx_list:
-                disconnections.append((module, self.modules[to_idx]))
-        for from_idx, to_idx in disconnections:
-            self.disconnect(from_idx, to_idx)
-        self.modules[module.index] = None
+        self.connection_graph.isolate(module.index)
+        registry = self._module_registry()
+        list.__setitem__(self.modules, module.index, None)
+        registry.set(module.index, None)
         module.parent = None
         module.index = None
         return module
@@ -200,47 +507,89 @@ class Project(Container):
             from_modules = [from_modules]
         if isinstance(to_modules, Module):
             to_modules = [to_modules]
+        graph = self.connection_graph
         for from_module in from_modules:
             for to_module in to_modules:
                 from_idx = self.module_index(from_module)
                 to_idx = self.module_index(to_module)
-                connections_to = self.module_connections[to_idx]
-                connections_from = self.module_connections[from_idx]
-                if from_idx in connections_to:
-                    connections_to.remove(from_idx)
-                    to_module.incoming_links = connections_to
-                if to_idx in connections_from:
-                    connections_from.remove(to_idx)
-                    from_module.incoming_links = connections_from
+                if graph.disconnect(from_idx, to_idx):
+                    to_module.incoming_links = self.module_connections[to_idx]
+                    from_module.incoming_links = self.module_connections[from_idx]
+
+    @property
+    def timeline(self):
+        """A :py:class:`rv.timeline.Timeline` of where patterns are placed.
+
+        It is built when first needed, and rebuilt after patterns are
+        attached or their position, length, or source changes. Call
+        `invalidate_timeline` after replacing items of ``patterns`` directly.
+        """
+        cached = self.__dict__.get("_timeline")
+        if cached is None or cached[0] != len(self.patterns):
+            cached = self._timeline = (len(self.patterns), Timeline.from_project(self))
+        return cached[1]
+
+    @property
+    def connection_graph(self):
+        """A :py:class:`rv.connections.ConnectionGraph` of ``module_connections``.
+
+        It is built when first needed, and kept up to date by `connect`,
+        `disconnect`, and attaching and detaching modules. Call
+        `invalidate_connections` after editing ``module_connections`` directly.
+        """
+        graph = self.__dict__.get("_connections")
+        if graph is None or graph.incoming is not self.module_connections:
+            graph = self._connections = ConnectionGraph(self.module_connections)
+        return graph
+
+    def invalidate_connections(self):
+        self._connections = None
+
+    def invalidate_timeline(self):
+        self._timeline = None
 
     def pattern_lines(self, start=0, stop=None):
-        """Yields information about the active pattern lines for each project line."""
-        if len(self.patterns) == 0:
-            return
-        active_patterns = []
-        activate_at = {}
-        deactivate_at = {}
-        for index, pattern in enumerate(
-            sorted(self.patterns, key=lambda p: (p.y, p.x))
-        ):
-            if start <= pattern.x and (stop is None or pattern.x < stop):
-                activate_at.setdefault(pattern.x, []).append((index, pattern))
-                deactivate_at.setdefault(
-                    pattern.x + pattern.source_pattern(self).lines, []
-                ).append((index, pattern))
-        for line in range(
-            start, stop if stop is not None else max(deactivate_at.keys())
-        ):
-            for index, pattern in deactivate_at.get(line, []):
-                active_patterns.remove((index, pattern))
-            for index, pattern in activate_at.get(line, []):
-                active_patterns.append((index, pattern))
-            pattern_lines = []
-            for index, pattern in active_patterns:
-                pattern_lines.append(
-                    PatternLine(index, pattern.source or index, line - pattern.x)
-                )
-            yield (line, pattern_lines)
+        """Yields information about the active pattern lines for each project line.
+
+        Each item is a (line, pattern_lines) tuple, where pattern_lines lists
+        a `PatternLine` for each pattern playing at that project line.
+        Lines run from start to stop, or to the end of the last pattern.
+        """
+        timeline = self.timeline
+        if stop is None:
+            stop = timeline.end
+        for line in range(start, stop):
+            yield (
+                line,
+                [
+                    PatternLine(p.index, p.source, line - p.start)
+                    for p in timeline.at(line)
+                ],
+            )
+
+    def iter_events(self, start=0, stop=None):
+        """Yield a :py:class:`rv.timeline.NoteEvent` for each note played.
+
+        Events of all patterns and clones playing in lines start to stop
+        (by default, to the end of the last pattern) are yielded in line order.
+        """
+        return self.timeline.iter_events(self, start, stop)
+
+    def iter_event_blocks(self, start=0, stop=None, block_lines=1024):
+        """Yield the events of `iter_events` as blocks of NumPy arrays.
+
+        See :py:meth:`rv.timeline.Timeline.iter_event_blocks`.
+        """
+        return self.timeline.iter_event_blocks(self, start, stop, block_lines)
+
+    def tempo_map(self):
+        """Return a :py:class:`rv.tempo.TempoMap` of this project.
+
+        It converts between lines, ticks, seconds, and audio frames,
+        following speed effects in patterns, and gives the song length
+        without rendering the project.
+        """
+        return TempoMap.from_project(self)
 
     def layout(self, scale=512, **spring_layout_args):
         """Auto-layout modules."""
@@ -257,9 +606,52 @@ class Project(Container):
         return True
 
     def module_index(self, module):
-        """Return the index of the given module."""
+        """Return the index of the given module.
+
+        The index of None is the first empty module slot.
+        Raises ValueError if the module is not attached to this project.
+        """
+        if module is None:
+            index = self._module_registry().first_free()
+            if index is None:
+                raise ValueError("No empty module slot")
+            return index
+        if self._has_module(module):
+            return module.index
         return self.modules.index(module)
 
+    def find_modules(self, name=None, mtype=None):
+        """Return the attached modules with the given name and type, in index order.
+
+        mtype may be a type name such as ``"Amplifier"`` or a module class.
+        Either may be omitted; with neither, all attached modules are returned.
+        """
+        if isinstance(mtype, type):
+            mtype = mtype.mtype
+        registry = self._module_registry()
+        if name is None and mtype is None:
+            indexes = [
+                i for i, x in enumerate(raw_items(self.modules)) if x is not None
+            ]
+        elif mtype is None:
+            indexes = registry.names.get(name, [])
+        elif name is None:
+            indexes = registry.types.get(mtype, [])
+        else:
+            names = registry.names.get(name, [])
+            types = registry.types.get(mtype, [])
+            indexes = names if len(names) <= len(types) else types
+        found = []
+        for index in indexes:
+            module = self.modules[index]
+            if (
+                module is not None
+                and (name is None or module.name == name)
+                and (mtype is None or module.mtype == mtype)
+            ):
+                found.append(module)
+        return found
+
     def new_module(self, cls, *args, **kw):
         """Construct and return a new module attached to this project."""
         mod = cls(*args, **kw)
@@ -0,0 +1,75 @@
+import tarfile
+import zipfile
+
+from rv.lib.compression import COMPRESSED_SUFFIXES, StreamReader
+from rv.lib.iff import _seekable
+from rv.readers.batch import ReadResult, _read_sunvox
+
+#: Filename suffixes of SunVox files.
+SUNVOX_SUFFIXES = (".sunvox", ".sunsynth")
+
+
+def is_sunvox_filename(name):
+    """Return True if name ends with a SunVox suffix, optionally compressed."""
+    name = name.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return name.endswith(SUNVOX_SUFFIXES)
+
+
+def iter_sunvox_archive(file_or_name, **options):
+    """Read each SunVox file in a zip or tar archive, yielding a `ReadResult`.
+
+    file_or_name is a filename or an open binary file. Tar archives may be
+    compressed, and are read as a stream if the file is not seekable.
+    Members are selected by `is_sunvox_filename`, and read one at a time
+    straight from the archive, without extracting them.
+    ReadResult.path is the member name.
+
+    Keyword arguments are passed to :py:func:`rv.api.read_sunvox_file`.
+    Errors are reported per member, and do not stop the remaining members
+    from being read.
+    """
+    if _is_zipfile(file_or_name):
+        with zipfile.ZipFile(file_or_name) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not is_sunvox_filename(info.filename):
+                    continue
+                with archive.open(info) as member:
+                    yield _read_member(info.filename, member, options)
+    else:
+        if isinstance(file_or_name, str):
+            archive = tarfile.open(file_or_name, "r:*")
+        elif _seekable(file_or_name):
+            archive = tarfile.open(fileobj=file_or_name, mode="r:*")
+        else:
+            archive = tarfile.open(fileobj=StreamReader(file_or_name), mode="r|*")
+        with archive:
+            for info in archive:
+                if not info.isfile() or not is_sunvox_filename(info.name):
+                    continue
+                with archive.extractfile(info) as member:
+                    yield _read_member(info.name, member, options)
+
+
+def _is_zipfile(file_or_name):
+    if isinstance(file_or_name, str):
+        return zipfile.is_zipfile(file_or_name)
+    if not _seekable(file_or_name):
+        return False
+    position = file_or_name.tell()
+    try:
+        return zipfile.is_zipfile(file_or_name)
+    finally:
+        file_or_name.seek(position)
+
+
+def _read_member(name, member, options):
+    try:
+        # Members must not be seeked in or reopened by name.
+        value = _read_sunvox(StreamReader(member), options)
+    except Exception as e:
+        return ReadResult(name, None, e)
+    return ReadResult(name, value, None)
@@ -0,0 +1,103 @@
+import os
+import pickle
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from rv.readers.reader import read_sunvox_file
+
+_END = object()
+
+ReadResult = namedtuple("ReadResult", ["path", "value", "error"])
+ReadResult.__doc__ = """Outcome of reading one file with `read_sunvox_files`.
+
+value is the project or synth read, or what fn returned for it;
+error is the exception raised while reading, or None.
+"""
+
+
+def read_sunvox_files(
+    paths, workers=None, ordered=True, max_pending=None, fn=None, **options
+):
+    """Read many SunVox files in worker processes, yielding a `ReadResult` each.
+
+    workers is the number of processes, by default the number of CPUs.
+    Results are yielded in the order of paths if ordered is true,
+    otherwise as soon as each file is read.
+    At most max_pending files (by default twice the number of workers)
+    are being read or waiting to be yielded at once,
+    so paths may be a long or endless iterable.
+
+    fn, if given, is called in the worker with each object read,
+    and its result is returned in place of the object;
+    this keeps transfers small when only a summary is needed.
+    fn must be picklable, such as a module-level function.
+
+    Other keyword arguments are passed to :py:func:`read_sunvox_file`;
+    ``lazy=True`` is not supported, since lazy projects refer back to
+    the file reader in the worker.
+    Errors are reported per file in `ReadResult.error`, and do not stop
+    the remaining files from being read.
+    """
+    if options.get("lazy"):
+        raise ValueError("lazy projects cannot be read in worker processes")
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    paths = iter(paths)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit():
+            path = next(paths, _END)
+            if path is not _END:
+                pending.append((path, executor.submit(_read, path, fn, options)))
+            return path is not _END
+
+        try:
+            while len(pending) < max_pending and submit():
+                pass
+            while pending:
+                if ordered:
+                    path, future = pending.popleft()
+                else:
+                    futures = [f for _, f in pending]
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    index = next(i for i, f in enumerate(futures) if f in done)
+                    path, future = pending[index]
+                    del pending[index]
+                result = _result(path, future)
+                submit()
+                yield result
+        finally:
+            # Don't read the remaining files if iteration stopped early.
+            for _, future in pending:
+                future.cancel()
+
+
+def _read_sunvox(source, options):
+    """Read source like `read_sunvox_file`, raising ValueError if it isn't SunVox."""
+    value = read_sunvox_file(source, **options)
+    if value is None:
+        raise ValueError("Not a SunVox project or synth")
+    return value
+
+
+def _read(path, fn, options):
+    """Read path in a worker, returning a pickled (value, error) pair."""
+    try:
+        value = _read_sunvox(path, options)
+        if fn is not None:
+            value = fn(value)
+        return pickle.dumps((value, None), pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        try:
+            return pickle.dumps((None, e), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return pickle.dumps((None, RuntimeError(repr(e))), pickle.HIGHEST_PROTOCOL)
+
+
+def _result(path, future):
+    try:
+        value, error = pickle.loads(future.result())
+    except Exception as e:
+        value, error = None, e
+    return ReadResult(path, value, error)
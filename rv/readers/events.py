@@ -0,0 +1,210 @@
+"""Low-level events generated while scanning a SunVox file.
+
+:py:func:`iter_sunvox_events` yields an event per chunk, or per CHNM/CHDT
+group of module chunks, without creating projects, modules, patterns, or notes.
+Only the current chunks are held in memory, so files of any size can be
+processed in constant memory when large payloads are left unread.
+"""
+
+from collections import namedtuple
+from struct import unpack
+
+from rv import ENCODING
+from rv.lazy import slnk_links
+from rv.lib.compression import decompressed
+from rv.lib.iff import as_file, chunks
+from rv.readers.reader import LAZY_PAYLOAD_SIZE, ReadOptions
+
+#: A field of the project (or synth) header.
+#: name is the matching ``Project`` or ``Synth`` attribute, or None if unknown,
+#: in which case value is the raw chunk data.
+ProjectField = namedtuple("ProjectField", ["tag", "name", "value"])
+
+#: Start of pattern index. source is the source pattern index of clones,
+#: otherwise None.
+PatternStart = namedtuple("PatternStart", ["index", "source"])
+
+#: Note data of pattern index, as a memoryview in PDTA layout.
+PatternData = namedtuple("PatternData", ["index", "data"])
+
+#: A field of pattern index, named like the ``Pattern`` attribute.
+PatternField = namedtuple("PatternField", ["index", "tag", "name", "value"])
+
+#: End of pattern index.
+PatternEnd = namedtuple("PatternEnd", ["index"])
+
+#: Start of module index. flags are the SFFF flags.
+ModuleStart = namedtuple("ModuleStart", ["index", "flags"])
+
+#: A field of module index, named like the ``Module`` attribute.
+ModuleField = namedtuple("ModuleField", ["index", "tag", "name", "value"])
+
+#: Raw value of the controller at position number of module index.
+ControllerValue = namedtuple("ControllerValue", ["index", "number", "raw_value"])
+
+#: A CHNM/CHDT/CHFF/CHFR group of module index. chff and chfr are None
+#: when absent. data may be a `rv.lib.iff.LazyPayload` if payloads are lazy.
+ChunkData = namedtuple("ChunkData", ["index", "chnm", "data", "chff", "chfr"])
+
+#: End of module index.
+ModuleEnd = namedtuple("ModuleEnd", ["index"])
+
+
+def _int(fmt):
+    return lambda data: unpack(fmt, data)[0]
+
+
+def _string(data):
+    data = bytes(data)
+    data = data[: data.find(0)] if 0 in data else data
+    return data.decode(ENCODING)
+
+
+def _version(data):
+    return tuple(reversed(unpack("BBBB", data)))
+
+
+def _color(data):
+    return unpack("BBB", data)
+
+
+PROJECT_FIELDS = {
+    b"VERS": ("sunvox_version", _version),
+    b"BVER": ("based_on_version", _version),
+    b"BPM ": ("initial_bpm", _int("<I")),
+    b"SPED": ("initial_tpl", _int("<I")),
+    b"TGRD": ("time_grid", _int("<I")),
+    b"TGD2": ("time_grid2", _int("<I")),
+    b"GVOL": ("global_volume", _int("<I")),
+    b"NAME": ("name", _string),
+    b"MSCL": ("modules_scale", _int("<I")),
+    b"MZOO": ("modules_zoom", _int("<I")),
+    b"MXOF": ("modules_x_offset", _int("<i")),
+    b"MYOF": ("modules_y_offset", _int("<i")),
+    b"LMSK": ("modules_layer_mask", _int("<I")),
+    b"CURL": ("modules_current_layer", _int("<I")),
+    b"TIME": ("timeline_position", _int("<i")),
+    b"REPS": ("restart_position", _int("<i")),
+    b"SELS": ("selected_module", _int("<I")),
+    b"LGEN": ("selected_generator", _int("<I")),
+    b"PATN": ("current_pattern", _int("<I")),
+    b"PATT": ("current_track", _int("<I")),
+    b"PATL": ("current_line", _int("<I")),
+}
+
+SYNTH_FIELDS = {b"VERS": ("sunsynth_version", _int("<I"))}
+
+PATTERN_FIELDS = {
+    b"PNME": ("name", _string),
+    b"PCHN": ("tracks", _int("<I")),
+    b"PLIN": ("lines", _int("<I")),
+    b"PYSZ": ("y_size", _int("<I")),
+    b"PFLG": ("appearance_flags", _int("<I")),
+    b"PICO": ("icon", bytes),
+    b"PFGC": ("fg_color", _color),
+    b"PBGC": ("bg_color", _color),
+    b"PFFF": ("flags", _int("<I")),
+    b"PXXX": ("x", _int("<i")),
+    b"PYYY": ("y", _int("<i")),
+}
+
+MODULE_FIELDS = {
+    b"SNAM": ("name", _string),
+    b"STYP": ("mtype", _string),
+    b"SFIN": ("finetune", _int("<i")),
+    b"SREL": ("relative_note", _int("<i")),
+    b"SXXX": ("x", _int("<i")),
+    b"SYYY": ("y", _int("<i")),
+    b"SZZZ": ("layer", _int("<I")),
+    b"SSCL": ("scale", _int("<I")),
+    b"SVPR": ("visualization", _int("<I")),
+    b"SCOL": ("color", _color),
+    b"SMIN": ("midi_out_name", _string),
+    b"SMIC": ("midi_out_channel", _int("<i")),
+    b"SMIB": ("midi_out_bank", _int("<i")),
+    b"SMIP": ("midi_out_program", _int("<i")),
+    b"SLNK": ("incoming_links", slnk_links),
+    b"CHNK": ("chnk", _int("<I")),
+}
+
+
+def iter_sunvox_events(source, lazy_payloads=False):
+    """Yield events for the chunks of a SunVox project or synth.
+
+    source may be a filename, an open binary file (which need not be
+    seekable), or a buffer, and may be gzip, xz, or bzip2 compressed.
+    lazy_payloads works as in :py:func:`rv.api.read_sunvox_file`:
+    large CHDT payloads of seekable files are yielded as
+    `rv.lib.iff.LazyPayload` handles instead of being read.
+
+    Chunks with no matching event are yielded as a field event
+    with name None and the raw chunk data as value.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from iter_sunvox_events(f, lazy_payloads)
+        return
+    if lazy_payloads is True:
+        lazy_payloads = LAZY_PAYLOAD_SIZE
+    lazy = ReadOptions(lazy_payloads=int(lazy_payloads)).lazy_payload
+    source = as_file(decompressed(source))
+    stream = chunks(source, lazy if lazy_payloads else None)
+    fields = PROJECT_FIELDS
+    pattern_index = module_index = 0
+    pattern = module = None
+    chunk = None
+    cval = 0
+    for tag, data in stream:
+        if module is not None:
+            if tag == b"CHNM":
+                if chunk is not None:
+                    yield ChunkData(*chunk)
+                chunk = [module, _int("<I")(data), None, None, None]
+            elif tag == b"CHDT" and chunk is not None:
+                chunk[2] = data
+            elif tag == b"CHFF" and chunk is not None:
+                chunk[3] = _int("<I")(data)
+            elif tag == b"CHFR" and chunk is not None:
+                chunk[4] = _int("<I")(data)
+            elif tag == b"CVAL":
+                yield ControllerValue(module, cval, _int("<i")(data))
+                cval += 1
+            elif tag == b"SEND":
+                if chunk is not None:
+                    yield ChunkData(*chunk)
+                yield ModuleEnd(module)
+                module = chunk = None
+                module_index += 1
+            else:
+                name, decode = MODULE_FIELDS.get(tag, (None, None))
+                value = decode(data) if decode else data
+                yield ModuleField(module, tag, name, value)
+        elif pattern is not None:
+            if tag == b"PEND":
+                yield PatternEnd(pattern)
+                pattern = None
+                pattern_index += 1
+            else:
+                name, decode = PATTERN_FIELDS.get(tag, (None, None))
+                value = decode(data) if decode else data
+                yield PatternField(pattern, tag, name, value)
+        elif tag == b"SFFF":
+            module, cval = module_index, 0
+            yield ModuleStart(module, _int("<I")(data))
+        elif tag == b"SEND":
+            module_index += 1  # Empty module slot.
+        elif tag == b"PDTA":
+            pattern = pattern_index
+            yield PatternStart(pattern, None)
+            yield PatternData(pattern, data)
+        elif tag == b"PPAR":
+            pattern = pattern_index
+            yield PatternStart(pattern, _int("<I")(data))
+        elif tag == b"PEND":
+            pattern_index += 1  # Empty pattern slot.
+        elif tag == b"SSYN":
+            fields, module_index = SYNTH_FIELDS, 1
+        elif tag != b"SVOX":
+            name, decode = fields.get(tag, (None, None))
+            value = decode(data) if decode else data
+            yield ProjectField(tag, name, value)
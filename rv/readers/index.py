@@ -0,0 +1,160 @@
+"""Table of contents for random access into SunVox and SunSynth files."""
+
+import json
+import os
+from collections import namedtuple
+
+from rv.lib.iff import as_file, chunk_headers
+
+ChunkEntry = namedtuple("ChunkEntry", ["name", "offset", "size"])
+
+Block = namedtuple("Block", ["name", "start", "end"])
+Block.__doc__ = """Byte range of a pattern or module block.
+
+``name`` is the chunk that opens the block (``PDTA``, ``PPAR``, or ``SFFF``),
+or the closing ``PEND``/``SEND`` chunk for an empty pattern or module slot.
+``start`` is the offset of the first chunk header,
+``end`` is the offset just past the closing chunk.
+"""
+
+PATTERN_STARTS = {b"PDTA", b"PPAR"}
+MODULE_STARTS = {b"SFFF"}
+EMPTY_BLOCKS = {b"PEND", b"SEND"}
+
+CACHE_SUFFIX = ".rvidx"
+
+
+class ChunkIndex:
+    """Offsets and sizes of every chunk in a file, built from chunk headers alone.
+
+    Pattern and module blocks are also located, so that a single pattern
+    or module can be read by seeking straight to it, without parsing the
+    chunks that precede it.
+    """
+
+    version = 1
+
+    def __init__(self, chunks=None, patterns=None, modules=None):
+        self.chunks = chunks or []
+        self.patterns = patterns or []
+        self.modules = modules or []
+
+    @classmethod
+    def build(cls, source):
+        """Build an index by scanning the chunk headers of source."""
+        index = cls()
+        opened = None
+        for name, offset, size in chunk_headers(source):
+            index.chunks.append(ChunkEntry(name, offset, size))
+            if opened is None and (name in PATTERN_STARTS or name in MODULE_STARTS):
+                opened = (name, offset)
+            elif name == b"PEND":
+                start_name, start = opened or (name, offset)
+                index.patterns.append(Block(start_name, start, offset + 8 + size))
+                opened = None
+            elif name == b"SEND":
+                start_name, start = opened or (name, offset)
+                index.modules.append(Block(start_name, start, offset + 8 + size))
+                opened = None
+        return index
+
+    @classmethod
+    def for_file(cls, filename, cache=False):
+        """Return the index for the named file.
+
+        When cache is true, the index is loaded from (or saved to)
+        a cache file next to the original, which is rebuilt whenever
+        the original file's size or modification time changes.
+        If the cache file can't be written, the index is still returned.
+        """
+        stat = os.stat(filename)
+        cache_filename = filename + CACHE_SUFFIX
+        if cache:
+            index = cls.load(cache_filename, stat)
+            if index is not None:
+                return index
+        with open(filename, "rb") as f:
+            index = cls.build(f)
+        if cache:
+            index.save(cache_filename, stat)
+        return index
+
+    @classmethod
+    def load(cls, cache_filename, stat=None):
+        """Load a cached index, or return None if missing or stale."""
+        try:
+            with open(cache_filename, "r") as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if doc.get("version") != cls.version:
+            return None
+        if stat is not None and doc.get("stat") != [stat.st_size, stat.st_mtime_ns]:
+            return None
+        return cls(
+            chunks=[ChunkEntry(_name(n), o, s) for n, o, s in doc["chunks"]],
+            patterns=[Block(_name(n), s, e) for n, s, e in doc["patterns"]],
+            modules=[Block(_name(n), s, e) for n, s, e in doc["modules"]],
+        )
+
+    def save(self, cache_filename, stat=None):
+        """Save the index as a cache file.
+
+        Returns False, without raising, if the file can't be written.
+        """
+        doc = {
+            "version": self.version,
+            "stat": [stat.st_size, stat.st_mtime_ns] if stat is not None else None,
+            "chunks": [(n.decode("latin-1"), o, s) for n, o, s in self.chunks],
+            "patterns": [(n.decode("latin-1"), s, e) for n, s, e in self.patterns],
+            "modules": [(n.decode("latin-1"), s, e) for n, s, e in self.modules],
+        }
+        text = json.dumps(doc, separators=(",", ":"))
+        try:
+            with open(cache_filename, "w") as f:
+                f.write(text)
+        except OSError:
+            return False
+        return True
+
+    def chunks_named(self, name):
+        """Return entries for all chunks with the given name."""
+        return [entry for entry in self.chunks if entry.name == name]
+
+
+def _name(s):
+    return s.encode("latin-1")
+
+
+def read_module(file_or_name, index, chunk_index=None):
+    """Read only the module at the given index.
+
+    Returns None if the module slot is empty.
+    """
+    from rv.readers.module import ModuleReader
+
+    return _read_indexed(ModuleReader, file_or_name, index, chunk_index)
+
+
+def read_pattern(file_or_name, index, chunk_index=None):
+    """Read only the pattern (or pattern clone) at the given index.
+
+    Returns None if the pattern slot is empty.
+    """
+    from rv.readers.pattern import PatternReader
+
+    return _read_indexed(PatternReader, file_or_name, index, chunk_index)
+
+
+def _read_indexed(reader_cls, file_or_name, index, chunk_index):
+    if isinstance(file_or_name, str):
+        if chunk_index is None:
+            chunk_index = ChunkIndex.for_file(file_or_name)
+        with open(file_or_name, "rb") as f:
+            reader = reader_cls.from_index(f, chunk_index, index)
+            return reader and reader.object
+    f = as_file(file_or_name)
+    if chunk_index is None:
+        chunk_index = ChunkIndex.build(f)
+    reader = reader_cls.from_index(f, chunk_index, index)
+    return reader and reader.object
@@ -5,10 +5,10 @@ from rv.readers.sunvox import SunVoxReader
 
 class InitialReader(Reader):
     def process_SVOX(self, _):
-        self.object = SunVoxReader(self.f).object
+        self.object = SunVoxReader(self.stream, self.options).object
 
     def process_SSYN(self, _):
-        self.object = SunSynthReader(self.f).object
+        self.object = SunSynthReader(self.stream, self.options).object
 
     def process_end_of_file(self):
         raise ReaderFinished()
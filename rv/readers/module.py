@@ -4,6 +4,8 @@ from struct import unpack
 from logutils import BraceMessage as _F
 
 from rv import ENCODING
+from rv.lazy import slnk_links
+from rv.lib.iff import LazyPayload
 from rv.modules import MODULE_CLASSES, Chunk, Module
 from rv.modules.output import Output
 from rv.readers.reader import Reader, ReaderFinished
@@ -12,12 +14,31 @@ log = logging.getLogger(__name__)
 
 
 class ModuleReader(Reader):
-    def __init__(self, f, index):
-        super(ModuleReader, self).__init__(f)
+    skipped_parts = {
+        "cmid": {b"CMID": Reader.skip_chunk},
+        "layout": dict.fromkeys(
+            [b"SXXX", b"SYYY", b"SZZZ", b"SSCL", b"SVPR", b"SCOL"], Reader.skip_chunk
+        ),
+    }
+
+    def __init__(self, f, index, options=None):
+        super(ModuleReader, self).__init__(f, options)
         self._index = index
         self._current_chunk = None
         self._cvals = []
 
+    @classmethod
+    def from_index(cls, f, chunk_index, index, options=None):
+        """Return a reader positioned at module index of f, or None if empty.
+
+        chunk_index is a :py:class:`rv.readers.index.ChunkIndex` built for f.
+        """
+        block = chunk_index.modules[index]
+        if block.name != b"SFFF":
+            return None
+        f.seek(block.start)
+        return cls(f, index=index, options=options)
+
     def process_chunks(self):
         if self._index > 0:
             self.object = Module(index=self._index)
@@ -29,10 +50,12 @@ class ModuleReader(Reader):
         self.object.flags, = unpack("<I", data)
 
     def process_SNAM(self, data):
+        data = bytes(data)
         data = data[: data.find(0)] if 0 in data else data
         self.object.name = data.decode(ENCODING)
 
     def process_STYP(self, data):
+        data = bytes(data)
         data = data[: data.find(0)] if 0 in data else data
         mtype = data.decode(ENCODING)
         cls = MODULE_CLASSES[mtype]
@@ -81,6 +104,7 @@ class ModuleReader(Reader):
         self.object.midi_in_channel = x >> 1
 
     def process_SMIN(self, data):
+        data = bytes(data)
         data = data[: data.find(0)] if 0 in data else data
         self.object.midi_out_name = data.decode(ENCODING)
 
@@ -94,22 +118,23 @@ class ModuleReader(Reader):
         self.object.midi_out_program, = unpack("<i", data)
 
     def process_SLNK(self, data):
-        links = self.object.incoming_links
-        if len(data) > 0:
-            link_count = len(data) // 4
-            structure = "<" + "i" * link_count
-            links.extend(unpack(structure, data))
-            while links[-1:] == [-1]:
-                links.pop()
+        self.object.incoming_links.extend(slnk_links(data))
 
     def process_CVAL(self, data):
         raw_value, = unpack("<i", data)
         self._cvals.append(raw_value)
 
     def _load_last_chunk(self):
-        if self._current_chunk:
-            self.object.load_chunk(self._current_chunk)
+        chunk = self._current_chunk
+        if chunk:
             self._current_chunk = None
+            if self.object.chunk_part(chunk) in self.options.skip:
+                return
+            if isinstance(chunk.chdt, LazyPayload):
+                lazy = self.options.lazy_payloads
+                if not lazy or not self.object.accepts_lazy_chunk(chunk):
+                    chunk.chdt = chunk.chdt.load()
+            self.object.load_chunk(chunk)
 
     def process_CHNK(self, data):
         val, = unpack("<I", data)
@@ -8,7 +8,31 @@ from rv.readers.reader import Reader, ReaderFinished
 log = logging.getLogger(__name__)
 
 
+PATTERN_LAYOUT_CHUNKS = [b"PYSZ", b"PFLG", b"PICO", b"PFGC", b"PBGC", b"PXXX", b"PYYY"]
+
+
 class PatternReader(Reader):
+    skipped_parts = {
+        "layout": dict.fromkeys(PATTERN_LAYOUT_CHUNKS, Reader.skip_chunk),
+    }
+
+    @classmethod
+    def from_index(cls, f, chunk_index, index, options=None):
+        """Return a reader positioned at pattern index of f, or None if empty.
+
+        chunk_index is a :py:class:`rv.readers.index.ChunkIndex` built for f.
+        A :py:class:`PatternCloneReader` is returned for pattern clones.
+        """
+        block = chunk_index.patterns[index]
+        if block.name == b"PDTA":
+            reader_cls = cls
+        elif block.name == b"PPAR":
+            reader_cls = PatternCloneReader
+        else:
+            return None
+        f.seek(block.start)
+        return reader_cls(f, options)
+
     def process_PDTA(self, data):
         self.object = Pattern()
         # Don't set directly on pattern;
@@ -16,6 +40,7 @@ class PatternReader(Reader):
         self._raw_data = data
 
     def process_PNME(self, data):
+        data = bytes(data)
         data = data[: data.find(0)] if 0 in data else data
         self.object.name = data.decode(ENCODING)
 
@@ -32,7 +57,7 @@ class PatternReader(Reader):
         self.object.appearance_flags, = unpack("<I", data)
 
     def process_PICO(self, data):
-        self.object.icon = data
+        self.object.icon = bytes(data)
 
     def process_PFGC(self, data):
         self.object.fg_color = unpack("<BBB", data)
@@ -63,6 +88,8 @@ class PatternReader(Reader):
 
 
 class PatternCloneReader(Reader):
+    skipped_parts = PatternReader.skipped_parts
+
     def process_PPAR(self, data):
         source, = unpack("<I", data)
         self.object = PatternClone(source=source)
@@ -0,0 +1,134 @@
+from collections import namedtuple
+from struct import unpack
+
+from attr import Factory, attr, attributes
+
+from rv import ENCODING
+from rv.lib.iff import as_file, chunk_headers
+
+ProbedModule = namedtuple("ProbedModule", ["index", "mtype", "name"])
+ProbedPattern = namedtuple("ProbedPattern", ["index", "tracks", "lines", "source"])
+
+
+@attributes
+class ProbeInfo:
+    """Metadata of a SunVox project or synth, as read by `probe_sunvox_file`.
+
+    container is ``"SVOX"`` or ``"SSYN"``.
+    version is a tuple for projects, like ``Project.sunvox_version``,
+    and an int for synths, like ``Synth.sunsynth_version``.
+    modules and patterns leave out empty slots.
+    Pattern clones have the index of their source pattern as source,
+    and the tracks and lines of that pattern.
+    sample_bytes and vorbis_bytes total the Sampler and Vorbis Player
+    payloads of top-level modules.
+    """
+
+    container = attr(default=None)
+    version = attr(default=None)
+    initial_bpm = attr(default=None)
+    initial_tpl = attr(default=None)
+    name = attr(default=None)
+    modules = attr(default=Factory(list))
+    patterns = attr(default=Factory(list))
+    sample_bytes = attr(default=0)
+    vorbis_bytes = attr(default=0)
+
+    @property
+    def module_count(self):
+        return len(self.modules)
+
+    @property
+    def pattern_count(self):
+        return len(self.patterns)
+
+    @property
+    def module_types(self):
+        return [module.mtype for module in self.modules]
+
+
+def probe_sunvox_file(file_or_name):
+    """Read metadata of a SunVox project or synth, without decoding it.
+
+    file_or_name may be a filename, a seekable binary file, or a buffer.
+    Only chunk headers and small chunks are read; payloads such as
+    pattern and sample data are seeked past.
+    No modules, patterns, or notes are created.
+    Returns a `ProbeInfo`.
+    """
+    if isinstance(file_or_name, str):
+        with open(file_or_name, "rb") as f:
+            return _probe(f)
+    return _probe(as_file(file_or_name))
+
+
+def _probe(f):
+    info = ProbeInfo()
+
+    def read(offset, size):
+        f.seek(offset + 8)
+        return bytes(f.read(size))
+
+    def read_string(offset, size):
+        data = read(offset, size)
+        data = data[: data.find(0)] if 0 in data else data
+        return data.decode(ENCODING, "replace")
+
+    module_index = pattern_index = 0
+    mtype = mname = chnm = None
+    in_module = False
+    tracks = lines = source = None
+    sizes = {}
+    for name, offset, size in chunk_headers(f):
+        if info.container is None:
+            info.container = name.decode(ENCODING)
+            if info.container == "SSYN":
+                module_index = 1
+        elif name == b"VERS":
+            data = read(offset, size)
+            if info.container == "SSYN":
+                info.version, = unpack("<I", data)
+            else:
+                info.version = tuple(reversed(unpack("BBBB", data)))
+        elif name == b"BPM ":
+            info.initial_bpm, = unpack("<I", read(offset, size))
+        elif name == b"SPED":
+            info.initial_tpl, = unpack("<I", read(offset, size))
+        elif name == b"NAME":
+            info.name = read_string(offset, size)
+        elif name == b"SFFF":
+            in_module = True
+            mtype, mname, chnm = "Output", None, None
+        elif name == b"STYP" and in_module:
+            mtype = read_string(offset, size)
+        elif name == b"SNAM" and in_module:
+            mname = read_string(offset, size)
+        elif name == b"CHNM" and in_module:
+            chnm, = unpack("<I", read(offset, size))
+        elif name == b"CHDT" and in_module:
+            if mtype == "Sampler" and 0 < chnm < 0x101 and chnm % 2 == 0:
+                info.sample_bytes += size
+            elif mtype == "Vorbis player" and chnm == 0:
+                info.vorbis_bytes += size
+        elif name == b"SEND":
+            if in_module:
+                info.modules.append(ProbedModule(module_index, mtype, mname))
+            in_module = False
+            module_index += 1
+        elif name == b"PCHN":
+            tracks, = unpack("<I", read(offset, size))
+        elif name == b"PLIN":
+            lines, = unpack("<I", read(offset, size))
+        elif name == b"PPAR":
+            source, = unpack("<I", read(offset, size))
+        elif name == b"PEND":
+            if source is not None:
+                tracks, lines = sizes.get(source, (None, None))
+            if tracks is not None:
+                sizes[pattern_index] = tracks, lines
+            if tracks is not None or source is not None:
+                pattern = ProbedPattern(pattern_index, tracks, lines, source)
+                info.patterns.append(pattern)
+            tracks = lines = source = None
+            pattern_index += 1
+    return info
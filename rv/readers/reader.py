@@ -1,13 +1,115 @@
 import logging
+
+from attr import attr, attributes
 from logutils import BraceMessage as _F
 
 from rv import ENCODING
-from rv.lib.iff import chunks
+from rv.lib.compression import decompressed
+from rv.lib.iff import ChunkStream, as_file
 
 log = logging.getLogger(__name__)
 
 
-def read_sunvox_file(file_or_name):
+LAZY_PAYLOAD_SIZE = 1 << 16
+
+#: Parts of a file that can be included in or excluded from reading.
+READ_PARTS = frozenset(["patterns", "samples", "vorbis", "projects", "cmid", "layout"])
+
+#: Parts stored in module CHDT payloads.
+PAYLOAD_PARTS = frozenset(["samples", "vorbis", "projects"])
+
+
+@attributes
+class ReadOptions:
+    """Options shared by a reader and all of its sub-readers.
+
+    lazy_payloads is the minimum size of CHDT payloads to leave unread,
+    as :py:class:`rv.lib.iff.LazyPayload` handles, or 0 to read all payloads.
+
+    If lazy is true, project patterns and modules are kept as
+    :py:class:`rv.lazy.LazyBlock` chunks until first accessed.
+
+    skip is the set of :py:data:`READ_PARTS` not to decode.
+    """
+
+    lazy_payloads = attr(default=0)
+    lazy = attr(default=False)
+    skip = attr(default=frozenset())
+
+    @property
+    def defers_payloads(self):
+        """True if some payloads in files should be left unread."""
+        return bool(
+            self.lazy_payloads or self.skip & PAYLOAD_PARTS or "patterns" in self.skip
+        )
+
+    def lazy_payload(self, name, size):
+        if name == b"CHDT":
+            if self.lazy_payloads:
+                return size >= self.lazy_payloads
+            return size >= LAZY_PAYLOAD_SIZE and bool(self.skip & PAYLOAD_PARTS)
+        return name == b"PDTA" and "patterns" in self.skip
+
+
+def skipped_parts(include=None, exclude=None):
+    """Return the set of parts to skip, given parts to include and exclude."""
+    include = READ_PARTS if include is None else frozenset(include)
+    exclude = frozenset(exclude or ())
+    unknown = (include | exclude) - READ_PARTS
+    if unknown:
+        raise ValueError("Unknown parts: {}".format(", ".join(sorted(unknown))))
+    return (READ_PARTS - include) | exclude
+
+
+def read_options(lazy_payloads=False, lazy=False, include=None, exclude=None):
+    """Return `ReadOptions` for the arguments of `read_sunvox_file`."""
+    if lazy_payloads is True:
+        lazy_payloads = LAZY_PAYLOAD_SIZE
+    return ReadOptions(
+        lazy_payloads=int(lazy_payloads),
+        lazy=lazy,
+        skip=skipped_parts(include, exclude),
+    )
+
+
+def read_sunvox_file(
+    file_or_name, lazy_payloads=False, lazy=False, include=None, exclude=None
+):
+    """Read a SunVox project or synth.
+
+    file_or_name may be a filename, an open binary file, or a buffer
+    such as bytes, bytearray, memoryview, or mmap.
+    Buffers are parsed in place, without copying chunk payloads.
+    gzip, xz, and bzip2 compressed data is detected and decompressed
+    as it is read.
+
+    If lazy_payloads is true (or a minimum size in bytes), large sample,
+    Vorbis, and embedded project payloads in files are not read until
+    they are accessed. Files given by name are reopened when that happens;
+    open files must stay open.
+
+    If lazy is true, the patterns and modules of a project are only
+    decoded when first accessed through ``project.patterns`` or
+    ``project.modules``; until then they keep the chunks they were read
+    from, and are written back unchanged.
+    Buffers are referenced rather than copied, so they must not change.
+
+    include and exclude limit which parts of the file are decoded;
+    each is a collection of names from :py:data:`READ_PARTS`:
+
+    - ``patterns``: patterns and pattern clones.
+    - ``samples``: Sampler sample data (sample settings are still read).
+    - ``vorbis``: Vorbis Player data.
+    - ``projects``: projects embedded in MetaModules.
+    - ``cmid``: controller MIDI mappings.
+    - ``layout``: positions, colors, scales, and icons of modules and patterns,
+      and the module view settings of projects.
+
+    Only the parts in include, if given, are read, except for those in exclude.
+    Skipped parts keep their default values; skipped patterns are left out
+    of ``project.patterns`` entirely. Saving such a project drops them.
+    Skipped payloads in files are seeked past rather than read.
+    """
     from rv.readers.initial import InitialReader
 
     close = False
@@ -15,7 +117,8 @@ def read_sunvox_file(file_or_name):
         file_or_name = open(file_or_name, "rb")
         close = True
     try:
-        reader = InitialReader(file_or_name)
+        options = read_options(lazy_payloads, lazy, include, exclude)
+        reader = InitialReader(as_file(decompressed(file_or_name)), options)
         return reader.object
     finally:
         if close:
@@ -23,10 +126,74 @@ def read_sunvox_file(file_or_name):
 
 
 class Reader:
-    """Abstract base class for reading SunVox and SunSynth IFF files"""
+    """Abstract base class for reading SunVox and SunSynth IFF files
+
+    Chunks are dispatched to ``process_<NAME>`` methods.
+    Each subclass resolves these once, into a table mapping
+    chunk names (as bytes) to functions.
+    Chunks without a method are passed to `process_unknown`.
+
+    skipped_parts maps the names of parts of a file to the chunk
+    handlers used instead of the usual ones when that part is skipped.
+    """
+
+    skipped_parts = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
+
+    @classmethod
+    def _build_dispatch_table(cls):
+        table = {}
+        for attr_name in dir(cls):
+            if not attr_name.startswith("process_"):
+                continue
+            tag = attr_name[len("process_") :]
+            method = getattr(cls, attr_name)
+            if len(tag) <= 4 and callable(method):
+                table[tag.encode(ENCODING).ljust(4)] = method
+        cls._dispatch_table = table
+        cls._skip_tables = {}
+
+    @classmethod
+    def _skip_table(cls, skip):
+        """Return the dispatch table to use when skipping the given parts."""
+        try:
+            return cls._skip_tables[skip]
+        except KeyError:
+            pass
+        table = cls._dispatch_table
+        replaced = [
+            cls.skipped_parts[part] for part in skip if part in cls.skipped_parts
+        ]
+        if replaced:
+            table = dict(table)
+            for handlers in replaced:
+                table.update(handlers)
+        cls._skip_tables[skip] = table
+        return table
+
+    @classmethod
+    def _resolve_tag(cls, name):
+        """Resolve a chunk name missing from the table, and remember the result."""
+        tag = name.decode(ENCODING, "replace").strip()
+        method = getattr(cls, "process_{}".format(tag), None)
+        method = method if callable(method) else None
+        cls._dispatch_table[name] = method
+        return method
 
-    def __init__(self, f):
-        self.f = f
+    def __init__(self, f, options=None):
+        """Create a reader for f.
+
+        f may be a file or buffer, or the `ChunkStream` of a parent reader.
+        """
+        self.options = options if options is not None else ReadOptions()
+        if isinstance(f, ChunkStream):
+            self.stream = f
+        else:
+            lazy = self.options.lazy_payload if self.options.defers_payloads else None
+            self.stream = ChunkStream(f, lazy)
         self._object = None
 
     @property
@@ -43,31 +210,68 @@ class Reader:
             raise AttributeError("object was already set")
 
     def process_chunks(self):
+        skip = self.options.skip
+        table = self._skip_table(skip) if skip else self._dispatch_table
+        resolve = self._resolve_tag
+        debug = log.isEnabledFor(logging.DEBUG)
         try:
-            for name, data in chunks(self.f):
-                name = name.decode(ENCODING).strip()
-                method_name = "process_{}".format(name)
-                method = getattr(self, method_name, None)
-                log_args = (self.__class__.__name__, method_name)
-                if callable(method):
-                    log.debug(_F("-> {}.{}", *log_args))
-                    method(data)
-                else:
-                    log.warning(_F("no {}.{} method", *log_args))
+            for name, data in self.stream:
+                try:
+                    method = table[name]
+                except KeyError:
+                    method = resolve(name)
+                if method is None:
+                    self.process_unknown(name, data)
+                    continue
+                if debug:
+                    log.debug(_F("-> {}.{}", self.__class__.__name__, method.__name__))
+                method(self, data)
             self.process_end_of_file()
         except ReaderFinished:
             pass
 
+    def process_chunk(self, name, data):
+        """Dispatch a single chunk, as `process_chunks` does for each chunk.
+
+        This lets a caller feed chunks one at a time,
+        as they arrive from a non-blocking source.
+        """
+        skip = self.options.skip
+        table = self._skip_table(skip) if skip else self._dispatch_table
+        try:
+            method = table[name]
+        except KeyError:
+            method = self._resolve_tag(name)
+        if method is None:
+            self.process_unknown(name, data)
+        else:
+            method(self, data)
+
+    def process_unknown(self, name, data):
+        """Handle a chunk that has no ``process_<NAME>`` method.
+
+        Override this to collect or reject unknown chunks; by default
+        a warning is logged and the chunk is skipped.
+        """
+        tag = name.decode(ENCODING, "replace").strip()
+        log.warning(_F("no {}.process_{} method", self.__class__.__name__, tag))
+
     def rewind(self, data):
-        new_pos = self.f.tell() - len(data) - 8
-        self.f.seek(new_pos)
+        """Push the chunk just read back onto the stream, for a nested reader."""
+        self.stream.push_back(*self.stream.last)
 
     def process_PAMD(self, data):
         pass  # Unused in current SunVox.
 
+    def skip_chunk(self, data):
+        """Ignore a chunk of a skipped part."""
+
     def process_end_of_file(self):
         raise RuntimeError("Reached end of file without a handler")
 
 
+Reader._build_dispatch_table()
+
+
 class ReaderFinished(Exception):
     """A reader is finished processing its relevant chunks."""
@@ -6,19 +6,23 @@ from rv.synth import Synth
 
 
 class SunSynthReader(Reader):
-    def __init__(self, f):
-        super(SunSynthReader, self).__init__(f)
+    def __init__(self, f, options=None):
+        super(SunSynthReader, self).__init__(f, options)
 
     def process_chunks(self):
-        self.object = Synth()
+        self.start()
         super().process_chunks()
 
+    def start(self):
+        """Create the synth that chunks are read into."""
+        self.object = Synth()
+
     def process_VERS(self, data):
         self.object.sunsynth_version, = unpack("<I", data)
 
     def process_SFFF(self, data):
-        self.rewind(data)
-        mod = ModuleReader(self.f, index=1).object
+        self.stream.push_back(b"SFFF", data)
+        mod = ModuleReader(self.stream, index=1, options=self.options).object
         self.object.module = mod
 
     def process_end_of_file(self):
@@ -1,6 +1,8 @@
 from struct import unpack
 
 from rv import ENCODING
+from rv.lazy import LazyBlock, LazySequence, slnk_links
+from rv.lib.iff import ChunkStream
 from rv.project import Project
 from rv.readers.module import ModuleReader
 from rv.readers.pattern import PatternCloneReader, PatternReader
@@ -8,13 +10,70 @@ from rv.readers.reader import Reader, ReaderFinished
 
 
 class SunVoxReader(Reader):
-    def __init__(self, f):
-        super(SunVoxReader, self).__init__(f)
+    def skip_pattern(self, data):
+        for name, _ in self.stream:
+            if name == b"PEND":
+                break
+
+    skipped_parts = {
+        "patterns": {
+            b"PDTA": skip_pattern,
+            b"PPAR": skip_pattern,
+            b"PEND": Reader.skip_chunk,
+        },
+        "layout": dict.fromkeys(
+            [b"MSCL", b"MZOO", b"MXOF", b"MYOF", b"LMSK", b"CURL"], Reader.skip_chunk
+        ),
+    }
+
+    def __init__(self, f, options=None):
+        super(SunVoxReader, self).__init__(f, options)
 
     def process_chunks(self):
+        self.start()
+        super().process_chunks()
+
+    def start(self):
+        """Create the project that chunks are read into."""
         self.object = Project()
         self.object.modules.clear()
-        super().process_chunks()
+        if self.options.lazy:
+            self.object.patterns = LazySequence(self.load_pattern)
+            self.object.modules = LazySequence(self.load_module)
+
+    def read_block(self, end):
+        """Collect the chunks of the current block, up to its end chunk."""
+        chunks = [self.stream.last]
+        for chunk in self.stream:
+            if chunk[0] == end:
+                break
+            chunks.append(chunk)
+        return LazyBlock(chunks)
+
+    def load_pattern(self, index, block):
+        stream = ChunkStream.from_chunks(block.chunks + [(b"PEND", b"")])
+        reader_class = (
+            PatternReader if block.chunks[0][0] == b"PDTA" else PatternCloneReader
+        )
+        pattern = reader_class(stream, self.options).object
+        pattern.project = self.object
+        return pattern
+
+    def load_module(self, index, block):
+        stream = ChunkStream.from_chunks(block.chunks + [(b"SEND", b"")])
+        module = ModuleReader(stream, index=index, options=self.options).object
+        module.index = index
+        module.parent = self.object
+        module.incoming_links = self.object.module_connections[index]
+        self.object._module_loaded(index, block, module)
+        return module
+
+    def attach_lazy_module(self, block):
+        project = self.object
+        index = len(project.modules)
+        project.modules.append(block)
+        links = block.first(b"SLNK")
+        project.module_connections[index] = slnk_links(links or b"")
 
     def process_VERS(self, data):
         self.object.sunvox_version = tuple(reversed(unpack("BBBB", data)))
@@ -38,6 +97,7 @@ class SunVoxReader(Reader):
         self.object.global_volume, = unpack("<I", data)
 
     def process_NAME(self, data):
+        data = bytes(data)
         data = data[: data.find(0)] if 0 in data else data
         self.object.name = data.decode(ENCODING)
 
@@ -81,8 +141,11 @@ class SunVoxReader(Reader):
         self.object.current_line, = unpack("<I", data)
 
     def process_PDTA(self, data):
-        self.rewind(data)
-        pattern = PatternReader(self.f).object
+        if self.options.lazy:
+            self.object.patterns.append(self.read_block(b"PEND"))
+            return
+        self.stream.push_back(b"PDTA", data)
+        pattern = PatternReader(self.stream, self.options).object
         self.object.attach_pattern(pattern)
 
     def process_PEND(self, data):
@@ -90,13 +153,21 @@ class SunVoxReader(Reader):
         self.object.attach_pattern(None)
 
     def process_PPAR(self, data):
-        self.rewind(data)
-        pattern = PatternCloneReader(self.f).object
+        if self.options.lazy:
+            self.object.patterns.append(self.read_block(b"PEND"))
+            return
+        self.stream.push_back(b"PPAR", data)
+        pattern = PatternCloneReader(self.stream, self.options).object
         self.object.attach_pattern(pattern)
 
     def process_SFFF(self, data):
-        self.rewind(data)
-        mod = ModuleReader(self.f, index=len(self.object.modules)).object
+        index = len(self.object.modules)
+        if self.options.lazy and index > 0:
+            # The output module is always decoded, for project.output.
+            self.attach_lazy_module(self.read_block(b"SEND"))
+            return
+        self.stream.push_back(b"SFFF", data)
+        mod = ModuleReader(self.stream, index=index, options=self.options).object
         self.object.attach_module(mod)
 
     def process_SEND(self, _):
@@ -104,6 +175,7 @@ class SunVoxReader(Reader):
 
     def process_end_of_file(self):
         # Clear out empty modules at end of list.
-        while self.object.modules[-1:] == [None]:
-            self.object.modules.pop()
+        modules = self.object.modules
+        while modules and list.__getitem__(modules, -1) is None:
+            modules.pop()
         raise ReaderFinished()
@@ -0,0 +1,189 @@
+"""Conversion between project lines, ticks, seconds, and frames.
+
+SunVox plays one line every ``tpl`` ticks, and one tick every
+``2.5 / bpm`` seconds, so a line lasts ``tpl * 2.5 / bpm`` seconds.
+Both are set initially by the project, and changed during playback
+by effect ``0F`` (set playing speed) in pattern notes.
+"""
+
+from bisect import bisect_right
+
+from rv.note import NOTE_SIZE
+from rv.pattern import EFFECT_COLUMN
+
+#: Effect setting ticks per line (values below 0x20) or BPM (other values).
+SPEED_EFFECT = 0x0F
+
+#: Lowest value of the speed effect that sets BPM instead of ticks per line.
+SPEED_EFFECT_MIN_BPM = 0x20
+
+SECONDS_PER_TICK_AT_1_BPM = 2.5
+
+
+def speed_commands(pattern):
+    """Return (line, track, value) for each speed effect in pattern."""
+    indexes, cells = pattern.note_cells()
+    effects = bytes(cells[EFFECT_COLUMN::NOTE_SIZE])
+    commands = []
+    position = effects.find(SPEED_EFFECT)
+    while position != -1:
+        offset = position * NOTE_SIZE
+        line, track = divmod(indexes[position], pattern.tracks)
+        value = int.from_bytes(cells[offset + 6 : offset + 8], "little")
+        commands.append((line, track, value))
+        position = effects.find(SPEED_EFFECT, position + 1)
+    return commands
+
+
+class TempoMap:
+    """Tempo of a project at each line, for converting between time units.
+
+    changes is a list of (line, bpm, tpl) tuples in line order,
+    the first of which is at line 0. length is the song length in lines.
+
+    Conversions accept a single position, a sequence of positions
+    (returning a list), or a NumPy array (returning an array).
+    Lines and ticks may be fractional.
+    """
+
+    def __init__(self, changes, length=0):
+        self.length = length
+        self.lines = []
+        self.bpms = []
+        self.tpls = []
+        self.ticks_at = []
+        self.seconds_at = []
+        self.seconds_per_line = []
+        ticks = seconds = 0.0
+        for line, bpm, tpl in changes:
+            if self.lines:
+                elapsed = line - self.lines[-1]
+                ticks += elapsed * self.tpls[-1]
+                seconds += elapsed * self.seconds_per_line[-1]
+                if elapsed == 0:
+                    for values in self._columns():
+                        values.pop()
+            self.lines.append(line)
+            self.bpms.append(bpm)
+            self.tpls.append(tpl)
+            self.ticks_at.append(ticks)
+            self.seconds_at.append(seconds)
+            self.seconds_per_line.append(tpl * SECONDS_PER_TICK_AT_1_BPM / bpm)
+        self._lines_per_tick = [1.0 / tpl for tpl in self.tpls]
+        self._lines_per_second = [1.0 / rate for rate in self.seconds_per_line]
+
+    def _columns(self):
+        return (
+            self.lines,
+            self.bpms,
+            self.tpls,
+            self.ticks_at,
+            self.seconds_at,
+            self.seconds_per_line,
+        )
+
+    @classmethod
+    def from_project(cls, project):
+        """Build the tempo map of project, from its patterns' speed effects."""
+        timeline = project.timeline
+        commands = {}
+        events = []
+        for order, placement in enumerate(timeline.placements):
+            source = placement.source
+            if source not in commands:
+                commands[source] = speed_commands(project.patterns[source])
+            for line, track, value in commands[source]:
+                line += placement.start
+                if line >= 0:
+                    events.append((line, order, track, value))
+        events.sort()
+        bpm, tpl = project.initial_bpm, project.initial_tpl
+        changes = [(0, bpm, tpl)]
+        for line, _, _, value in events:
+            if value >= SPEED_EFFECT_MIN_BPM:
+                bpm = value
+            elif value:
+                tpl = value
+            else:
+                continue
+            changes.append((line, bpm, tpl))
+        return cls(changes, timeline.end)
+
+    def bpm_at(self, line):
+        """Return the BPM in effect at line."""
+        return self.bpms[max(bisect_right(self.lines, line) - 1, 0)]
+
+    def tpl_at(self, line):
+        """Return the ticks per line in effect at line."""
+        return self.tpls[max(bisect_right(self.lines, line) - 1, 0)]
+
+    def ticks(self, line):
+        """Return the number of ticks played before line."""
+        return _convert(line, self.lines, self.ticks_at, self.tpls)
+
+    def line_at_tick(self, tick):
+        """Return the line played at tick."""
+        return _convert(tick, self.ticks_at, self.lines, self._lines_per_tick)
+
+    def seconds(self, line):
+        """Return the time in seconds at which line starts playing."""
+        return _convert(line, self.lines, self.seconds_at, self.seconds_per_line)
+
+    def line_at(self, seconds):
+        """Return the line played at the given time in seconds."""
+        return _convert(seconds, self.seconds_at, self.lines, self._lines_per_second)
+
+    def frames(self, line, freq=44100):
+        """Return the audio frame, at freq frames per second, at which line starts."""
+        return _round(_scale(self.seconds(line), freq))
+
+    def line_at_frame(self, frame, freq=44100):
+        """Return the line played at frame, at freq frames per second."""
+        return self.line_at(_scale(frame, 1.0 / freq))
+
+    @property
+    def length_seconds(self):
+        """Song length in seconds, up to the end of the last pattern."""
+        return self.seconds(self.length)
+
+    def length_frames(self, freq=44100):
+        """Song length in frames, at freq frames per second."""
+        return self.frames(self.length, freq)
+
+
+def _is_array(values):
+    return hasattr(values, "dtype") and hasattr(values, "shape")
+
+
+def _convert(values, starts, bases, rates):
+    """Map values through the piecewise linear function given by segments.
+
+    Segment i starts at starts[i], where it maps to bases[i],
+    and increases by rates[i] per unit.
+    """
+    if _is_array(values):
+        import numpy as np
+
+        starts, bases, rates = np.asarray(starts), np.asarray(bases), np.asarray(rates)
+        index = np.maximum(np.searchsorted(starts, values, side="right") - 1, 0)
+        return bases[index] + (values - starts[index]) * rates[index]
+    if not isinstance(values, (int, float)):
+        return [_convert(value, starts, bases, rates) for value in values]
+    index = max(bisect_right(starts, values) - 1, 0)
+    return bases[index] + (values - starts[index]) * rates[index]
+
+
+def _scale(values, factor):
+    if _is_array(values) or isinstance(values, (int, float)):
+        return values * factor
+    return [value * factor for value in values]
+
+
+def _round(values):
+    if _is_array(values):
+        import numpy as np
+
+        return np.rint(values).astype(np.int64)
+    if isinstance(values, (int, float)):
+        return int(round(values))
+    return [int(round(value)) for value in values]
@@ -0,0 +1,271 @@
+"""Index of where patterns are placed on a project's timeline."""
+
+import heapq
+from collections import namedtuple
+
+from rv.note import NOTE_STRUCT
+from rv.pattern import PatternClone
+
+#: A pattern placed on the timeline, playing lines start to end (exclusive).
+#: index is the pattern's index in the project, and source the index of
+#: the pattern holding its notes (itself, unless it is a clone).
+Placement = namedtuple("Placement", ["index", "source", "start", "end", "y"])
+
+
+#: A note playing at a project line, from the pattern at index in the project.
+#: Note fields are the raw integers stored in the pattern.
+NoteEvent = namedtuple(
+    "NoteEvent", ["line", "pattern", "track", "note", "vel", "module", "ctl", "val"]
+)
+
+#: Note events of lines start to stop, as one NumPy array per field.
+EventBlock = namedtuple(
+    "EventBlock",
+    [
+        "start",
+        "stop",
+        "line",
+        "pattern",
+        "track",
+        "note",
+        "vel",
+        "module",
+        "ctl",
+        "val",
+    ],
+)
+
+
+def _order(placement):
+    return placement.y, placement.start, placement.index
+
+
+class _Node:
+    """Node of a centered interval tree of placements.
+
+    Holds the placements playing at line center, as (start, position)
+    pairs sorted by start and (end, position) pairs sorted by end,
+    descending. Placements ending at or before center are in left,
+    and those starting after it in right.
+
+    Nodes of at most `leaf_size` placements are not split; their center
+    is None, and items holds their (start, end, position) triples.
+    """
+
+    __slots__ = ["center", "items", "by_start", "by_end", "left", "right"]
+
+    leaf_size = 16
+
+    def __init__(self, items):
+        # items are (start, end, position) triples, sorted by start.
+        if len(items) <= self.leaf_size:
+            self.center = None
+            self.items = items
+            return
+        # Splitting at the median start leaves at most half on each side.
+        center = self.center = items[len(items) // 2][0]
+        here, left, right = [], [], []
+        for item in items:
+            start, end, _ = item
+            if end <= center:
+                left.append(item)
+            elif start > center:
+                right.append(item)
+            else:
+                here.append(item)
+        self.by_start = [(start, i) for start, _, i in here]
+        self.by_end = sorted(((end, i) for _, end, i in here), reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class Timeline:
+    """Interval index of the pattern placements of a project.
+
+    Placements are held in a centered interval tree, so the placements
+    playing in a range of lines are found in O(log n + k) time, for k
+    placements found, however long or early the patterns are.
+    Building the index takes O(n log n) time and O(n) space.
+    Placements are returned ordered by y position, then by x, then by index.
+    """
+
+    def __init__(self, placements):
+        self.placements = sorted(placements, key=_order)
+        items = sorted(
+            (p.start, p.end, i)
+            for i, p in enumerate(self.placements)
+            if p.end > p.start
+        )
+        self._root = _Node(items) if items else None
+        self._end = max((p.end for p in self.placements), default=0)
+
+    @classmethod
+    def from_project(cls, project):
+        placements = []
+        for index, pattern in enumerate(project.patterns):
+            if pattern is None:
+                continue
+            source = pattern.source_pattern(project)
+            if source is None:
+                continue
+            source_index = (
+                pattern.source if isinstance(pattern, PatternClone) else index
+            )
+            placements.append(
+                Placement(
+                    index, source_index, pattern.x, pattern.x + source.lines, pattern.y
+                )
+            )
+        return cls(placements)
+
+    @property
+    def end(self):
+        """The line after the last line of the last pattern, or 0 if empty."""
+        return self._end
+
+    def at(self, line):
+        """Return the placements playing at line."""
+        return tuple(self.overlapping(line, line + 1))
+
+    def overlapping(self, start, stop):
+        """Return the placements playing at any line from start to stop."""
+        positions = []
+        nodes = [self._root] if start < stop else []
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            if node.center is None:
+                positions.extend(
+                    i for first, end, i in node.items if first < stop and end > start
+                )
+            elif stop <= node.center:
+                for first, i in node.by_start:
+                    if first >= stop:
+                        break
+                    positions.append(i)
+                nodes.append(node.left)
+            elif start > node.center:
+                for end, i in node.by_end:
+                    if end <= start:
+                        break
+                    positions.append(i)
+                nodes.append(node.right)
+            else:
+                positions.extend(i for _, i in node.by_start)
+                nodes.append(node.left)
+                nodes.append(node.right)
+        positions.sort()
+        placements = self.placements
+        return [placements[i] for i in positions]
+
+    def iter_events(self, project, start=0, stop=None):
+        """Yield a `NoteEvent` for each note set in lines start to stop.
+
+        Events are ordered by line, then by placement order, then by track.
+        Notes are read straight from each placement's source pattern,
+        so clones share their source's data.
+        """
+        if stop is None:
+            stop = self.end
+        streams = []
+        for order, placement in enumerate(self.overlapping(start, stop)):
+            streams.append(
+                self._placement_events(project, order, placement, start, stop)
+            )
+        for _, _, _, event in heapq.merge(*streams):
+            yield event
+
+    @staticmethod
+    def _placement_events(project, order, placement, start, stop):
+        pattern = project.patterns[placement.source]
+        tracks = pattern.tracks
+        index = placement.index
+        first = max(start - placement.start, 0)
+        last = min(stop, placement.end) - placement.start
+        unpack_from = NOTE_STRUCT.unpack_from
+        for cell, cells, offset in pattern._iter_cells(first, last):
+            line, track = divmod(cell, tracks)
+            line += placement.start
+            note, vel, module, _, ctl, val = unpack_from(cells, offset)
+            event = NoteEvent(line, index, track, note, vel, module, ctl, val)
+            yield line, order, track, event
+
+    def iter_event_blocks(self, project, start=0, stop=None, block_lines=1024):
+        """Yield an `EventBlock` of NumPy arrays for each block_lines lines.
+
+        Blocks cover lines start to stop, and hold the same events as
+        `iter_events`, in the same order. Each pattern's notes are converted
+        with array operations, without a Python call per note.
+        NumPy must be installed.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("Please install numpy to use iter_event_blocks")
+        dtype = np.dtype(
+            [
+                ("note", "u1"),
+                ("vel", "u1"),
+                ("module", "u1"),
+                ("pad", "u1"),
+                ("ctl", "<u2"),
+                ("val", "<u2"),
+            ]
+        )
+        if stop is None:
+            stop = self.end
+        for block_start in range(start, stop, block_lines):
+            block_stop = min(block_start + block_lines, stop)
+            parts = []
+            for order, placement in enumerate(
+                self.overlapping(block_start, block_stop)
+            ):
+                pattern = project.patterns[placement.source]
+                first = max(block_start - placement.start, 0)
+                last = min(block_stop, placement.end) - placement.start
+                indexes, cells = pattern.note_cells(first, last)
+                if isinstance(indexes, range):
+                    indexes = np.arange(indexes.start, indexes.stop)
+                else:
+                    indexes = np.array(indexes, dtype=np.int64)
+                notes = np.frombuffer(cells, dtype=dtype)
+                keep = np.frombuffer(cells, dtype="<u8") != 0
+                lines, tracks = np.divmod(indexes[keep], pattern.tracks)
+                parts.append(
+                    (
+                        lines + placement.start,
+                        order,
+                        placement.index,
+                        tracks,
+                        notes[keep],
+                    )
+                )
+            if parts:
+                line = np.concatenate([p[0] for p in parts])
+                order = np.concatenate([np.full(len(p[0]), p[1]) for p in parts])
+                index = np.concatenate([np.full(len(p[0]), p[2]) for p in parts])
+                track = np.concatenate([p[3] for p in parts])
+                notes = np.concatenate([p[4] for p in parts])
+                sort = np.lexsort((track, order, line))
+                line, index, track, notes = (
+                    line[sort],
+                    index[sort],
+                    track[sort],
+                    notes[sort],
+                )
+            else:
+                line = index = track = np.zeros(0, dtype=np.int64)
+                notes = np.zeros(0, dtype=dtype)
+            yield EventBlock(
+                block_start,
+                block_stop,
+                line,
+                index,
+                track,
+                notes["note"],
+                notes["vel"],
+                notes["module"],
+                notes["ctl"],
+                notes["val"],
+            )
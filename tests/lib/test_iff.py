@@ -0,0 +1,171 @@
+import copy
+import gzip
+import mmap
+import pickle
+from io import BytesIO
+
+from rv.api import m, Project, read_sunvox_file, Synth
+from rv.lib.iff import (
+    BufferReader,
+    ChunkWriter,
+    chunks,
+    copy_payload,
+    dump_file,
+    summarize_file,
+    write_chunk,
+)
+
+from tests.reader.base import FIXTURE_DIR
+
+
+def test_chunks_yield_memoryviews_into_buffer():
+    source = bytearray(b"ABCD\x03\x00\x00\x00xyzEFGH\x00\x00\x00\x00")
+    result = list(chunks(source))
+    assert [name for name, _ in result] == [b"ABCD", b"EFGH"]
+    data = result[0][1]
+    assert isinstance(data, memoryview)
+    assert data == b"xyz"
+    source[8] = ord("X")
+    assert data == b"Xyz"
+
+
+def test_chunks_from_file_and_buffer_agree():
+    with open(str(FIXTURE_DIR / "empty.sunvox"), "rb") as f:
+        raw = f.read()
+    from_file = [(n, bytes(d)) for n, d in chunks(BytesIO(raw))]
+    from_buffer = [(n, bytes(d)) for n, d in chunks(raw)]
+    assert from_file == from_buffer
+    assert from_file[0] == (b"SVOX", b"")
+
+
+def test_buffer_reader_seek_and_tell():
+    f = BufferReader(b"0123456789")
+    assert f.read(3) == b"012"
+    assert f.tell() == 3
+    f.seek(-2, 2)
+    assert f.read() == b"89"
+    assert f.read(4) == b""
+
+
+def test_read_sunvox_file_from_mmap(tmpdir):
+    project = Project()
+    project.name = "mapped"
+    gen = project.new_module(m.Generator)
+    gen >> project.output
+    path = str(tmpdir / "mapped.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        loaded = read_sunvox_file(mapped)
+    assert loaded.name == "mapped"
+    assert isinstance(loaded.modules[1], m.Generator)
+    assert loaded.module_connections[0] == [1]
+    assert read_sunvox_file(project.read()).name == "mapped"
+
+
+def payload_project():
+    project = Project()
+    project.new_module(m.AnalogGenerator)
+    project.new_module(m.Generator)
+    sampler = project.new_module(m.Sampler)
+    sample = m.Sampler.Sample()
+    sample.data = bytes(range(256)) * 4
+    sampler.samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=b"OggS" + bytes(100))
+    return project
+
+
+def test_loaded_payloads_do_not_refer_to_source(tmpdir):
+    project = payload_project()
+    path = str(tmpdir / "payloads.sunvox")
+    project.write_to(path)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        loaded = read_sunvox_file(mapped)
+        mapped.close()
+    source = bytearray(project.read())
+    from_buffer = read_sunvox_file(source)
+    source[:] = bytes(len(source))
+    expected = bytes(project.read())
+    for copied in (
+        loaded,
+        from_buffer,
+        pickle.loads(pickle.dumps(loaded)),
+        copy.deepcopy(from_buffer),
+    ):
+        assert bytes(copied.read()) == expected
+
+
+def test_copy_payload_keeps_whole_bytes(tmpdir):
+    data = bytes(range(256))
+    assert copy_payload(memoryview(data)) is data
+    part = copy_payload(memoryview(data)[1:])
+    assert type(part) is bytes and part == data[1:]
+    buffer = bytearray(data)
+    copied = copy_payload(memoryview(buffer))
+    buffer[0] = 1
+    assert copied == data
+    path = str(tmpdir / "payloads.sunvox")
+    payload_project().write_to(path)
+    with open(path, "rb") as f:
+        for name, payload in chunks(f):
+            assert copy_payload(payload) is payload.obj
+
+
+def test_chunk_writer_matches_write_chunk(tmpdir):
+    payloads = [(b"CVAL", b"\x01\x00\x00\x00"), (b"BPM", b"}\0\0\0"), (b"SEND", b"")]
+    payloads += [(b"CHDT", bytes(range(256)) * 512), (None, None)]
+    expected = BytesIO()
+    for name, data in payloads:
+        write_chunk(expected, name, data)
+    path = str(tmpdir / "written.bin")
+    with open(path, "wb") as f:
+        f.write(b"head")
+        with ChunkWriter(f) as writer:
+            writer.buffer_size = 32
+            for name, data in payloads * 3:
+                writer.write_chunk(name, data)
+        assert f.tell() == 4 + len(expected.getvalue()) * 3
+        f.write(b"tail")
+    with open(path, "rb") as f:
+        assert f.read() == b"head" + expected.getvalue() * 3 + b"tail"
+    joined = BytesIO()
+    with ChunkWriter(joined) as writer:
+        for name, data in payloads:
+            writer.write_chunk(name, data)
+    assert joined.getvalue() == expected.getvalue()
+
+
+def test_write_to_compressed_file(tmpdir):
+    project = Project()
+    project.new_module(m.Sampler) >> project.output
+    path = str(tmpdir / "compressed.sunvox.gz")
+    with gzip.open(path, "wb") as f:
+        project.write_to(f)
+    with gzip.open(path, "rb") as f:
+        assert f.read() == bytes(project.read())
+
+
+def test_summarize_file_recurses_into_embedded_projects(capsys):
+    project = Project()
+    sampler = project.new_module(m.Sampler)
+    sampler.effect = Synth(m.Distortion())
+    meta = project.new_module(m.MetaModule)
+    meta.project.new_module(m.Amplifier)
+    summarize_file(project.read(), largest=2)
+    out = capsys.readouterr().out
+    assert "Sampler[1] 'Sampler': SSYN" in out
+    assert "MetaModule[2] 'MetaModule': SVOX" in out
+    assert "  3 modules (0 empty slots)" in out
+    assert out.count("CHDT ") == 3
+
+
+def test_dump_file_filters_tags_and_bytes(capsys):
+    project = Project()
+    project.new_module(m.VorbisPlayer, data=b"x" * 100)
+    dump_file(project.read(), tags={b"CHDT"}, max_bytes=16)
+    out = capsys.readouterr().out
+    assert out.startswith("CHDT  00000000: 78 78")
+    assert "... 84 more bytes" in out
+    assert "SVOX" not in out
@@ -0,0 +1,93 @@
+import copy
+import pickle
+
+import pytest
+
+from rv.api import Pattern
+from rv.note import NOTECMD, Note, NoteView
+
+
+def test_pattern_data_is_stored_as_pdta():
+    pattern = Pattern(tracks=2, lines=3)
+    pattern.data[1][1] = Note(note=NOTECMD.C5, vel=10, module=3, ctl=0x0102, val=7)
+    raw = bytes(pattern.raw_data)
+    assert len(raw) == 2 * 3 * 8
+    assert raw[24:32] == bytes([NOTECMD.C5, 10, 3, 0, 2, 1, 7, 0])
+    assert not raw[:24].strip(b"\0") and not raw[32:].strip(b"\0")
+
+
+def test_note_views_read_and_write_the_pattern():
+    pattern = Pattern(tracks=2, lines=3)
+    note = pattern.data[2][-1]
+    assert isinstance(note, NoteView)
+    note.note = NOTECMD.D4
+    note.val = 0x1234
+    assert pattern.data[2][1].note == NOTECMD.D4
+    assert pattern.data[2][1].val == 0x1234
+    assert pattern.data[-1][1] == Note(note=NOTECMD.D4, val=0x1234, pattern=pattern)
+    assert bytes(pattern.raw_data[-8:]) == note.raw_data
+
+
+def test_note_views_validate_values():
+    pattern = Pattern(tracks=1, lines=1)
+    note = pattern.data[0][0]
+    with pytest.raises(ValueError):
+        note.vel = 200
+    with pytest.raises(ValueError):
+        note.note = 121
+    assert note.is_empty()
+
+
+def test_pattern_data_indexing():
+    pattern = Pattern(tracks=3, lines=4)
+    assert len(pattern.data) == 4
+    assert len(pattern.data[0]) == 3
+    assert len(list(pattern.data)) == 4
+    assert len(pattern.data[1:3]) == 2
+    with pytest.raises(IndexError):
+        pattern.data[4]
+    with pytest.raises(IndexError):
+        pattern.data[0][3]
+
+
+def test_clones_and_copies_are_standalone():
+    pattern = Pattern(tracks=1, lines=1)
+    view = pattern.data[0][0]
+    view.vel = 5
+    for note in [view.clone(), copy.copy(view), pickle.loads(pickle.dumps(view))]:
+        assert type(note) is Note
+        note.vel = 6
+        assert view.vel == 5
+
+
+def test_raw_data_round_trip():
+    pattern = Pattern(tracks=2, lines=2)
+    raw = bytes(range(32))
+    pattern.raw_data = raw
+    assert pattern.raw_data == raw
+    other = Pattern(tracks=2, lines=2)
+    other.raw_data = pattern.raw_data
+    assert other.raw_data == raw
+
+
+def test_raw_data_is_a_copy():
+    pattern = Pattern(tracks=1, lines=1)
+    raw = pattern.raw_data
+    assert {raw: pattern}[bytes(8)] is pattern
+    pattern.data[0][0] = Note(note=NOTECMD.C5)
+    assert raw == bytes(8)
+    assert pattern.raw_data != raw
+
+
+def test_set_via_fn_keeps_data_on_error():
+    pattern = Pattern(tracks=1, lines=2)
+    pattern.data[0][0] = Note(note=NOTECMD.C5)
+
+    def fn(pattern, line, track):
+        if line == 1:
+            raise RuntimeError
+        return Note(note=NOTECMD.D5)
+
+    with pytest.raises(RuntimeError):
+        pattern.set_via_fn(fn)
+    assert pattern.data[0][0].note == NOTECMD.C5
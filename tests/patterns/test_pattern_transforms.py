@@ -0,0 +1,116 @@
+import pytest
+
+from rv.api import Pattern
+from rv.note import NOTECMD, Note
+
+
+def column(pattern, name):
+    return [[getattr(note, name) for note in line] for line in pattern.data]
+
+
+@pytest.fixture(params=[False, True], ids=["dense", "sparse"])
+def sparse(request):
+    return request.param
+
+
+@pytest.fixture
+def pattern(sparse):
+    pattern = Pattern(tracks=2, lines=4)
+    pattern.data[0][0] = Note(note=NOTECMD.C5, vel=65, module=2, ctl=0x0307, val=9)
+    pattern.data[1][1] = Note(note=NOTECMD.B9, vel=129, module=3)
+    pattern.data[2][0] = Note(note=NOTECMD.NOTE_OFF, module=2)
+    pattern.data[3][1] = Note(note=NOTECMD.c0, vel=1, module=4, ctl=0x0007)
+    return pattern.to_sparse() if sparse else pattern
+
+
+def test_transpose(pattern):
+    assert pattern.transpose(2) is pattern
+    assert column(pattern, "note") == [
+        [NOTECMD.D5, NOTECMD.EMPTY],
+        [NOTECMD.EMPTY, NOTECMD.B9],
+        [NOTECMD.NOTE_OFF, NOTECMD.EMPTY],
+        [NOTECMD.EMPTY, NOTECMD.d0],
+    ]
+    pattern.transpose(-5)
+    assert pattern.data[3][1].note == NOTECMD.C0
+
+
+def test_scale_velocity(pattern):
+    pattern.scale_velocity(0.5)
+    assert column(pattern, "vel") == [[33, 0], [0, 65], [0, 0], [0, 1]]
+    pattern.scale_velocity(4, minimum=10, maximum=100)
+    assert column(pattern, "vel") == [[100, 0], [0, 100], [0, 0], [0, 10]]
+
+
+def test_remap_modules(pattern):
+    pattern.remap_modules({2: 5, 4: 0})
+    assert column(pattern, "module") == [[5, 0], [0, 3], [5, 0], [0, 0]]
+
+
+def test_remap_effects_and_controllers(pattern):
+    pattern.remap_effects({7: 0x13}).remap_controllers({3: 4})
+    assert column(pattern, "ctl") == [[0x0413, 0], [0, 0], [0, 0], [0, 0x0013]]
+    assert pattern.data[0][0].val == 9
+
+
+def test_shift_lines(pattern):
+    raw = bytes(pattern.raw_data)
+    stride = 2 * 8
+    pattern.shift_lines(1)
+    assert pattern.raw_data == bytes(stride) + raw[:-stride]
+    pattern.shift_lines(-2)
+    assert pattern.raw_data == raw[stride : stride * 3] + bytes(stride * 2)
+    pattern.shift_lines(10)
+    assert pattern.raw_data == bytes(len(raw))
+
+
+def test_rotate_lines(pattern):
+    raw = bytes(pattern.raw_data)
+    stride = 2 * 8
+    pattern.shift_lines(1, rotate=True)
+    assert pattern.raw_data == raw[-stride:] + raw[:-stride]
+    pattern.shift_lines(-5, rotate=True)
+    assert pattern.raw_data == raw
+
+
+def test_mask_tracks(pattern):
+    pattern.mask_tracks([1])
+    assert column(pattern, "note")[0] == [NOTECMD.EMPTY, NOTECMD.EMPTY]
+    assert pattern.data[1][1].note == NOTECMD.B9
+    assert all(note.is_empty() and note.module == 0 for note in pattern.data[2])
+
+
+def test_mask_tracks_after_changing_lines(pattern):
+    for lines in (2, 8, 4):
+        pattern.lines = lines
+        pattern.mask_tracks([1])
+    assert column(pattern, "note")[:2] == [
+        [NOTECMD.EMPTY, NOTECMD.EMPTY],
+        [NOTECMD.EMPTY, NOTECMD.B9],
+    ]
+
+
+def test_quantize(pattern):
+    pattern.quantize(2)
+    assert column(pattern, "note") == [
+        [NOTECMD.C5, NOTECMD.EMPTY],
+        [NOTECMD.EMPTY, NOTECMD.EMPTY],
+        [NOTECMD.NOTE_OFF, NOTECMD.B9],
+        [NOTECMD.EMPTY, NOTECMD.EMPTY],
+    ]
+
+
+def test_quantize_keeps_notes_on_the_grid(sparse):
+    pattern = Pattern(tracks=1, lines=4)
+    if sparse:
+        pattern.to_sparse()
+    pattern.data[0][0] = Note(note=NOTECMD.C5)
+    pattern.data[1][0] = Note(note=NOTECMD.D5)
+    pattern.data[3][0] = Note(note=NOTECMD.E5)
+    pattern.quantize(4)
+    assert column(pattern, "note") == [
+        [NOTECMD.C5],
+        [NOTECMD.EMPTY],
+        [NOTECMD.EMPTY],
+        [NOTECMD.EMPTY],
+    ]
@@ -0,0 +1,61 @@
+import pytest
+
+from rv.api import Pattern
+from rv.note import NOTECMD, Note
+
+
+def test_set_via_gen_changes_only_yielded_notes():
+    pattern = Pattern(tracks=2, lines=4)
+    pattern.data[0][0] = Note(note=NOTECMD.C5, vel=10)
+    view = pattern.data[3][1]
+
+    def gen(pattern, new):
+        yield 3, 1, Note(note=NOTECMD.D5)
+        assert pattern.data[3][1].note == NOTECMD.EMPTY
+        assert new[3][1].note == NOTECMD.D5
+        yield 1, 0, new[0][0]
+
+    pattern.set_via_gen(gen)
+    assert view.note == NOTECMD.D5
+    assert pattern.data[1][0].clone() == Note(note=NOTECMD.C5, vel=10)
+    assert pattern.data[0][0].note == NOTECMD.C5
+
+
+def test_set_via_gen_commits_changes_to_new_notes():
+    pattern = Pattern(tracks=1, lines=2)
+
+    def gen(pattern, new):
+        new[1][0].vel = 20
+        yield 0, 0, Note(note=NOTECMD.E5)
+
+    pattern.set_via_gen(gen)
+    assert pattern.data[0][0].note == NOTECMD.E5
+    assert pattern.data[1][0].vel == 20
+
+
+def test_set_via_gen_keeps_data_on_error():
+    pattern = Pattern(tracks=1, lines=2)
+    raw = bytes(pattern.raw_data)
+
+    def gen(pattern, new):
+        yield 0, 0, Note(note=NOTECMD.E5)
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        pattern.set_via_gen(gen)
+    assert pattern.raw_data == raw
+
+
+def test_set_via_fn_reads_original_notes():
+    pattern = Pattern(tracks=1, lines=3)
+    pattern.data[0][0] = Note(note=NOTECMD.C5)
+
+    def fn(pattern, line, track):
+        return pattern.data[line - 1][track].clone()
+
+    pattern.set_via_fn(fn)
+    assert [line[0].note for line in pattern.data] == [
+        NOTECMD.EMPTY,
+        NOTECMD.C5,
+        NOTECMD.EMPTY,
+    ]
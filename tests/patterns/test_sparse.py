@@ -0,0 +1,99 @@
+import pickle
+
+from rv.api import Pattern, Project, read_sunvox_file
+from rv.note import NOTECMD, Note, SparseNoteView
+
+
+def make_sparse_pattern():
+    pattern = Pattern(tracks=16, lines=2**19).to_sparse()
+    pattern.data[0][3] = Note(note=NOTECMD.C5, vel=10)
+    pattern.data[1000][15] = Note(note=NOTECMD.D5, module=2)
+    pattern.data[2**19 - 1][0] = Note(note=NOTECMD.NOTE_OFF)
+    return pattern
+
+
+def test_sparse_pattern_stores_only_notes_set():
+    pattern = make_sparse_pattern()
+    assert pattern.sparse
+    assert len(pattern._sparse) == 3
+    assert len(pattern._sparse.cells) == 3 * 8
+    assert "_notes" not in vars(pattern)
+    note = pattern.data[5][5]
+    assert isinstance(note, SparseNoteView)
+    assert note.is_empty()
+    assert len(pattern._sparse) == 3
+
+
+def test_sparse_note_views_write_through():
+    pattern = make_sparse_pattern()
+    note = pattern.data[7][2]
+    other = pattern.data[7][2]
+    note.vel = 20
+    assert other.vel == 20
+    assert len(pattern._sparse) == 4
+    pattern.data[7][2] = Note()
+    assert other.vel == 0
+    assert len(pattern._sparse) == 3
+
+
+def test_iter_notes_visits_line_range():
+    pattern = make_sparse_pattern()
+    notes = [(line, track, note.note) for line, track, note in pattern.iter_notes()]
+    assert notes == [
+        (0, 3, NOTECMD.C5),
+        (1000, 15, NOTECMD.D5),
+        (2**19 - 1, 0, NOTECMD.NOTE_OFF),
+    ]
+    assert [line for line, _, _ in pattern.iter_notes(1, 1001)] == [1000]
+    assert list(pattern.iter_notes(1, 1000)) == []
+
+
+def test_iter_notes_of_dense_pattern():
+    pattern = make_sparse_pattern()
+    dense = Pattern(tracks=16, lines=2048)
+    dense.raw_data = bytes(pattern.raw_data)[: 2048 * 16 * 8]
+    assert [(line, track) for line, track, _ in dense.iter_notes()] == [
+        (0, 3),
+        (1000, 15),
+    ]
+
+
+def test_raw_data_expands_sparse_notes():
+    pattern = make_sparse_pattern()
+    raw = pattern.raw_data
+    assert len(raw) == 2**19 * 16 * 8
+    assert raw[3 * 8] == NOTECMD.C5
+    assert raw[(1000 * 16 + 15) * 8 + 2] == 2
+    dense = Pattern(tracks=16, lines=2**19)
+    dense.raw_data = raw
+    assert dense.to_sparse()._sparse.indexes == pattern._sparse.indexes
+    assert bytes(pattern.to_dense().raw_data) == bytes(raw)
+    assert not pattern.sparse
+
+
+def test_sparse_pattern_round_trips():
+    project = Project()
+    project.attach_pattern(make_sparse_pattern())
+    loaded = read_sunvox_file(project.read())
+    assert loaded.patterns[0].raw_data == project.patterns[0].raw_data
+    copy = pickle.loads(pickle.dumps(project.patterns[0]))
+    assert copy.sparse
+    assert copy._sparse.indexes == project.patterns[0]._sparse.indexes
+
+
+def test_set_via_fn_and_gen_on_sparse_pattern():
+    pattern = Pattern(tracks=2, lines=4).to_sparse()
+
+    def fn(pattern, line, track):
+        return Note(note=NOTECMD.C5) if line == track else Note()
+
+    pattern.set_via_fn(fn)
+    assert pattern._sparse.indexes == [0, 3]
+
+    def gen(pattern, new):
+        yield 1, 1, Note()
+        yield 2, 0, new[0][0]
+
+    pattern.set_via_gen(gen)
+    assert pattern._sparse.indexes == [0, 4]
+    assert pattern.data[2][0].note == NOTECMD.C5
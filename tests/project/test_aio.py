@@ -0,0 +1,104 @@
+import asyncio
+import os
+
+import pytest
+
+import rv.aio
+from rv.api import m, Pattern, PatternClone, Project, Synth, read_sunvox_file
+
+
+class MemoryWriter:
+    """Minimal stand-in for asyncio.StreamWriter, recording drains."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+        await asyncio.sleep(0)
+
+
+def stream_of(data, loop_size=1000):
+    stream = asyncio.StreamReader()
+    for i in range(0, len(data), loop_size):
+        stream.feed_data(bytes(data[i : i + loop_size]))
+    stream.feed_eof()
+    return stream
+
+
+def test_async_read():
+    project = Project()
+    sampler = project.new_module(m.Sampler)
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(200000)
+    sampler.samples[0] = sample
+    meta = project.new_module(m.MetaModule)
+    meta.project.new_module(m.Amplifier)
+    sampler >> meta >> project.output
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=8))
+    data = project.read()
+
+    async def main():
+        return await rv.aio.read_sunvox_file(stream_of(data))
+
+    loaded = asyncio.run(main())
+    assert isinstance(loaded.modules[2], m.MetaModule)
+    assert isinstance(loaded.patterns[2], PatternClone)
+    assert loaded.read() == data
+
+
+def test_async_read_options_and_synth():
+    project = Project()
+    sampler = project.new_module(m.Sampler)
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(200000)
+    sampler.samples[0] = sample
+    meta = project.new_module(m.MetaModule)
+    meta.project.new_module(m.Amplifier)
+    sampler >> meta >> project.output
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=8))
+    data = project.read()
+    synth_data = Synth(m.Amplifier(name="amp")).read()
+
+    async def main():
+        lazy = await rv.aio.read_sunvox_file(stream_of(data), lazy=True)
+        filtered = await rv.aio.read_sunvox_file(stream_of(data), exclude=["patterns"])
+        synth = await rv.aio.read_sunvox_file(stream_of(synth_data))
+        return lazy, filtered, synth
+
+    lazy, filtered, synth = asyncio.run(main())
+    assert not lazy.modules.is_loaded(1)
+    assert lazy.read() == data
+    assert filtered.patterns == []
+    assert synth.module.name == "amp"
+
+
+def test_async_read_rejects_other_data():
+    async def main():
+        await rv.aio.read_sunvox_file(stream_of(b"RIFF\0\0\0\0"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_async_write():
+    project = Project()
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(200000)
+    project.new_module(m.Sampler).samples[0] = sample
+    writer = MemoryWriter()
+    asyncio.run(project.write_to_async(writer))
+    assert writer.data == project.read()
+    assert read_sunvox_file(writer.data).read() == project.read()
+    writer = MemoryWriter()
+    asyncio.run(rv.aio.write_chunks(writer, project.chunks(), drain_size=1024))
+    assert writer.data == project.read()
+    assert writer.drains > 2
@@ -0,0 +1,115 @@
+from rv.api import Project, m, read_sunvox_file
+from rv.lazy import LazyBlock, raw_items
+
+
+def test_connect_and_disconnect():
+    project = Project()
+    gen1 = project.new_module(m.Generator)
+    gen2 = project.new_module(m.Generator)
+    amp = project.new_module(m.Amplifier)
+    echo = project.new_module(m.Echo)
+    gen2 >> amp
+    gen1 >> amp
+    amp >> echo >> project.output
+    graph = project.connection_graph
+    assert amp.incoming_links == [2, 1]
+    assert amp.incoming_links is project.module_connections[amp.index]
+    assert graph.has_connection(gen1.index, amp.index)
+    assert not graph.has_connection(amp.index, gen1.index)
+    assert graph.connected(amp.index, gen1.index)
+    assert graph.outgoing(amp.index) == (echo.index,)
+    project.connect(amp, gen1)
+    assert gen1.incoming_links == []
+    gen1 >> echo
+    assert graph.outgoing(gen1.index) == (amp.index, echo.index)
+    assert echo.incoming_links == [3, 1]
+    project.disconnect(echo, gen1)
+    assert graph.outgoing(gen1.index) == (amp.index,)
+    assert echo.incoming_links == [3]
+
+
+def test_detach_module_removes_connections():
+    project = Project()
+    gen1 = project.new_module(m.Generator)
+    gen2 = project.new_module(m.Generator)
+    amp = project.new_module(m.Amplifier)
+    echo = project.new_module(m.Echo)
+    gen2 >> amp
+    gen1 >> amp
+    amp >> echo >> project.output
+    gen1 >> echo
+    project.detach_module(amp)
+    graph = project.connection_graph
+    assert amp.incoming_links == []
+    assert graph.outgoing(gen1.index) == (echo.index,)
+    assert graph.outgoing(gen2.index) == ()
+    assert echo.incoming_links == [1]
+    assert project.module_connections[echo.index] == [1]
+    assert not graph.connected(gen2.index, 3)
+    other = project.attach_module(m.Filter())
+    assert other.index == 3
+    assert graph.outgoing(3) == ()
+    gen2 >> other
+    assert graph.outgoing(gen2.index) == (3,)
+
+
+def test_slnk_order_is_kept():
+    project = Project()
+    gen1 = project.new_module(m.Generator)
+    gen2 = project.new_module(m.Generator)
+    amp = project.new_module(m.Amplifier)
+    echo = project.new_module(m.Echo)
+    gen2 >> amp
+    gen1 >> amp
+    amp >> echo >> project.output
+    loaded = read_sunvox_file(project.read())
+    assert loaded.module_connections[amp.index] == [2, 1]
+    loaded.disconnect(loaded.modules[2], loaded.modules[3])
+    loaded.connect(loaded.modules[2], loaded.modules[3])
+    assert loaded.modules[3].incoming_links == [1, 2]
+    again = read_sunvox_file(loaded.read())
+    assert again.module_connections[amp.index] == [1, 2]
+
+
+def test_graph_follows_attached_incoming_links():
+    project = Project()
+    amp = m.Amplifier()
+    project.attach_module(m.Generator())
+    graph = project.connection_graph
+    amp.incoming_links = [1]
+    project.attach_module(amp)
+    assert graph.outgoing(1) == (amp.index,)
+    project.module_connections[0].append(amp.index)
+    project.invalidate_connections()
+    assert project.connection_graph.outgoing(amp.index) == (0,)
+
+
+def test_multictl_does_not_add_connection_entries():
+    project = Project()
+    amp = project.new_module(m.Amplifier)
+    mc = project.new_module(m.MultiCtl)
+    mc >> amp
+    mc.mappings.values[0].controller = amp.controllers["volume"].number
+    mc.value = 16384
+    assert amp.volume == 512
+    assert sorted(project.module_connections) == [0, 1, 2]
+
+
+def test_detach_from_lazy_project_keeps_modules_lazy():
+    project = Project()
+    gen1 = project.new_module(m.Generator)
+    gen2 = project.new_module(m.Generator)
+    amp = project.new_module(m.Amplifier)
+    echo = project.new_module(m.Echo)
+    gen2 >> amp
+    gen1 >> amp
+    amp >> echo >> project.output
+    loaded = read_sunvox_file(project.read(), lazy=True)
+    loaded.detach_module(loaded.modules[3])
+    assert all(
+        isinstance(item, LazyBlock) for item in list(raw_items(loaded.modules))[1:3]
+    )
+    assert loaded.module_connections[4] == []
+    expected = read_sunvox_file(project.read())
+    expected.detach_module(expected.modules[3])
+    assert loaded.read() == expected.read()
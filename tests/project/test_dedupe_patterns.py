@@ -0,0 +1,67 @@
+from rv.api import Pattern, Project, read_sunvox_file
+from rv.note import NOTECMD, Note
+from rv.pattern import PatternClone, PatternFlags
+
+
+def make_pattern(note=NOTECMD.C5, x=0, **kw):
+    pattern = Pattern(tracks=2, lines=8, x=x, **kw)
+    pattern.data[1][0] = Note(note=note, vel=10, module=2)
+    return pattern
+
+
+def test_duplicate_patterns_become_clones():
+    project = Project()
+    for pattern in [
+        make_pattern(x=0),
+        make_pattern(NOTECMD.D5, x=8),
+        make_pattern(x=16, y=40, flags=PatternFlags.mute),
+        None,
+        make_pattern(NOTECMD.D5, x=24),
+    ]:
+        project.attach_pattern(pattern)
+    duplicate = project.patterns[2]
+    assert project.dedupe_patterns() == 2
+    assert isinstance(project.patterns[0], Pattern)
+    assert isinstance(project.patterns[1], Pattern)
+    assert project.patterns[3] is None
+    clone = project.patterns[2]
+    assert isinstance(clone, PatternClone)
+    assert (clone.source, clone.x, clone.y) == (0, 16, 40)
+    assert clone.flags == PatternFlags.clone | PatternFlags.mute
+    assert clone.project is project
+    assert duplicate.project is None
+    assert project.patterns[4].source == 1
+
+
+def test_different_dimensions_or_appearance_are_kept():
+    project = Project()
+    project += [
+        make_pattern(),
+        Pattern(tracks=2, lines=16),
+        Pattern(tracks=4, lines=4),
+        make_pattern(name="other"),
+        make_pattern(bg_color=(1, 2, 3)),
+    ]
+    project.patterns[1].raw_data = project.patterns[0].raw_data
+    project.patterns[2].raw_data = project.patterns[0].raw_data
+    assert project.dedupe_patterns() == 0
+
+
+def test_clones_of_duplicates_point_at_source():
+    project = Project()
+    project += [make_pattern(), make_pattern(), PatternClone(source=1, x=32)]
+    assert project.dedupe_patterns() == 1
+    assert project.patterns[2].source == 0
+
+
+def test_deduped_project_round_trips_and_is_smaller():
+    project = Project()
+    project += [make_pattern(x=8 * i) for i in range(10)]
+    size = project.serialized_size()
+    project.dedupe_patterns()
+    assert project.serialized_size() < size
+    loaded = read_sunvox_file(project.read())
+    assert isinstance(loaded.patterns[0], Pattern)
+    assert all(isinstance(p, PatternClone) for p in loaded.patterns[1:])
+    assert [p.x for p in loaded.patterns] == [8 * i for i in range(10)]
+    assert loaded.patterns[0].raw_data == project.patterns[0].raw_data
@@ -0,0 +1,54 @@
+import pytest
+
+from rv.api import Pattern, Project
+from rv.note import NOTECMD, Note
+from rv.pattern import PatternClone
+from rv.timeline import NoteEvent
+
+
+EXPECTED = [
+    NoteEvent(0, 0, 1, NOTECMD.C5, 10, 2, 0, 0),
+    NoteEvent(6, 0, 0, NOTECMD.NOTE_OFF, 0, 0, 0, 0),
+    NoteEvent(6, 1, 0, NOTECMD.D5, 0, 0, 0x0102, 3),
+    NoteEvent(6, 2, 1, NOTECMD.C5, 10, 2, 0, 0),
+    NoteEvent(12, 2, 0, NOTECMD.NOTE_OFF, 0, 0, 0, 0),
+]
+
+
+def test_iter_events():
+    project = Project()
+    first = Pattern(tracks=2, lines=8, x=0, y=0)
+    first.data[0][1] = Note(note=NOTECMD.C5, vel=10, module=2)
+    first.data[6][0] = Note(note=NOTECMD.NOTE_OFF)
+    second = Pattern(tracks=1, lines=4, x=4, y=32).to_sparse()
+    second.data[2][0] = Note(note=NOTECMD.D5, ctl=0x0102, val=3)
+    project.attach_pattern(first)
+    project.attach_pattern(second)
+    project.attach_pattern(PatternClone(source=0, x=6, y=64))
+    assert list(project.iter_events()) == EXPECTED
+    assert list(project.iter_events(6, 7)) == EXPECTED[1:4]
+    assert list(project.iter_events(7, 12)) == []
+    assert list(Project().iter_events()) == []
+
+
+def test_iter_event_blocks():
+    np = pytest.importorskip("numpy")
+    project = Project()
+    first = Pattern(tracks=2, lines=8, x=0, y=0)
+    first.data[0][1] = Note(note=NOTECMD.C5, vel=10, module=2)
+    first.data[6][0] = Note(note=NOTECMD.NOTE_OFF)
+    second = Pattern(tracks=1, lines=4, x=4, y=32).to_sparse()
+    second.data[2][0] = Note(note=NOTECMD.D5, ctl=0x0102, val=3)
+    project.attach_pattern(first)
+    project.attach_pattern(second)
+    project.attach_pattern(PatternClone(source=0, x=6, y=64))
+    blocks = list(project.iter_event_blocks(block_lines=5))
+    assert [(b.start, b.stop) for b in blocks] == [(0, 5), (5, 10), (10, 14)]
+    events = []
+    for block in blocks:
+        assert block.line.dtype == np.int64
+        columns = zip(*(block[i].tolist() for i in range(2, 10)))
+        events.extend(NoteEvent(*column) for column in columns)
+    assert events == EXPECTED
+    empty = list(project.iter_event_blocks(7, 12))
+    assert len(empty) == 1 and len(empty[0].note) == 0
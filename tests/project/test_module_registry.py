@@ -0,0 +1,177 @@
+from io import BytesIO
+
+import pytest
+
+from rv.api import Project, m, read_sunvox_file
+from rv.errors import ModuleOwnershipError
+
+
+def test_module_index_after_detach_and_attach():
+    project = Project()
+    amp = project.new_module(m.Amplifier, name="Lead amp")
+    gen = project.new_module(m.Generator, name="Lead")
+    echo = project.new_module(m.Echo)
+    assert [project.module_index(x) for x in (amp, gen, echo)] == [1, 2, 3]
+    project.detach_module(gen)
+    assert project.module_index(None) == 2
+    with pytest.raises(ValueError):
+        project.module_index(gen)
+    reverb = project.attach_module(m.Reverb())
+    assert reverb.index == 2
+    assert project.modules[2] is reverb
+    with pytest.raises(ValueError):
+        project.module_index(None)
+    assert project.attach_module(m.Filter()).index == 4
+
+
+def test_module_index_of_foreign_module():
+    project = Project()
+    amp = project.new_module(m.Amplifier, name="Lead amp")
+    project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    other = Project()
+    other_amp = other.new_module(m.Amplifier)
+    with pytest.raises(ValueError):
+        project.module_index(other_amp)
+    with pytest.raises(ModuleOwnershipError):
+        project.connect(other_amp, amp)
+
+
+def test_empty_slots_fill_lowest_first():
+    project = Project()
+    amp = project.new_module(m.Amplifier, name="Lead amp")
+    project.new_module(m.Generator, name="Lead")
+    echo = project.new_module(m.Echo)
+    project.detach_module(echo)
+    project.detach_module(amp)
+    project.attach_module(None)
+    first, second, third, fourth = [m.Amplifier() for _ in range(4)]
+    for module in (first, second, third, fourth):
+        project.attach_module(module)
+    assert [x.index for x in (first, second, third, fourth)] == [1, 3, 4, 5]
+
+
+def test_attach_modules_matches_attach_module():
+    def build(bulk):
+        project = Project()
+        amp = project.new_module(m.Amplifier, name="Lead amp")
+        project.new_module(m.Generator, name="Lead")
+        echo = project.new_module(m.Echo)
+        project.detach_module(amp)
+        project.detach_module(echo)
+        modules = [m.Reverb(), None, m.Filter(), m.Flanger(), None, m.Sampler()]
+        if bulk:
+            attached = project.attach_modules(modules)
+            assert attached == modules
+        else:
+            for module in modules:
+                project.attach_module(module)
+        return project
+
+    expected = build(False)
+    project = build(True)
+    assert [type(x) for x in project.modules] == [type(x) for x in expected.modules]
+    for index, module in enumerate(project.modules):
+        if module is not None:
+            assert module.index == index
+            assert module.parent is project
+    assert project.attach_module(m.Lfo()).index == expected.attach_module(m.Lfo()).index
+
+
+def test_attach_modules_attaches_nothing_on_error():
+    project = Project()
+    amp = project.new_module(m.Amplifier, name="Lead amp")
+    project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    reverb = m.Reverb()
+    with pytest.raises(ModuleOwnershipError):
+        project.attach_modules([reverb, amp])
+    with pytest.raises(ModuleOwnershipError):
+        project.attach_modules([reverb, reverb])
+    assert reverb.parent is None
+    assert len(project.modules) == 4
+
+
+def test_find_modules():
+    project = Project()
+    amp = project.new_module(m.Amplifier, name="Lead amp")
+    gen = project.new_module(m.Generator, name="Lead")
+    echo = project.new_module(m.Echo)
+    amp2 = project.new_module(m.Amplifier)
+    assert project.find_modules(mtype="Amplifier") == [amp, amp2]
+    assert project.find_modules(mtype=m.Amplifier) == [amp, amp2]
+    assert project.find_modules(name="Lead") == [gen]
+    assert project.find_modules(name="Lead amp", mtype=m.Amplifier) == [amp]
+    assert project.find_modules(name="Lead", mtype=m.Amplifier) == []
+    assert project.find_modules() == [project.output, amp, gen, echo, amp2]
+    project.detach_module(amp)
+    assert project.find_modules(mtype=m.Amplifier) == [amp2]
+    assert project.find_modules(name="Lead amp") == []
+
+
+def test_find_modules_after_rename():
+    project = Project()
+    project.new_module(m.Amplifier, name="Lead amp")
+    gen = project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    gen.name = "Bass"
+    assert project.find_modules(name="Lead") == []
+    assert project.find_modules(name="Bass") == [gen]
+    detached = project.detach_module(gen)
+    detached.name = "Lead"
+    assert project.find_modules(name="Lead") == []
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_registry_of_read_project(lazy):
+    project = Project()
+    project.new_module(m.Amplifier, name="Lead amp")
+    gen = project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    project.detach_module(gen)
+    f = BytesIO()
+    project.write_to(f)
+    loaded = read_sunvox_file(BytesIO(f.getvalue()), lazy=lazy)
+    amps = loaded.find_modules(mtype=m.Amplifier)
+    assert [(x.index, x.name) for x in amps] == [(1, "Lead amp")]
+    echo = loaded.find_modules(mtype="Echo")[0]
+    assert loaded.module_index(echo) == echo.index
+    filter = loaded.attach_module(m.Filter())
+    assert loaded.modules[filter.index] is filter
+    assert loaded.find_modules(mtype=m.Filter) == [filter]
+
+
+def test_slots_replaced_directly():
+    project = Project()
+    project.new_module(m.Amplifier, name="Lead amp")
+    project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    project.modules[1] = None
+    assert project.find_modules(mtype=m.Amplifier) == []
+    assert project.new_module(m.Reverb).index == 1
+    other = m.Generator(name="Pad")
+    project.modules[2] = other
+    assert project.find_modules(name="Lead") == []
+    assert project.find_modules(mtype=m.Generator) == [other]
+    project.modules[3] = None
+    assert project.module_index(None) == 3
+
+
+def test_list_changes_drop_registry():
+    project = Project()
+    project.new_module(m.Amplifier, name="Lead amp")
+    gen = project.new_module(m.Generator, name="Lead")
+    project.new_module(m.Echo)
+    registry = project.modules.registry
+    project.attach_module(m.Reverb())
+    project.detach_module(gen)
+    assert project.modules.registry is registry
+    del project.modules[4]
+    assert project.find_modules(mtype=m.Reverb) == []
+    project.modules.append(None)
+    assert project.module_index(None) == 2
+    project.modules[-1] = m.Filter()
+    assert project.find_modules(mtype=m.Filter) == [project.modules[4]]
+    project.modules = [project.output, None]
+    assert project.find_modules() == [project.output]
+    assert project.attach_module(m.Lfo()).index == 1
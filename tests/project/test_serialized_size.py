@@ -0,0 +1,49 @@
+from io import BytesIO
+
+from rv.api import m, Pattern, Project, read_sunvox_file, Synth
+
+
+def nested_project(depth):
+    project = Project()
+    project.attach_pattern(Pattern(tracks=2, lines=4))
+    amp = project.new_module(m.Amplifier)
+    amp >> project.output
+    if depth > 0:
+        meta = project.new_module(m.MetaModule, project=nested_project(depth - 1))
+        meta >> amp
+    return project
+
+
+def test_serialized_size_matches_output():
+    project = nested_project(3)
+    f = BytesIO()
+    project.write_to(f)
+    written = f.getvalue()
+    assert project.serialized_size() == len(written)
+    assert project.read() == written
+    synth = Synth(project.modules[2])
+    assert synth.serialized_size() == len(synth.read())
+
+
+def test_nested_projects_round_trip():
+    data = nested_project(2).read()
+    loaded = read_sunvox_file(data)
+    inner = loaded.modules[2].project.modules[2].project
+    assert isinstance(inner.modules[1], m.Amplifier)
+    assert loaded.read() == data
+
+
+def test_sampler_effect_round_trip():
+    project = Project()
+    sampler = project.new_module(m.Sampler)
+    sampler.effect = Synth(m.Distortion())
+    loaded = read_sunvox_file(project.read())
+    effect = loaded.modules[1].effect
+    assert isinstance(effect, Synth)
+    assert isinstance(effect.module, m.Distortion)
+
+
+def test_read_returns_bytes():
+    data = nested_project(1).read()
+    assert type(data) is bytes
+    assert hash(data) == hash(read_sunvox_file(data).read())
@@ -0,0 +1,82 @@
+import pytest
+
+from rv.api import Pattern, Project
+from rv.note import Note
+from rv.pattern import PatternClone
+from rv.tempo import TempoMap
+
+
+def test_tempo_map_follows_speed_effects():
+    project = Project()
+    project.initial_bpm = 125
+    project.initial_tpl = 6
+    pattern = Pattern(tracks=2, lines=32)
+    pattern.data[8][1] = Note(ctl=0x000F, val=250)
+    pattern.data[16][0] = Note(ctl=0x010F, val=3)
+    project.attach_pattern(pattern)
+    tempo = project.tempo_map()
+    assert tempo.lines == [0, 8, 16]
+    assert tempo.bpms == [125, 250, 250]
+    assert tempo.tpls == [6, 6, 3]
+    assert tempo.bpm_at(7) == 125 and tempo.bpm_at(8) == 250
+    assert tempo.tpl_at(16) == 3
+    assert tempo.seconds(8) == pytest.approx(0.96)
+    assert tempo.seconds(12) == pytest.approx(1.2)
+    assert tempo.length_seconds == pytest.approx(1.92)
+    assert tempo.length_frames(44100) == round(1.92 * 44100)
+    assert tempo.ticks(20) == 8 * 6 + 8 * 6 + 4 * 3
+
+
+def test_tempo_map_inverse_conversions():
+    project = Project()
+    project.initial_bpm = 125
+    project.initial_tpl = 6
+    pattern = Pattern(tracks=2, lines=32)
+    pattern.data[8][1] = Note(ctl=0x000F, val=250)
+    pattern.data[16][0] = Note(ctl=0x010F, val=3)
+    project.attach_pattern(pattern)
+    tempo = project.tempo_map()
+    assert tempo.line_at(1.2) == pytest.approx(12)
+    assert tempo.line_at_tick(108) == pytest.approx(20)
+    assert tempo.line_at_frame(tempo.frames(24, 48000), 48000) == pytest.approx(24)
+    assert tempo.seconds([0, 8, 16]) == pytest.approx([0, 0.96, 1.44])
+    assert tempo.frames([8, 16], 100) == [96, 144]
+
+
+def test_tempo_map_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    project = Project()
+    project.initial_bpm = 125
+    project.initial_tpl = 6
+    pattern = Pattern(tracks=2, lines=32)
+    pattern.data[8][1] = Note(ctl=0x000F, val=250)
+    pattern.data[16][0] = Note(ctl=0x010F, val=3)
+    project.attach_pattern(pattern)
+    tempo = project.tempo_map()
+    lines = np.arange(0, 33, 4)
+    seconds = tempo.seconds(lines)
+    assert isinstance(seconds, np.ndarray)
+    assert seconds.tolist() == pytest.approx([tempo.seconds(int(x)) for x in lines])
+    assert tempo.line_at(seconds).tolist() == pytest.approx(lines.tolist())
+    assert tempo.frames(lines).dtype == np.int64
+
+
+def test_clones_repeat_speed_effects():
+    project = Project()
+    project.initial_bpm = 125
+    project.initial_tpl = 6
+    pattern = Pattern(tracks=2, lines=32)
+    pattern.data[8][1] = Note(ctl=0x000F, val=250)
+    pattern.data[16][0] = Note(ctl=0x010F, val=3)
+    project.attach_pattern(pattern)
+    project.attach_pattern(PatternClone(source=0, x=40))
+    tempo = project.tempo_map()
+    assert tempo.lines == [0, 8, 16, 48, 56]
+    assert tempo.length == 72
+
+
+def test_same_line_changes_are_merged():
+    tempo = TempoMap([(0, 125, 6), (4, 100, 6), (4, 100, 4)], 8)
+    assert tempo.lines == [0, 4]
+    assert tempo.tpls == [6, 4]
+    assert tempo.seconds(8) == pytest.approx(4 * 0.12 + 4 * 4 * 2.5 / 100)
@@ -0,0 +1,106 @@
+import random
+
+from rv.api import Pattern, Project
+from rv.pattern import PatternClone
+from rv.project import PatternLine
+from rv.timeline import Placement, Timeline
+
+
+def test_timeline_point_queries():
+    project = Project()
+    project.attach_pattern(Pattern(lines=8, x=0, y=0))
+    project.attach_pattern(Pattern(lines=4, x=4, y=32))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=16, y=0))
+    timeline = project.timeline
+    assert timeline.end == 24
+    assert timeline.at(-1) == ()
+    assert [p.index for p in timeline.at(0)] == [0]
+    assert [p.index for p in timeline.at(5)] == [0, 1]
+    assert timeline.at(8) == ()
+    assert timeline.at(16) == (Placement(3, 0, 16, 24, 0),)
+    assert timeline.at(24) == ()
+
+
+def test_timeline_range_queries():
+    project = Project()
+    project.attach_pattern(Pattern(lines=8, x=0, y=0))
+    project.attach_pattern(Pattern(lines=4, x=4, y=32))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=16, y=0))
+    timeline = project.timeline
+    assert [p.index for p in timeline.overlapping(6, 20)] == [0, 3, 1]
+    assert [p.index for p in timeline.overlapping(8, 16)] == []
+    assert [p.index for p in timeline.overlapping(7, 8)] == [0, 1]
+
+
+def test_timeline_is_rebuilt_after_changes():
+    project = Project()
+    project.attach_pattern(Pattern(lines=8, x=0, y=0))
+    project.attach_pattern(Pattern(lines=4, x=4, y=32))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=16, y=0))
+    timeline = project.timeline
+    assert project.timeline is timeline
+    project.patterns[1].x = 100
+    assert project.timeline is not timeline
+    assert project.timeline.end == 104
+    timeline = project.timeline
+    project.patterns[0].lines = 16
+    assert [p.end for p in project.timeline.at(16)] == [32]
+    timeline = project.timeline
+    project.attach_pattern(Pattern(x=200))
+    assert project.timeline is not timeline
+    assert project.timeline.end == 232
+
+
+def test_pattern_lines():
+    project = Project()
+    project.attach_pattern(Pattern(lines=8, x=0, y=0))
+    project.attach_pattern(Pattern(lines=4, x=4, y=32))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=16, y=0))
+    lines = dict(project.pattern_lines())
+    assert len(lines) == 24
+    assert lines[5] == [PatternLine(0, 0, 5), PatternLine(1, 1, 1)]
+    assert lines[10] == []
+    assert lines[17] == [PatternLine(3, 0, 1)]
+    assert list(project.pattern_lines(6, 8)) == [
+        (6, [PatternLine(0, 0, 6), PatternLine(1, 1, 2)]),
+        (7, [PatternLine(0, 0, 7), PatternLine(1, 1, 3)]),
+    ]
+    assert list(Project().pattern_lines()) == []
+
+
+def test_overlapping_matches_scan():
+    rng = random.Random(21)
+    placements = []
+    for index in range(300):
+        start = rng.randrange(-50, 1000)
+        placements.append(
+            Placement(
+                index, index, start, start + rng.randrange(1, 400), rng.randrange(4)
+            )
+        )
+    timeline = Timeline(placements)
+    ordered = sorted(placements, key=lambda p: (p.y, p.start, p.index))
+    for _ in range(200):
+        start = rng.randrange(-100, 1500)
+        stop = start + rng.randrange(1, 50)
+        expected = [p for p in ordered if p.start < stop and p.end > start]
+        assert timeline.overlapping(start, stop) == expected
+        assert timeline.at(start) == tuple(
+            p for p in ordered if p.start <= start < p.end
+        )
+    assert timeline.end == max(p.end for p in placements)
+
+
+def test_long_early_pattern():
+    placements = [Placement(0, 0, 0, 100000, 0)]
+    placements += [Placement(i, i, i * 4, i * 4 + 4, 1) for i in range(1, 2000)]
+    timeline = Timeline(placements)
+    assert timeline.at(0) == (placements[0],)
+    assert timeline.at(4001) == (placements[0], placements[1000])
+    assert timeline.overlapping(10, 17) == placements[:1] + placements[2:5]
+    assert timeline.at(100000) == ()
+    assert timeline.overlapping(5, 5) == []
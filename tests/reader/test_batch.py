@@ -0,0 +1,77 @@
+import pickle
+
+from rv.api import m, Pattern, Project, read_sunvox_files
+from rv.note import NOTECMD, Note
+
+
+def module_types(project):
+    return [module.mtype for module in project.modules]
+
+
+def write_projects(tmpdir, count):
+    paths = []
+    for i in range(count):
+        project = Project()
+        project.name = "project{}".format(i)
+        project.new_module(m.Amplifier, volume=i)
+        pattern = Pattern(tracks=1, lines=4)
+        pattern.data[2][0] = Note(note=NOTECMD.C5, vel=i + 1, module=2)
+        project.attach_pattern(pattern)
+        path = str(tmpdir / "{}.sunvox".format(i))
+        with open(path, "wb") as f:
+            project.write_to(f)
+        paths.append(path)
+    return paths
+
+
+def test_read_in_order_with_errors(tmpdir):
+    paths = write_projects(tmpdir, 5)
+    broken = str(tmpdir / "broken.sunvox")
+    with open(broken, "wb") as f:
+        f.write(Project().read()[:-3])
+    paths.insert(2, broken)
+    other = str(tmpdir / "other.sunvox")
+    with open(other, "wb") as f:
+        f.write(b"RIFF\0\0\0\0")
+    paths.insert(4, other)
+    paths.append(str(tmpdir / "missing.sunvox"))
+    results = list(read_sunvox_files(paths, workers=2, max_pending=2))
+    assert [r.path for r in results] == paths
+    assert isinstance(results[2].error, RuntimeError) and results[2].value is None
+    assert isinstance(results[4].error, ValueError) and results[4].value is None
+    assert isinstance(results[-1].error, FileNotFoundError)
+    projects = [r.value for r in results if r.error is None]
+    assert [p.name for p in projects] == ["project{}".format(i) for i in range(5)]
+    assert [p.modules[1].volume for p in projects] == list(range(5))
+    assert [p.patterns[0].data[2][0].vel for p in projects] == list(range(1, 6))
+
+
+def test_read_as_completed_with_fn(tmpdir):
+    paths = write_projects(tmpdir, 4)
+    results = list(read_sunvox_files(paths, workers=2, ordered=False, fn=module_types))
+    assert sorted(r.path for r in results) == sorted(paths)
+    assert all(r.value == ["Output", "Amplifier"] for r in results)
+
+
+def test_read_payloads_in_workers(tmpdir):
+    project = Project()
+    project.new_module(m.Generator)
+    sampler = project.new_module(m.Sampler)
+    sample = m.Sampler.Sample()
+    sample.data = bytes(range(256))
+    sampler.samples[0] = sample
+    path = str(tmpdir / "payloads.sunvox")
+    project.write_to(path)
+    (result,) = read_sunvox_files([path], workers=1)
+    assert result.error is None
+    assert result.value.read() == project.read()
+
+
+def test_patterns_pickle_as_raw_data():
+    pattern = Pattern(tracks=2, lines=4)
+    pattern.data[1][1] = Note(note=NOTECMD.D4, vel=10, module=3)
+    loaded = pickle.loads(pickle.dumps(pattern))
+    assert "_data" not in vars(loaded)
+    assert loaded.raw_data == pattern.raw_data
+    assert loaded.data[1][1].vel == 10
+    assert loaded.data[1][1].pattern is loaded
@@ -0,0 +1,77 @@
+import bz2
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+from rv.api import m, Project, Synth, iter_sunvox_archive, read_sunvox_file
+from rv.readers.events import ProjectField, iter_sunvox_events
+from tests.reader.test_streams import TrickleStream
+
+
+@pytest.mark.parametrize("compress", [gzip.compress, lzma.compress, bz2.compress])
+def test_read_compressed(compress, tmpdir):
+    project = Project()
+    project.name = "compressed"
+    project.new_module(m.Amplifier)
+    data = project.read()
+    compressed = compress(bytes(data))
+    assert read_sunvox_file(compressed).read() == data
+    assert read_sunvox_file(TrickleStream(compressed)).read() == data
+    path = str(tmpdir / "compressed.sunvox")
+    with open(path, "wb") as f:
+        f.write(compressed)
+    assert read_sunvox_file(path, lazy_payloads=True).read() == data
+    events = iter_sunvox_events(io.BytesIO(compressed))
+    assert ProjectField(b"NAME", "name", "compressed") in events
+
+
+def test_zip_archive(tmpdir):
+    project = Project()
+    project.new_module(m.Amplifier)
+    path = str(tmpdir / "archive.zip")
+    with zipfile.ZipFile(path, "w") as archive:
+        project.name = "a"
+        archive.writestr("a.sunvox", project.read())
+        archive.writestr("readme.txt", "not a project")
+        project.name = "b"
+        archive.writestr("dir/b.sunvox.gz", gzip.compress(project.read()))
+        archive.writestr("c.sunsynth", bytes(Synth(m.Amplifier(name="c")).read()))
+        archive.writestr("broken.sunvox", project.read()[:-3])
+        archive.writestr("other.sunvox", b"RIFF\0\0\0\0")
+    results = list(iter_sunvox_archive(path))
+    assert [r.path for r in results] == [
+        "a.sunvox",
+        "dir/b.sunvox.gz",
+        "c.sunsynth",
+        "broken.sunvox",
+        "other.sunvox",
+    ]
+    assert results[0].value.name == "a"
+    assert results[1].value.name == "b"
+    assert results[2].value.module.name == "c"
+    assert isinstance(results[3].error, RuntimeError)
+    assert isinstance(results[4].error, ValueError) and results[4].value is None
+
+
+def test_tar_archive_stream():
+    project = Project()
+    project.new_module(m.Amplifier)
+    f = io.BytesIO()
+    with tarfile.open(fileobj=f, mode="w:xz") as archive:
+        for name in ["x", "y"]:
+            project.name = name
+            data = project.read()
+            info = tarfile.TarInfo("{}.sunvox".format(name))
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    results = list(iter_sunvox_archive(TrickleStream(f.getvalue())))
+    assert [(r.path, r.value.name) for r in results] == [
+        ("x.sunvox", "x"),
+        ("y.sunvox", "y"),
+    ]
+    f.seek(0)
+    assert len(list(iter_sunvox_archive(f))) == 2
@@ -0,0 +1,34 @@
+from rv.lib.iff import BufferReader
+from rv.readers.reader import Reader, ReaderFinished
+
+
+class RecordingReader(Reader):
+    def process_chunks(self):
+        self.object = []
+        super().process_chunks()
+
+    def process_BPM(self, data):
+        self.object.append(("BPM", bytes(data)))
+
+    def process_unknown(self, name, data):
+        self.object.append(("unknown", name))
+
+    def process_end_of_file(self):
+        raise ReaderFinished()
+
+
+def test_dispatch_table_is_built_per_subclass():
+    table = RecordingReader._dispatch_table
+    assert table[b"BPM "] is RecordingReader.process_BPM
+    assert table[b"PAMD"] is Reader.process_PAMD
+    assert b"chunks" not in table
+
+
+def test_unknown_chunks_are_pluggable():
+    data = b"BPM \x01\x00\x00\x00\x01XYZW\x00\x00\x00\x00BPM\x00\x00\x00\x00\x00"
+    reader = RecordingReader(BufferReader(data))
+    assert reader.object == [
+        ("BPM", b"\x01"),
+        ("unknown", b"XYZW"),
+        ("unknown", b"BPM\x00"),
+    ]
@@ -0,0 +1,75 @@
+import os
+
+from rv.api import m, Pattern, PatternClone, Project, Synth
+from rv.lib.iff import LazyPayload
+from rv.readers.events import (
+    ChunkData,
+    ControllerValue,
+    ModuleEnd,
+    ModuleField,
+    ModuleStart,
+    PatternData,
+    PatternEnd,
+    PatternField,
+    PatternStart,
+    ProjectField,
+    iter_sunvox_events,
+)
+
+
+def test_events():
+    project = Project()
+    project.name = "events"
+    project.initial_bpm = 150
+    amp = project.new_module(m.Amplifier, name="amp", volume=300)
+    spare = project.new_module(m.Amplifier)
+    vorbis = project.new_module(m.VorbisPlayer, data=os.urandom(100000))
+    vorbis >> amp >> project.output
+    project.detach_module(spare)
+    project.attach_pattern(Pattern(tracks=2, lines=4))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=5))
+    data = project.read()
+    events = list(iter_sunvox_events(data))
+    fields = {e.name: e.value for e in events if isinstance(e, ProjectField)}
+    assert fields["name"] == "events"
+    assert fields["initial_bpm"] == 150
+    assert fields["sunvox_version"] == project.sunvox_version
+    starts = [e for e in events if isinstance(e, (PatternStart, ModuleStart))]
+    assert starts == [
+        PatternStart(0, None),
+        PatternStart(2, 0),
+        ModuleStart(0, project.output.flags),
+        ModuleStart(1, project.modules[1].flags),
+        ModuleStart(3, project.modules[3].flags),
+    ]
+    (pattern_data,) = [e for e in events if isinstance(e, PatternData)]
+    assert isinstance(pattern_data.data, memoryview)
+    assert bytes(pattern_data.data) == project.patterns[0].raw_data
+    assert PatternField(2, b"PXXX", "x", 5) in events
+    assert PatternEnd(2) in events
+    assert ModuleField(3, b"STYP", "mtype", "Vorbis player") in events
+    assert ModuleEnd(3) in events
+    assert ModuleField(1, b"SLNK", "incoming_links", [3]) in events
+    chunks = [e for e in events if isinstance(e, ChunkData) and e.index == 3]
+    assert bytes(chunks[0].data) == project.modules[3].data
+    cvals = [e for e in events if isinstance(e, ControllerValue) and e.index == 1]
+    assert cvals[0] == ControllerValue(1, 0, 300)
+
+
+def test_lazy_payloads_and_synth(tmpdir):
+    project = Project()
+    project.new_module(m.VorbisPlayer, data=os.urandom(100000))
+    path = str(tmpdir / "events.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    events = iter_sunvox_events(path, lazy_payloads=True)
+    chunks = [e for e in events if isinstance(e, ChunkData) and e.chnm == 0]
+    assert isinstance(chunks[0].data, LazyPayload)
+    synth = Synth(m.Amplifier(name="amp"))
+    events = list(iter_sunvox_events(synth.read()))
+    assert events[0] == ProjectField(
+        b"VERS", "sunsynth_version", synth.sunsynth_version
+    )
+    assert events[1] == ModuleStart(1, synth.module.flags)
+    assert events[-1] == ModuleEnd(1)
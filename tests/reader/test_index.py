@@ -0,0 +1,93 @@
+import os
+
+from rv.api import m, Pattern, PatternClone, Project, read_sunvox_file
+from rv.readers.index import ChunkIndex, read_module, read_pattern
+from rv.readers.module import ModuleReader
+
+
+def test_index_locates_blocks():
+    project = Project()
+    for i in range(5):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i))
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(PatternClone(source=0, x=8))
+    project.attach_pattern(Pattern(tracks=3, lines=4, x=16))
+    data = project.read()
+    index = ChunkIndex.build(data)
+    assert index.chunks[0] == (b"SVOX", 0, 0)
+    assert [b.name for b in index.patterns] == [b"PDTA", b"PPAR", b"PDTA"]
+    assert [b.name for b in index.modules] == [b"SFFF"] * 2 + [b"SEND"] + [b"SFFF"] * 3
+    for block in index.patterns + index.modules:
+        assert 0 < block.start < block.end <= len(data)
+    total = sum(8 + entry.size for entry in index.chunks)
+    assert total == len(data)
+
+
+def test_read_single_module_and_pattern():
+    project = Project()
+    for i in range(5):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i))
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(PatternClone(source=0, x=8))
+    project.attach_pattern(Pattern(tracks=3, lines=4, x=16))
+    data = project.read()
+    index = ChunkIndex.build(data)
+    amp = read_module(data, 4, index)
+    assert isinstance(amp, m.Amplifier)
+    assert amp.name == "amp3"
+    assert amp.incoming_links == []
+    assert read_module(data, 2, index) is None
+    assert isinstance(read_module(data, 0), m.Output)
+    clone = read_pattern(data, 1, index)
+    assert isinstance(clone, PatternClone)
+    assert clone.source == 0 and clone.x == 8
+    pattern = read_pattern(data, 2, index)
+    assert (pattern.tracks, pattern.lines, pattern.x) == (3, 4, 16)
+
+
+def test_from_index_seeks_file(tmpdir):
+    project = Project()
+    for i in range(5):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i))
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(PatternClone(source=0, x=8))
+    project.attach_pattern(Pattern(tracks=3, lines=4, x=16))
+    path = str(tmpdir / "indexed.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    index = ChunkIndex.for_file(path)
+    assert read_module(path, 5).name == "amp4"
+    assert not os.path.exists(path + ".rvidx")
+    index = ChunkIndex.for_file(path, cache=True)
+    assert os.path.exists(path + ".rvidx")
+    cached = ChunkIndex.for_file(path, cache=True)
+    assert cached.chunks == index.chunks
+    assert cached.modules == index.modules
+    with open(path, "rb") as f:
+        reader = ModuleReader.from_index(f, cached, 5)
+        assert reader.object.name == "amp4"
+    assert read_pattern(path, 0).lines == 8
+    assert len(read_sunvox_file(path).patterns) == 3
+
+
+def test_unwritable_cache_is_skipped(tmpdir):
+    project = Project()
+    for i in range(5):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i))
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(PatternClone(source=0, x=8))
+    project.attach_pattern(Pattern(tracks=3, lines=4, x=16))
+    path = str(tmpdir / "unwritable.sunvox")
+    project.write_to(path)
+    os.mkdir(path + ".rvidx")
+    index = ChunkIndex.for_file(path, cache=True)
+    assert [b.name for b in index.modules][0] == b"SFFF"
+    assert read_module(path, 5).name == "amp4"
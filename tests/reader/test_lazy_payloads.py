@@ -0,0 +1,79 @@
+import os
+from io import BytesIO
+
+import pytest
+
+from rv.api import m, Project, read_sunvox_file
+from rv.lib.iff import LazyPayload
+
+
+def test_lazy_payloads_are_handles_until_accessed(tmpdir):
+    project = Project()
+    sampler = project.new_module(m.Sampler)
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(100000)
+    sampler.samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    inner = Project()
+    inner.name = "inner"
+    inner.new_module(m.Sampler).samples[0] = sample
+    project.new_module(m.MetaModule, project=inner)
+    path = str(tmpdir / "lazy.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    loaded = read_sunvox_file(path, lazy_payloads=True)
+    sampler, vorbis, meta = loaded.modules[1:4]
+    assert isinstance(sampler.samples[0]._data, LazyPayload)
+    assert sampler.samples[0].frames == 100000 // sampler.samples[0].frame_size
+    assert isinstance(vorbis._data, LazyPayload)
+    assert isinstance(meta._project, LazyPayload)
+    f = BytesIO()
+    loaded.write_to(f)
+    assert f.getvalue() == project.read()
+    assert loaded.read() == project.read()
+    assert sampler.samples[0].data == project.modules[1].samples[0].data
+    assert vorbis.data == project.modules[2].data
+    assert meta.project.name == "inner"
+    assert meta.project.metamodule is meta
+
+
+def test_small_payloads_and_buffers_stay_eager(tmpdir):
+    project = Project()
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(100000)
+    project.new_module(m.Sampler).samples[0] = sample
+    data = project.read()
+    loaded = read_sunvox_file(data, lazy_payloads=True)
+    assert not isinstance(loaded.modules[1].samples[0]._data, LazyPayload)
+    path = str(tmpdir / "eager.sunvox")
+    with open(path, "wb") as f:
+        f.write(data)
+    loaded = read_sunvox_file(path, lazy_payloads=1 << 20)
+    assert not isinstance(loaded.modules[1].samples[0]._data, LazyPayload)
+
+
+def test_save_over_own_file(tmpdir):
+    project = Project()
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(100000)
+    project.new_module(m.Sampler).samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    path = str(tmpdir / "in_place.sunvox")
+    project.write_to(path)
+    loaded = read_sunvox_file(path, lazy_payloads=True)
+    loaded.name = "saved in place"
+    loaded.write_to(path)
+    project.name = "saved in place"
+    with open(path, "rb") as f:
+        assert f.read() == project.read()
+
+
+def test_writing_over_own_file_by_handle_fails(tmpdir):
+    project = Project()
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    path = str(tmpdir / "truncated.sunvox")
+    project.write_to(path)
+    loaded = read_sunvox_file(path, lazy_payloads=True)
+    with open(path, "wb") as f:
+        with pytest.raises(ValueError):
+            loaded.write_to(f)
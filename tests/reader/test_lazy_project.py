@@ -0,0 +1,79 @@
+from rv.api import m, Pattern, PatternClone, Project, read_sunvox_file
+from rv.lazy import LazyBlock, raw_items
+
+
+def test_elements_decoded_on_access():
+    project = Project()
+    for i in range(4):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i), volume=i)
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.modules[3] >> project.modules[1]
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=8))
+    data = project.read()
+    loaded = read_sunvox_file(data, lazy=True)
+    assert loaded.output is loaded.modules[0]
+    assert len(loaded.modules) == 5
+    assert len(loaded.patterns) == 3
+    raw = list(raw_items(loaded.modules))
+    assert [isinstance(x, LazyBlock) for x in raw] == [False, True, False, True, True]
+    assert not loaded.modules.is_loaded(3)
+    assert loaded.module_connections == {0: [1, 3, 4], 1: [3], 3: [], 4: []}
+    amp = loaded.modules[3]
+    assert loaded.modules.is_loaded(3)
+    assert not loaded.modules.is_loaded(4)
+    assert amp.name == "amp2" and amp.volume == 2
+    assert amp.index == 3 and amp.parent is loaded
+    assert amp.incoming_links is loaded.module_connections[3]
+    assert loaded.modules[2] is None
+    assert loaded.module_index(amp) == 3
+    pattern = loaded.patterns[2]
+    assert isinstance(pattern, PatternClone) and pattern.x == 8
+    assert pattern.project is loaded
+    assert loaded.read() == data
+    assert [type(x) for x in loaded.modules[1:]] == [
+        m.Amplifier,
+        type(None),
+        m.Amplifier,
+        m.Amplifier,
+    ]
+
+
+def test_untouched_elements_written_back_unchanged():
+    project = Project()
+    for i in range(4):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i), volume=i)
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.modules[3] >> project.modules[1]
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=8))
+    data = project.read()
+    loaded = read_sunvox_file(data, lazy=True)
+    assert loaded.read() == data
+    loaded.name = "renamed"
+    loaded.modules[1].volume = 200
+    project.name = "renamed"
+    project.modules[1].volume = 200
+    assert not loaded.modules.is_loaded(4)
+    assert loaded.read() == project.read()
+
+
+def test_connections_on_lazy_modules():
+    project = Project()
+    for i in range(4):
+        amp = project.new_module(m.Amplifier, name="amp{}".format(i), volume=i)
+        amp >> project.output
+    project.detach_module(project.modules[2])
+    project.modules[3] >> project.modules[1]
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0, x=8))
+    loaded = read_sunvox_file(project.read(), lazy=True)
+    loaded.connect(loaded.modules[4], loaded.modules[3])
+    project.connect(project.modules[4], project.modules[3])
+    assert not loaded.modules.is_loaded(1)
+    assert loaded.read() == project.read()
@@ -0,0 +1,56 @@
+import os
+
+from rv.api import m, Pattern, PatternClone, Project, Synth, probe_sunvox_file
+
+
+def test_probe_project(tmpdir):
+    project = Project()
+    project.name = "probed"
+    project.initial_bpm = 140
+    project.initial_tpl = 4
+    sampler = project.new_module(m.Sampler, name="smp")
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(1000)
+    sampler.samples[0] = sample
+    sampler.samples[3] = sample
+    project.new_module(m.VorbisPlayer, name="ogg", data=os.urandom(300))
+    project.new_module(m.Amplifier, name="amp")
+    project.detach_module(project.modules[2])
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(None)
+    project.attach_pattern(PatternClone(source=0))
+    project.attach_pattern(Pattern(tracks=5, lines=64))
+    path = str(tmpdir / "probe.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    info = probe_sunvox_file(path)
+    assert info.container == "SVOX"
+    assert info.version == project.sunvox_version
+    assert (info.initial_bpm, info.initial_tpl, info.name) == (140, 4, "probed")
+    assert info.module_count == 3
+    assert info.module_types == ["Output", "Sampler", "Amplifier"]
+    assert [(x.index, x.name) for x in info.modules] == [
+        (0, "Output"),
+        (1, "smp"),
+        (3, "amp"),
+    ]
+    assert info.pattern_count == 3
+    assert [tuple(x) for x in info.patterns] == [
+        (0, 2, 8, None),
+        (2, 2, 8, 0),
+        (3, 5, 64, None),
+    ]
+    assert info.sample_bytes == 2000
+    assert info.vorbis_bytes == 0
+    assert probe_sunvox_file(project.read()) == info
+
+
+def test_probe_vorbis_and_synth():
+    project = Project()
+    project.new_module(m.VorbisPlayer, data=os.urandom(300))
+    assert probe_sunvox_file(project.read()).vorbis_bytes == 300
+    synth = Synth(m.Amplifier(name="amp"))
+    info = probe_sunvox_file(synth.read())
+    assert info.container == "SSYN"
+    assert info.version == synth.sunsynth_version
+    assert [tuple(x) for x in info.modules] == [(1, "Amplifier", "amp")]
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from rv.api import m, Pattern, PatternClone, Project, read_sunvox_file
+from rv.lib.iff import LazyPayload
+
+
+def test_exclude_parts(tmpdir):
+    project = Project()
+    sampler = project.new_module(m.Sampler, x=100, y=200)
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(100000)
+    sample.loop_end = 1000
+    sampler.samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    inner = Project()
+    inner.name = "inner"
+    project.new_module(m.MetaModule, project=inner)
+    amp = project.new_module(m.Amplifier, volume=300, x=50)
+    amp.controller_midi_maps["volume"].channel = 3
+    project.attach_pattern(Pattern(tracks=2, lines=8, x=16))
+    project.attach_pattern(PatternClone(source=0, x=32))
+    path = str(tmpdir / "project.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    loaded = read_sunvox_file(
+        path, exclude=["patterns", "samples", "vorbis", "projects", "cmid", "layout"]
+    )
+    assert loaded.patterns == []
+    sampler, vorbis, meta, amp = loaded.modules[1:]
+    assert sampler.samples[0].loop_end == 1000
+    assert sampler.samples[0].data == b""
+    assert vorbis.data is None
+    assert meta.project.name == "Project"
+    assert amp.volume == 300
+    assert amp.x == m.Amplifier().x and sampler.y == m.Sampler().y
+    assert amp.controller_midi_maps["volume"].channel == 0
+
+
+def test_include_parts():
+    project = Project()
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(1000)
+    project.new_module(m.Sampler).samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    project.attach_pattern(Pattern(tracks=2, lines=8, x=16))
+    project.attach_pattern(PatternClone(source=0, x=32))
+    loaded = read_sunvox_file(project.read(), include=["patterns", "vorbis"])
+    assert loaded.patterns[0].x == 0
+    assert isinstance(loaded.patterns[1], PatternClone)
+    assert loaded.patterns[0].raw_data == project.patterns[0].raw_data
+    assert bytes(loaded.modules[2].data) == project.modules[2].data
+    assert loaded.modules[1].samples[0].data == b""
+
+
+def test_included_payloads_are_read(tmpdir):
+    project = Project()
+    sample = m.Sampler.Sample()
+    sample.data = os.urandom(100000)
+    project.new_module(m.Sampler).samples[0] = sample
+    project.new_module(m.VorbisPlayer, data=os.urandom(80000))
+    inner = Project()
+    inner.name = "inner"
+    project.new_module(m.MetaModule, project=inner)
+    path = str(tmpdir / "project.sunvox")
+    with open(path, "wb") as f:
+        project.write_to(f)
+    loaded = read_sunvox_file(path, exclude=["vorbis"])
+    assert not isinstance(loaded.modules[1].samples[0]._data, LazyPayload)
+    assert loaded.modules[1].samples[0].data == project.modules[1].samples[0].data
+    assert loaded.modules[3].project.name == "inner"
+
+
+def test_unknown_parts():
+    with pytest.raises(ValueError):
+        read_sunvox_file(Project().read(), exclude=["notes"])
@@ -0,0 +1,42 @@
+import gzip
+from io import BytesIO
+
+from rv.api import m, Pattern, PatternClone, Project, read_sunvox_file, Synth
+
+
+class TrickleStream:
+    """Non-seekable stream returning at most a few bytes per read."""
+
+    def __init__(self, data):
+        self._f = BytesIO(data)
+
+    def read(self, size=-1):
+        return self._f.read(min(size, 3) if size >= 0 else size)
+
+    def seekable(self):
+        return False
+
+
+def test_read_from_non_seekable_stream():
+    project = Project()
+    gen = project.new_module(m.Generator)
+    meta = project.new_module(m.MetaModule)
+    meta.project.new_module(m.Amplifier)
+    gen >> meta >> project.output
+    project.attach_pattern(Pattern(tracks=2, lines=8))
+    project.attach_pattern(PatternClone(source=0, x=8))
+    data = project.read()
+    loaded = read_sunvox_file(TrickleStream(data))
+    assert isinstance(loaded.modules[2], m.MetaModule)
+    assert isinstance(loaded.modules[2].project.modules[1], m.Amplifier)
+    assert isinstance(loaded.patterns[1], PatternClone)
+    assert loaded.read() == data
+
+
+def test_read_synth_from_gzip_stream():
+    synth = Synth(m.Sampler())
+    data = synth.read()
+    with gzip.open(BytesIO(gzip.compress(bytes(data))), "rb") as f:
+        loaded = read_sunvox_file(f)
+    assert isinstance(loaded.module, m.Sampler)
+    assert loaded.read() == data